@@ -1,19 +1,68 @@
 from typing import Optional
 
-from .importer import ClickImporter, ClickImporterError
-from .parser import ClickParser, ClickMetadata, ClickDataCommand, ClickDataParam
+from .importer import (
+    ClickImporter,
+    ClickImporterError,
+    ClickImporterStream,
+    ClickImporterOutput,
+    ClickImporterResult,
+)
+from .static import ClickStaticLoader
+from .parser import (
+    ClickParser,
+    ClickCommandIndex,
+    ClickMetadata,
+    ClickDataCommand,
+    ClickDataParam,
+    ClickDataPool,
+    ClickTypeResolver,
+    ClickTypeDiagnostic,
+)
+from .serializer import ClickMetadataSerializer
+from .cache import ClickMetadataCache
+from .help import ClickHelpRenderer
 from .wrapper import ClickWrapper
+from .manifest import ClickExportManifest, ClickExportReport
 from .generator import ClickGenerator
+from .profiler import ClickImportProfiler, ClickImportProfile, ClickImportNode
+from .bench import ClickBenchmark, ClickBenchmarkReport, ClickBenchmarkResult
+from .registry import ClickRegistry, ClickRegistryTarget, ClickRegistryHit
+from .discover import ClickDiscovery, ClickDiscoveryResult, ClickEntryPoint
 from .cli_utils import ClickUtils
 
 __all__ = [
     "ClickImporterError",
     "ClickImporter",
+    "ClickImporterStream",
+    "ClickImporterOutput",
+    "ClickImporterResult",
+    "ClickStaticLoader",
     "ClickParser",
+    "ClickCommandIndex",
     "ClickMetadata",
     "ClickDataCommand",
     "ClickDataParam",
+    "ClickDataPool",
+    "ClickTypeResolver",
+    "ClickTypeDiagnostic",
+    "ClickMetadataSerializer",
+    "ClickMetadataCache",
+    "ClickHelpRenderer",
+    "ClickExportManifest",
+    "ClickExportReport",
     "ClickGenerator",
+    "ClickImportProfiler",
+    "ClickImportProfile",
+    "ClickImportNode",
+    "ClickBenchmark",
+    "ClickBenchmarkReport",
+    "ClickBenchmarkResult",
+    "ClickRegistry",
+    "ClickRegistryTarget",
+    "ClickRegistryHit",
+    "ClickDiscovery",
+    "ClickDiscoveryResult",
+    "ClickEntryPoint",
     "ClickWrapper",
     "ClickUtils",
     #"__version__"
@@ -0,0 +1,230 @@
+import importlib.metadata
+import json
+import platform
+import statistics
+import sys
+import time
+import types
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+from click_wrapper.importer import ClickImporter
+from click_wrapper.parser import ClickParser
+from click_wrapper.wrapper import ClickWrapper
+from click_wrapper.generator import ClickGenerator
+
+@dataclass
+class ClickBenchmarkResult:
+    """Timings of one benchmark in seconds per call (min, median and mean of repeats)."""
+    name: str
+    repeat: int
+    number: int
+    min: float
+    median: float
+    mean: float
+
+@dataclass
+class ClickBenchmarkReport:
+    """Benchmark results with parameters of synthetic CLI and environment, JSON serializable."""
+    parameters: Dict[str, Any]
+    environment: Dict[str, str]
+    results: List[ClickBenchmarkResult] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    @staticmethod
+    def from_dict(data: dict) -> "ClickBenchmarkReport":
+        return ClickBenchmarkReport(
+            parameters=data["parameters"],
+            environment=data["environment"],
+            results=[ClickBenchmarkResult(**result) for result in data["results"]],
+        )
+
+    def format_text(self) -> str:
+        lines = [f"{'benchmark':<24} {'min':>12} {'median':>12} {'mean':>12}"]
+        for result in self.results:
+            lines.append(
+                f"{result.name:<24} "
+                f"{ClickBenchmark.format_seconds(result.min):>12} "
+                f"{ClickBenchmark.format_seconds(result.median):>12} "
+                f"{ClickBenchmark.format_seconds(result.mean):>12}"
+            )
+        return "\n".join(lines)
+
+    def compare(self, baseline: "ClickBenchmarkReport", max_regression: float = 0.25) -> List[str]:
+        """
+        Benchmarks slower than in baseline by more than 'max_regression' (fraction of baseline median).
+
+        Returns:
+            Description of every regression, empty when there is none
+        """
+        baseline_results = {result.name: result for result in baseline.results}
+        regressions = []
+        for result in self.results:
+            previous = baseline_results.get(result.name)
+            if previous is None or previous.median <= 0:
+                continue
+            ratio = result.median / previous.median
+            if ratio > 1 + max_regression:
+                regressions.append(
+                    f"{result.name}: {ClickBenchmark.format_seconds(result.median)} vs "
+                    f"{ClickBenchmark.format_seconds(previous.median)} ({(ratio - 1) * 100:+.0f}%)"
+                )
+        return regressions
+
+class ClickBenchmark:
+    """
+    Benchmarks of click-wrapper itself on synthetic Click CLIs of configurable size.
+
+    Measured are metadata parsing ('ClickParser.factory'), wrapper generation
+    ('ClickWrapper.generate'), help export ('ClickGenerator.app_help_dump') and latency
+    of generated wrapper calls (regular and direct invocation) of one leaf command.
+    """
+
+    benchmarks: List[str] = ["parser_factory", "wrapper_generate", "help_dump", "wrapper_call", "wrapper_call_direct"]
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def synthetic_cli(commands: int, depth: int = 3, params: int = 2) -> click.Group:
+        """Build Click group with exactly 'commands' subcommands nested up to 'depth' levels."""
+        cli = click.Group(name="cli", help="Synthetic root")
+        groups = [(cli, 1)]
+        created = 0
+        index = 0
+        while created < commands:
+            parent, level = groups[index % len(groups)]
+            index += 1
+            name = f"cmd{created}"
+            if level < depth:
+                cmd = click.Group(name=name, help=f"Group {name}")
+                groups.append((cmd, level + 1))
+            else:
+                cmd = click.Command(name=name, help=f"Command {name}", callback=lambda **kw: None)
+            for p in range(params):
+                cmd.params.append(click.Option([f"--opt{p}"], default=str(p), help=f"Option {p}"))
+            parent.add_command(cmd)
+            created += 1
+        return cli
+
+    @staticmethod
+    def run(
+            commands: int = 200,
+            depth: int = 3,
+            params: int = 4,
+            repeat: int = 5,
+            calls: int = 200,
+            benchmarks: Optional[List[str]] = None,
+    ) -> ClickBenchmarkReport:
+        """
+        Run benchmarks on synthetic CLI, importable for the time of the run only.
+
+        Args:
+            commands: Number of commands of synthetic CLI (groups and leaves)
+            depth: Maximum nesting of synthetic CLI commands
+            params: Number of options of each command
+            repeat: Number of timed repeats of each benchmark
+            calls: Number of wrapper calls per repeat of call latency benchmarks
+            benchmarks: Names of benchmarks to run (see 'benchmarks'), all when None
+
+        Returns:
+            Report with timings, parameters and environment
+
+        Raises:
+            ValueError: If benchmark name is unknown
+        """
+        selected = benchmarks or ClickBenchmark.benchmarks
+        unknown = sorted(set(selected) - set(ClickBenchmark.benchmarks))
+        if unknown:
+            raise ValueError(f"Unknown benchmark(s) {', '.join(unknown)}, expected {', '.join(ClickBenchmark.benchmarks)}")
+
+        report = ClickBenchmarkReport(
+            parameters={"commands": commands, "depth": depth, "params": params, "repeat": repeat, "calls": calls},
+            environment=ClickBenchmark.environment(),
+        )
+        module_name = f"click_wrapper_bench_{commands}_{depth}_{params}"
+        module = types.ModuleType(module_name)
+        module.cli = ClickBenchmark.synthetic_cli(commands, depth, params)
+        sys.modules[module_name] = module
+        try:
+            importer = ClickImporter(py_import_path=module_name, py_import_path_attribute="cli")
+            for name in ClickBenchmark.benchmarks:
+                if name in selected:
+                    fnc, number = getattr(ClickBenchmark, f"_setup_{name}")(importer, calls)
+                    report.results.append(ClickBenchmark.timeit(name, fnc, repeat, number))
+        finally:
+            sys.modules.pop(module_name, None)
+        return report
+
+    @staticmethod
+    def timeit(name: str, fnc: Callable[[], Any], repeat: int, number: int = 1) -> ClickBenchmarkResult:
+        """Time 'number' calls of 'fnc' 'repeat' times, timings are per call."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fnc()
+            timings.append((time.perf_counter() - start) / number)
+        return ClickBenchmarkResult(
+            name, repeat, number, min(timings), statistics.median(timings), statistics.fmean(timings)
+        )
+
+    @staticmethod
+    def environment() -> Dict[str, str]:
+        versions = {}
+        for distribution in ("click-wrapper", "click"):
+            try:
+                versions[distribution] = importlib.metadata.version(distribution)
+            except importlib.metadata.PackageNotFoundError:
+                versions[distribution] = "unknown"
+        return {
+            **versions,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+
+    @staticmethod
+    def format_seconds(seconds: float) -> str:
+        for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+            if seconds >= scale:
+                return f"{seconds / scale:.2f} {unit}"
+        return f"{seconds / 1e-9:.0f} ns"
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _setup_parser_factory(importer: ClickImporter, calls: int):
+        return lambda: ClickParser.factory(importer), 1
+
+    @staticmethod
+    def _setup_wrapper_generate(importer: ClickImporter, calls: int):
+        return ClickWrapper(importer).generate, 1
+
+    @staticmethod
+    def _setup_help_dump(importer: ClickImporter, calls: int):
+        return lambda: ClickGenerator.app_help_dump(importer), 1
+
+    @staticmethod
+    def _setup_wrapper_call(importer: ClickImporter, calls: int, feature: Optional[str] = None):
+        wrapper = ClickWrapper(importer, features=[feature] if feature else None)
+        namespace: Dict[str, Any] = {}
+        exec(compile(wrapper.generate(), "<click-wrapper bench>", "exec"), namespace)
+        leaf = next(name for name, metadata in wrapper.parser.commands_map.items() if metadata.is_leaf)
+        instance = namespace[wrapper._get_class_wrapper_name()]()
+        method = getattr(instance, f"cmd_{wrapper._get_method_name(leaf)}{f'_{feature}' if feature else ''}")
+        options = namespace[wrapper._get_dataclass_name(leaf)]()
+        return lambda: method(options), calls
+
+    @staticmethod
+    def _setup_wrapper_call_direct(importer: ClickImporter, calls: int):
+        return ClickBenchmark._setup_wrapper_call(importer, calls, "direct")
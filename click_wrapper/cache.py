@@ -0,0 +1,172 @@
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from click_wrapper.importer import ClickImporter
+from click_wrapper.parser import ClickMetadata
+from click_wrapper.serializer import ClickMetadataSerializer
+
+class ClickMetadataCache:
+    """
+    Persistent on-disk cache of parsed Click metadata.
+
+    Cache entry is keyed by import path, attribute, installed distribution version,
+    installed plugin entry points of target and a hash of mtimes of target package
+    source files. Loading warm entry does not import target package at all.
+    """
+
+    # bump when snapshot layout changes
+    snapshot_version: int = 4
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir: Path = Path(cache_dir) if cache_dir else self.default_cache_dir()
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def default_cache_dir() -> Path:
+        """User cache directory, can be overridden by 'CLICK_WRAPPER_CACHE_DIR' environment variable."""
+        if os.environ.get("CLICK_WRAPPER_CACHE_DIR"):
+            return Path(os.environ["CLICK_WRAPPER_CACHE_DIR"])
+        if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+            return Path(os.environ["LOCALAPPDATA"]) / "click-wrapper" / "Cache"
+        if os.environ.get("XDG_CACHE_HOME"):
+            return Path(os.environ["XDG_CACHE_HOME"]) / "click-wrapper"
+        return Path.home() / ".cache" / "click-wrapper"
+
+    def load(self, importer: ClickImporter, static: bool = False) -> Optional[List[ClickMetadata]]:
+        """Return cached metadata or None when entry is missing or stale (static loads have own entries)."""
+        entry = self._entry_path(importer, static)
+        if entry is None or not entry.exists():
+            return None
+        try:
+            with open(entry, encoding="utf-8") as f:
+                return ClickMetadataSerializer.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, importer: ClickImporter, metadata: List[ClickMetadata], static: bool = False) -> Optional[Path]:
+        """Write metadata snapshot, stale entries of the same target (and mode) are removed."""
+        entry = self._entry_path(importer, static)
+        if entry is None:
+            return None
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.cache_dir.glob(f"{self._target_prefix(importer, static)}-*.json"):
+            stale.unlink(missing_ok=True)
+
+        # atomic write, concurrent readers never see partial file
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            ClickMetadataSerializer.dump(metadata, f)
+        os.replace(tmp, entry)
+        return entry
+
+    def clear(self) -> int:
+        """Remove all cache entries, returns number of removed entries."""
+        removed = 0
+        if self.cache_dir.exists():
+            for entry in self.cache_dir.glob("*.json"):
+                entry.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    ##############
+    # internal key
+    ##############
+    def _entry_path(self, importer: ClickImporter, static: bool) -> Optional[Path]:
+        source_key = self.source_key(importer)
+        if source_key is None:
+            return None
+        return self.cache_dir / f"{self._target_prefix(importer, static)}-{source_key[:16]}.json"
+
+    @staticmethod
+    def _target_prefix(importer: ClickImporter, static: bool) -> str:
+        # statically loaded tree may differ from imported one, never served to the other mode
+        target = f"{importer.py_import_path}:{importer.py_import_path_attribute}{':static' if static else ''}"
+        return f"{importer.py_import_package}-{hashlib.sha256(target.encode()).hexdigest()[:8]}"
+
+    @staticmethod
+    def source_key(importer: ClickImporter) -> Optional[str]:
+        """
+        Hash describing installed state of target package, computed without importing it.
+
+        Besides target sources, entry points of installed distributions in groups named after
+        target package (e.g. 'llm' plugins, 'flask.commands') are included, so installing,
+        removing or upgrading a plugin adding commands invalidates the entry.
+
+        Returns None when target sources cannot be located (caching is then skipped).
+        """
+        try:
+            spec = importlib.util.find_spec(importer.py_import_package)
+        except (ImportError, ValueError):
+            return None
+        if spec is None:
+            return None
+
+        if spec.submodule_search_locations:
+            roots = list(spec.submodule_search_locations)
+        elif spec.origin and os.path.exists(spec.origin):
+            roots = [spec.origin]
+        else:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps([
+            ClickMetadataCache.snapshot_version,
+            importer.py_import_path,
+            importer.py_import_path_attribute,
+            ClickMetadataCache._distribution_version(importer.py_import_package),
+            ClickMetadataCache._plugin_entry_points(importer.py_import_package),
+        ]).encode())
+        for root in roots:
+            for source in ClickMetadataCache._source_files(root):
+                digest.update(f"{source}:{os.stat(source).st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _source_files(root: str) -> List[str]:
+        if os.path.isfile(root):
+            return [root]
+        sources = []
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names[:] = sorted(d for d in dir_names if d != "__pycache__")
+            sources.extend(os.path.join(dir_path, f) for f in sorted(file_names) if f.endswith(".py"))
+        return sources
+
+    @staticmethod
+    def _plugin_entry_points(package: str) -> List[List[str]]:
+        """Entry points (with distribution and version) in groups named after package, e.g. 'llm' or 'flask.commands'."""
+        name = re.sub(r"[-_]+", "_", package).lower()
+        found = []
+        for distribution in importlib.metadata.distributions():
+            for entry_point in distribution.entry_points:
+                # group is package name itself or a namespace of it ('llm_foo' or 'llmx' belong to other packages)
+                if re.sub(r"[-_]+", "_", entry_point.group).lower().split(".")[0] == name:
+                    found.append([
+                        entry_point.group, entry_point.name, entry_point.value,
+                        distribution.metadata["Name"] or "", distribution.version or "",
+                    ])
+        return sorted(found)
+
+    @staticmethod
+    def _distribution_version(package: str) -> str:
+        try:
+            return importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        distributions = importlib.metadata.packages_distributions().get(package, [])
+        versions = []
+        for distribution in distributions:
+            try:
+                versions.append(importlib.metadata.version(distribution))
+            except importlib.metadata.PackageNotFoundError:
+                continue
+        return ",".join(versions) or "unknown"
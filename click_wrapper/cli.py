@@ -1,7 +1,11 @@
+import os
+import time
+from pathlib import Path
+
 import click
 from click_default_group import DefaultGroup
-from typing import Optional
-from click_wrapper import ClickUtils
+from typing import Dict, Optional, Iterable, Tuple
+from click_wrapper import ClickUtils, ClickBenchmark, ClickBenchmarkReport, ClickTypeDiagnostic, ClickTypeResolver, ClickWrapper
 
 @click.group(
     cls=DefaultGroup,
@@ -24,11 +28,40 @@ def cli():
 @click.option(
     "--format",
     "-f",
-    type=click.Choice(["json", "yaml", "text"], case_sensitive=False),
+    type=click.Choice(["json", "ndjson", "yaml", "text"], case_sensitive=False),
     default="text",
-    help="Output format for metadata"
+    help="Output format for metadata, 'ndjson' is one JSON record per command"
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    help="Write metadata to file instead of stdout"
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not use (nor update) persistent metadata cache"
+)
+@click.option(
+    "--static",
+    is_flag=True,
+    help="Analyze target sources instead of importing them (falls back to import for dynamic parts)"
+)
+@click.option(
+    "--command",
+    "command",
+    help="Only this command and its subcommands, e.g. \"models options\""
 )
-def show_metadata(py_import_path: str, py_import_path_attribute: Optional[str], format: str):
+def show_metadata(
+        py_import_path: str,
+        py_import_path_attribute: Optional[str],
+        format: str,
+        output: Optional[str],
+        no_cache: bool,
+        static: bool,
+        command: Optional[str]
+):
     """
     Show metadata for all commands in a Click application.
 
@@ -44,33 +77,57 @@ def show_metadata(py_import_path: str, py_import_path_attribute: Optional[str],
         click-wrapper metadata llm
         click-wrapper metadata llm.cli cli
         click-wrapper metadata llm.cli cli --format json
+        click-wrapper metadata llm --format ndjson --output llm.ndjson
+        click-wrapper metadata llm --no-cache
+        click-wrapper metadata llm --static
+        click-wrapper metadata llm --command "models options set"
     """
-
-    print(py_import_path, py_import_path_attribute)
     try:
+        if format in ("json", "ndjson"):
+            metadata_chunks = ClickUtils.dump_metadata_chunks(
+                py_import_path,
+                py_import_path_attribute,
+                use_cache=not no_cache,
+                static=static,
+                command_path=command.split() if command else None,
+                format=format
+            )
+            if output:
+                _write_chunks(metadata_chunks, output)
+                click.echo(f"Metadata written to: {output}", err=True)
+            else:
+                for chunk in metadata_chunks:
+                    click.echo(chunk, nl=False)
+            return
+
         metadata = ClickUtils.commands_metadata(
             py_import_path,
-            py_import_path_attribute
+            py_import_path_attribute,
+            use_cache=not no_cache,
+            static=static,
+            command_path=command.split() if command else None
         )
 
-        if format == "json":
-            import json
-            click.echo(json.dumps({k: str(v) for k, v in metadata.items()}, indent=2))
-        elif format == "yaml":
+        text = None
+        if format == "yaml":
             try:
                 import yaml
-                click.echo(yaml.dump({k: str(v) for k, v in metadata.items()}))
+                text = yaml.dump({k: v.to_dict() for k, v in metadata.items()}, sort_keys=False)
             except ImportError:
                 click.echo("PyYAML not installed. Falling back to text format.", err=True)
                 format = "text"
 
         if format == "text":
-            click.echo(f"Metadata for {len(metadata)} command(s):\n")
+            lines = [f"Metadata for {len(metadata)} command(s):\n"]
             for name, meta in metadata.items():
-                click.echo(f"{'=' * 60}")
-                click.echo(f"Command: {name}")
-                click.echo(f"Metadata: {meta}")
-                click.echo()
+                lines.extend([f"{'=' * 60}", f"Command: {name}", f"Metadata: {meta}", ""])
+            text = "\n".join(lines) + "\n"
+
+        if output:
+            _write_chunks([text], output)
+            click.echo(f"Metadata written to: {output}", err=True)
+        else:
+            click.echo(text, nl=False)
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -85,7 +142,38 @@ def show_metadata(py_import_path: str, py_import_path_attribute: Optional[str],
     type=click.Path(),
     help="Write help output to file instead of stdout"
 )
-def export_help(py_import_path: str, py_import_path_attribute: Optional[str], output: Optional[str]):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not use (nor update) persistent metadata cache"
+)
+@click.option(
+    "--command",
+    "command",
+    help="Only this command and its subcommands, e.g. \"models options\""
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of processes rendering help (0 = all CPUs), pays off only for very large CLIs"
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Rewrite --output only when content changed (hashes kept in '<output>.manifest.json')"
+)
+def export_help(
+        py_import_path: str,
+        py_import_path_attribute: Optional[str],
+        output: Optional[str],
+        no_cache: bool,
+        command: Optional[str],
+        workers: int,
+        incremental: bool
+):
     """
     Generate comprehensive help for a Click application.
 
@@ -101,19 +189,38 @@ def export_help(py_import_path: str, py_import_path_attribute: Optional[str], ou
         click-wrapper help llm
         click-wrapper help llm.cli cli
         click-wrapper help llm.cli cli --output help.txt
+        click-wrapper help llm --command logs
+        click-wrapper help llm --workers 4
+        click-wrapper help llm --output help.md --incremental
     """
+    if incremental and not output:
+        raise click.UsageError("--incremental requires --output")
     try:
-        help_text = ClickUtils.dump_help(
+        if incremental:
+            report = ClickUtils.dump_help_incremental(
+                py_import_path,
+                py_import_path_attribute,
+                output_file=output,
+                use_cache=not no_cache,
+                command_path=command.split() if command else None,
+                workers=workers
+            )
+            click.echo(f"Help documentation {output}: {report.summary}")
+            return
+
+        help_chunks = ClickUtils.dump_help_chunks(
             py_import_path,
-            py_import_path_attribute
+            py_import_path_attribute,
+            use_cache=not no_cache,
+            command_path=command.split() if command else None,
+            workers=workers
         )
 
         if output:
-            with open(output, 'w') as f:
-                f.write(help_text)
+            _write_chunks(help_chunks, output)
             click.echo(f"Help documentation written to: {output}")
         else:
-            click.echo(help_text)
+            _write_chunks(help_chunks)
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
@@ -128,10 +235,67 @@ def export_help(py_import_path: str, py_import_path_attribute: Optional[str], ou
     type=click.Path(),
     help="Output file path for the generated wrapper"
 )
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Write wrapper as package, one module per top-level group loaded on first use"
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not use (nor update) persistent metadata cache"
+)
+@click.option(
+    "--static",
+    is_flag=True,
+    help="Analyze target sources instead of importing them (falls back to import for dynamic parts)"
+)
+@click.option(
+    "--command",
+    "command",
+    help="Only this command and its subcommands, e.g. \"models options\""
+)
+@click.option(
+    "--async",
+    "async_mode",
+    is_flag=True,
+    help="Also generate asyncio client class with awaitable cmd_* methods"
+)
+@click.option(
+    "--compiled",
+    is_flag=True,
+    help="Generate slotted option dataclasses encoded to argv by precomputed tables"
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Rewrite --output only when generated code changed (hashes kept in '<output>.manifest.json')"
+)
+@click.option(
+    "--feature",
+    "features",
+    multiple=True,
+    type=click.Choice(ClickWrapper.features_all),
+    help="Also generate cmd_*_<FEATURE> methods of every command (repeatable)"
+)
+@click.option(
+    "--import-runtime",
+    is_flag=True,
+    help="Import importer runtime from installed click-wrapper instead of copying it into generated code"
+)
 def export_wrapper(
         py_import_path: str,
         py_import_path_attribute: Optional[str],
-        output: Optional[str]
+        output: Optional[str],
+        output_dir: Optional[str],
+        no_cache: bool,
+        static: bool,
+        command: Optional[str],
+        async_mode: bool,
+        compiled: bool,
+        incremental: bool,
+        features: Tuple[str, ...],
+        import_runtime: bool
 ):
     """
     Generate a wrapper for a Click application.
@@ -148,19 +312,540 @@ def export_wrapper(
         click-wrapper wrapper llm
         click-wrapper wrapper llm.cli cli
         click-wrapper wrapper llm.cli cli --output wrapper.py
+        click-wrapper wrapper llm --command "models options"
+        click-wrapper wrapper llm --async --output wrapper.py
+        click-wrapper wrapper llm --compiled --output wrapper.py
+        click-wrapper wrapper llm --output wrapper.py --incremental
+        click-wrapper wrapper llm --output-dir llm_wrapper --incremental
+        click-wrapper wrapper llm --feature stream --feature direct --output wrapper.py
+        click-wrapper wrapper llm --import-runtime --output wrapper.py
+    """
+    if output and output_dir:
+        raise click.UsageError("--output and --output-dir are mutually exclusive")
+    if incremental and not (output or output_dir):
+        raise click.UsageError("--incremental requires --output or --output-dir")
+    with ClickUtils.type_resolver().collect() as unknown:
+        try:
+            if output_dir:
+                report = ClickUtils.dump_wrapper_package(
+                    py_import_path,
+                    py_import_path_attribute,
+                    output_dir=output_dir,
+                    use_cache=not no_cache,
+                    static=static,
+                    command_path=command.split() if command else None,
+                    async_mode=async_mode,
+                    compiled=compiled,
+                    incremental=incremental,
+                    features=features,
+                    import_runtime=import_runtime
+                )
+                click.echo(f"Wrapper package {output_dir}: {report.summary}")
+                return
+
+            if incremental:
+                report = ClickUtils.dump_wrapper_incremental(
+                    py_import_path,
+                    py_import_path_attribute,
+                    output_file=output,
+                    use_cache=not no_cache,
+                    static=static,
+                    command_path=command.split() if command else None,
+                    async_mode=async_mode,
+                    compiled=compiled,
+                    features=features,
+                    import_runtime=import_runtime
+                )
+                click.echo(f"Wrapper {output}: {report.summary}")
+                return
+
+            wrapper_chunks = ClickUtils.dump_wrapper_chunks(
+                py_import_path,
+                py_import_path_attribute,
+                use_cache=not no_cache,
+                static=static,
+                command_path=command.split() if command else None,
+                async_mode=async_mode,
+                compiled=compiled,
+                features=features,
+                import_runtime=import_runtime
+            )
+
+            if output:
+                _write_chunks(wrapper_chunks, output)
+                click.echo(f"Wrapper generated successfully: {output}")
+            else:
+                _write_chunks(wrapper_chunks)
+
+        except Exception as e:
+            click.echo(f"Error: {e}", err=True)
+            raise click.Abort()
+        finally:
+            _echo_type_diagnostics(unknown)
+
+@cli.command(name="profile-import")
+@click.argument("py_import_path")
+@click.argument("py_import_path_attribute", required=False)
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["text", "json", "collapsed"], case_sensitive=False),
+    default="text",
+    help="Output format, 'collapsed' stacks are input of flamegraph tools"
+)
+@click.option(
+    "--min-ms",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Hide modules with smaller cumulative import time (text format)"
+)
+@click.option(
+    "--depth",
+    type=click.IntRange(min=1),
+    help="Hide modules nested deeper (text format)"
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0),
+    help="Seconds to wait for the profiled import"
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(),
+    help="Write profile to file instead of stdout"
+)
+def profile_import(
+        py_import_path: str,
+        py_import_path_attribute: Optional[str],
+        format: str,
+        min_ms: float,
+        depth: Optional[int],
+        timeout: Optional[float],
+        output: Optional[str]
+):
+    """
+    Profile import time of a Click application.
+
+    Target is imported in a child process under '-X importtime', the result is
+    a tree of cumulative and self import time per module. Modules defining
+    callbacks of specific subcommands only are flagged, their cost could be
+    deferred by lazy loading of those subcommands.
+
+    PY_IMPORT_PATH: Dot-separated python module path (e.g., 'llm.cli').
+        If a simple name is provided without py_import_path_attribute (e.g., 'llm'),
+        automatically expands to 'llm.__main__' with attribute 'cli'.
+
+    PY_IMPORT_PATH_ATTRIBUTE: Optional attribute name to retrieve from the
+        'py_import_path' module. When None and py_import_path is a simple
+        module name, defaults to 'cli' from '__main__' module.
+
+    Examples:
+        click-wrapper profile-import llm
+        click-wrapper profile-import llm --min-ms 10 --depth 3
+        click-wrapper profile-import llm --format json --output profile.json
+        click-wrapper profile-import llm --format collapsed | flamegraph.pl > import.svg
     """
     try:
-        wrapper_code = ClickUtils.dump_wrapper(
-            py_import_path,
-            py_import_path_attribute,
-            output
-        )
+        profile = ClickUtils.profile_import(py_import_path, py_import_path_attribute, timeout)
+        if format == "json":
+            text = profile.format_json()
+        elif format == "collapsed":
+            text = profile.format_collapsed()
+        else:
+            text = profile.format_text(min_ms, depth)
 
         if output:
-            click.echo(f"Wrapper generated successfully: {output}")
+            _write_chunks([text + "\n"], output)
+            click.echo(f"Import profile written to: {output}")
         else:
-            click.echo(wrapper_code)
+            click.echo(text)
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+@cli.command()
+@click.option("--commands", type=click.IntRange(min=1), default=200, show_default=True, help="Commands of synthetic CLI")
+@click.option("--depth", type=click.IntRange(min=1), default=3, show_default=True, help="Nesting of synthetic CLI")
+@click.option("--params", type=click.IntRange(min=0), default=4, show_default=True, help="Options of each command")
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True, help="Timed repeats of each benchmark")
+@click.option("--calls", type=click.IntRange(min=1), default=200, show_default=True, help="Wrapper calls per repeat")
+@click.option(
+    "--benchmark",
+    "-b",
+    "benchmarks",
+    multiple=True,
+    type=click.Choice(ClickBenchmark.benchmarks),
+    help="Run only this benchmark (repeatable), all by default"
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    help="Write results as JSON"
+)
+@click.option(
+    "--compare",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON results of previous run, exit with error on regression"
+)
+@click.option(
+    "--max-regression",
+    type=click.FloatRange(min=0),
+    default=0.25,
+    show_default=True,
+    help="Allowed slowdown of median against --compare results (fraction)"
+)
+def bench(
+        commands: int,
+        depth: int,
+        params: int,
+        repeat: int,
+        calls: int,
+        benchmarks: Tuple[str, ...],
+        output: Optional[str],
+        compare: Optional[str],
+        max_regression: float
+):
+    """
+    Benchmark click-wrapper on a synthetic Click application.
+
+    Times metadata parsing, wrapper generation, help export and latency of
+    generated wrapper calls. Results written by --output can be passed to
+    --compare of a later run (e.g. of another version) to catch regressions.
+
+    Examples:
+        click-wrapper bench
+        click-wrapper bench --commands 2000 --depth 4 --output bench.json
+        click-wrapper bench -b wrapper_call -b wrapper_call_direct --calls 1000
+        click-wrapper bench --compare bench.json --max-regression 0.1
+    """
+    try:
+        report = ClickUtils.bench(commands, depth, params, repeat, calls, list(benchmarks) or None)
+        click.echo(report.format_text())
+        if output:
+            _write_chunks([report.to_json() + "\n"], output)
+            click.echo(f"Benchmark results written to: {output}")
+        regressions = []
+        if compare:
+            import json
+            with open(compare) as f:
+                baseline = ClickBenchmarkReport.from_dict(json.load(f))
+            regressions = report.compare(baseline, max_regression)
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    for regression in regressions:
+        click.echo(f"Regression: {regression}", err=True)
+    if regressions:
+        raise click.exceptions.Exit(1)
+
+@cli.command()
+@click.option("--group", default="console_scripts", show_default=True, help="Entry point group")
+@click.option(
+    "--distribution",
+    "-d",
+    "distributions",
+    multiple=True,
+    help="Only entry points of this distribution (repeatable), all by default"
+)
+@click.option(
+    "--all-distributions",
+    is_flag=True,
+    help="Inspect also distributions not depending on click"
+)
+@click.option("--workers", type=click.IntRange(min=1), help="Parallel worker processes (CPU count by default)")
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0),
+    default=60.0,
+    show_default=True,
+    help="Seconds per entry point, worker is killed then"
+)
+@click.option("--max-memory-mb", type=click.FloatRange(min=0), help="Address space limit of worker processes")
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["ndjson", "text"], case_sensitive=False),
+    default="ndjson",
+    help="'ndjson' is one line per entry point with status and metadata records, 'text' is summary"
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Also write metadata of every Click command to <entry point>.ndjson in this directory"
+)
+def discover(
+        group: str,
+        distributions: Tuple[str, ...],
+        all_distributions: bool,
+        workers: Optional[int],
+        timeout: float,
+        max_memory_mb: Optional[float],
+        format: str,
+        output_dir: Optional[str]
+):
+    """
+    Find and parse Click commands among entry points of installed distributions.
+
+    Entry points are listed from distribution metadata (by default only of
+    distributions depending on click) and every one is loaded and parsed in
+    its own worker process, in parallel, isolated from crashes and import side
+    effects. Results are printed as they complete, metadata written by
+    --output-dir can be loaded by ClickUtils.load_metadata.
+
+    Examples:
+        click-wrapper discover
+        click-wrapper discover --format text --timeout 30 --max-memory-mb 1024
+        click-wrapper discover -d llm -d sqlite-utils --output-dir metadata
+    """
+    counts = {}
+    try:
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results = ClickUtils.discover(
+            group, list(distributions) or None, not all_distributions, workers, timeout or None, max_memory_mb
+        )
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+            click.echo(result.format_text() if format == "text" else result.to_json())
+            if output_dir and result.status == "ok":
+                _write_chunks(
+                    [record + "\n" for record in result.records],
+                    os.path.join(output_dir, f"{result.entry_point.name}.ndjson")
+                )
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    click.echo(f"Discovered {sum(counts.values())} entry point(s): {summary or 'none'}", err=True)
+
+@cli.group()
+def cache():
+    """
+    Manage persistent metadata cache.
+
+    Parsed metadata are cached per target (import path, attribute, installed
+    version and source files mtimes) under user cache directory, which can be
+    overridden by CLICK_WRAPPER_CACHE_DIR environment variable.
+    """
+
+@cache.command(name="clear")
+def cache_clear():
+    """
+    Remove all cached metadata.
+
+    Examples:
+        click-wrapper cache clear
+    """
+    removed = ClickUtils.cache_clear()
+    click.echo(f"Removed {removed} cache entry(ies)")
+
+@cli.group()
+@click.option(
+    "--database",
+    type=click.Path(dir_okay=False),
+    help="Registry database, 'registry.sqlite' in cache directory by default (or CLICK_WRAPPER_REGISTRY)"
+)
+@click.pass_context
+def registry(ctx: click.Context, database: Optional[str]):
+    """
+    Manage searchable registry of metadata of many Click applications.
+
+    Registered applications are parsed once and stored in SQLite database
+    (commands, parameters, options, environment variables and full-text
+    indexed help), queries take milliseconds and import nothing.
+    """
+    ctx.obj = database
+
+@registry.command(name="add")
+@click.argument("py_import_path")
+@click.argument("py_import_path_attribute", required=False)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not use (nor update) persistent metadata cache"
+)
+@click.option(
+    "--static",
+    is_flag=True,
+    help="Analyze target sources instead of importing them (falls back to import for dynamic parts)"
+)
+@click.pass_obj
+def registry_add(
+        database: Optional[str],
+        py_import_path: str,
+        py_import_path_attribute: Optional[str],
+        no_cache: bool,
+        static: bool
+):
+    """
+    Parse a Click application and store (replace) its metadata in registry.
+
+    PY_IMPORT_PATH: Dot-separated python module path (e.g., 'llm.cli').
+        If a simple name is provided without py_import_path_attribute (e.g., 'llm'),
+        automatically expands to 'llm.__main__' with attribute 'cli'.
+
+    PY_IMPORT_PATH_ATTRIBUTE: Optional attribute name to retrieve from the
+        'py_import_path' module. When None and py_import_path is a simple
+        module name, defaults to 'cli' from '__main__' module.
 
+    Examples:
+        click-wrapper registry add llm
+        click-wrapper registry add llm.cli cli --static
+        click-wrapper registry --database clis.sqlite add llm
+    """
+    try:
+        target = ClickUtils.registry_add(py_import_path, py_import_path_attribute, database, not no_cache, static)
+        click.echo(f"Registered {target.name}: {target.commands} command(s)")
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
-        raise click.Abort()
\ No newline at end of file
+        raise click.Abort()
+
+@registry.command(name="refresh")
+@click.argument("targets", nargs=-1)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Re-parse also targets whose sources did not change"
+)
+@click.pass_obj
+def registry_refresh(database: Optional[str], targets: Tuple[str, ...], force: bool):
+    """
+    Re-parse registered applications whose sources changed.
+
+    TARGETS: Registered targets (as listed by 'registry list'), all by default.
+
+    Examples:
+        click-wrapper registry refresh
+        click-wrapper registry refresh llm.__main__:cli --force
+    """
+    try:
+        status = ClickUtils.registry_refresh(database, list(targets) or None, force)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    for name, result in status.items():
+        click.echo(f"{name}: {result}")
+    if any(result.startswith("error") for result in status.values()):
+        raise click.exceptions.Exit(1)
+
+@registry.command(name="list")
+@click.pass_obj
+def registry_list(database: Optional[str]):
+    """
+    List registered applications.
+
+    Examples:
+        click-wrapper registry list
+    """
+    try:
+        for target in ClickUtils.registry_targets(database):
+            updated = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(target.updated))
+            click.echo(f"{target.name}  {target.commands} command(s)  updated {updated}")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+@registry.command(name="remove")
+@click.argument("target")
+@click.pass_obj
+def registry_remove(database: Optional[str], target: str):
+    """
+    Remove application from registry.
+
+    TARGET: Registered target (as listed by 'registry list').
+
+    Examples:
+        click-wrapper registry remove llm.__main__:cli
+    """
+    if not ClickUtils.registry_remove(target, database):
+        click.echo(f"Error: target '{target}' is not registered", err=True)
+        raise click.Abort()
+    click.echo(f"Removed {target}")
+
+@registry.command(name="query")
+@click.option("--option", help="Parameters accepting option, e.g. '--database'")
+@click.option("--envvar", help="Parameters read from environment variable")
+@click.option("--type", "type_name", help="Parameters of Click type (e.g. 'integer', 'choice') or ParamType class")
+@click.option("--text", help="Commands with phrase in help of command or of its parameters")
+@click.option("--command", help="Command name or its group, e.g. \"models\"")
+@click.option("--target", help="Only this registered target")
+@click.option("--limit", type=click.IntRange(min=1), help="Maximum number of results")
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["text", "json"], case_sensitive=False),
+    default="text",
+    help="Output format"
+)
+@click.pass_obj
+def registry_query(
+        database: Optional[str],
+        option: Optional[str],
+        envvar: Optional[str],
+        type_name: Optional[str],
+        text: Optional[str],
+        command: Optional[str],
+        target: Optional[str],
+        limit: Optional[int],
+        format: str
+):
+    """
+    Find commands of registered applications, all given criteria must match.
+
+    Examples:
+        click-wrapper registry query --option --database
+        click-wrapper registry query --envvar OPENAI_API_KEY
+        click-wrapper registry query --text "embedding" --format json
+        click-wrapper registry query --type choice --command models
+    """
+    try:
+        hits = ClickUtils.registry_query(database, option, envvar, type_name, text, command, target, limit)
+        if format == "json":
+            import json
+            from dataclasses import asdict
+            click.echo(json.dumps([asdict(hit) for hit in hits], indent=2))
+        else:
+            for hit in hits:
+                click.echo(hit.format_text())
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+##############
+# internal
+##############
+def _echo_type_diagnostics(unknown: Dict[str, ClickTypeDiagnostic]):
+    """Report Click types annotated by fallback type (once per type, not per parameter)."""
+    diagnostics = ClickTypeResolver.format_text(unknown)
+    if diagnostics:
+        click.echo(f"Warning: {diagnostics}", err=True)
+
+def _write_chunks(chunks: Iterable[str], output: Optional[str] = None):
+    """
+    Write generated chunks one by one to file, or to stdout (terminated by newline as 'click.echo').
+
+    File is written next to output and replaces it only when all chunks were generated,
+    existing output is kept when generation fails.
+    """
+    if output:
+        path = Path(output)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'w') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+    else:
+        for chunk in chunks:
+            click.echo(chunk, nl=False)
+        click.echo()
@@ -1,13 +1,27 @@
 from click import Command
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union, Optional, Iterator, Iterable
 from types import ModuleType
 
 from click_wrapper import (
     ClickImporter,
     ClickParser,
     ClickMetadata,
+    ClickMetadataCache,
+    ClickMetadataSerializer,
     ClickGenerator,
+    ClickExportReport,
+    ClickImportProfiler,
+    ClickImportProfile,
+    ClickBenchmark,
+    ClickBenchmarkReport,
+    ClickRegistry,
+    ClickRegistryTarget,
+    ClickRegistryHit,
+    ClickDiscovery,
+    ClickDiscoveryResult,
+    ClickTypeResolver,
 )
+from click_wrapper.parser import ClickDataUtils
 
 class ClickUtils:
 
@@ -24,13 +38,16 @@ class ClickUtils:
             py_import_path: str,
             full_path: bool,
             py_import_path_attribute: str = None,
+            use_cache: bool = False,
+            static: bool = False,
     ) -> List[str]:
         importer = ClickImporter(
             py_import_path=py_import_path,
             py_import_path_attribute=py_import_path_attribute,
+            lazy=use_cache or static,
         )
 
-        parser = ClickParser.factory(importer)
+        parser = ClickParser.factory(importer, ClickUtils._cache(use_cache), static)
         if full_path:
             return parser.names_full_joined
         else:
@@ -40,34 +57,280 @@ class ClickUtils:
     def commands_metadata(
             py_import_path: str,
             py_import_path_attribute: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+            command_path: List[str] = None,
     ) -> Dict[str, ClickMetadata]:
 
         importer = ClickImporter(
             py_import_path=py_import_path,
             py_import_path_attribute=py_import_path_attribute,
+            lazy=use_cache or static,
         )
-        parser = ClickParser.factory(importer)
+        parser = ClickParser.factory(importer, ClickUtils._cache(use_cache), static, command_path)
         return parser.commands_map
 
+    @staticmethod
+    def dump_metadata_chunks(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+            command_path: List[str] = None,
+            format: str = "json",
+    ) -> Iterator[str]:
+        metadata = ClickUtils.commands_metadata(py_import_path, py_import_path_attribute, use_cache, static, command_path)
+        return ClickMetadataSerializer.iter_chunks(metadata.values(), format)
+
+    @staticmethod
+    def load_metadata(file_path: str) -> List[ClickMetadata]:
+        with open(file_path, encoding="utf-8") as f:
+            return ClickMetadataSerializer.load(f)
+
     @staticmethod
     def dump_help(
             py_import_path: str,
             py_import_path_attribute: str = None,
+            use_cache: bool = False,
+            command_path: List[str] = None,
+            workers: int = 1,
     ) -> str:
         importer = ClickImporter(
             py_import_path=py_import_path,
             py_import_path_attribute=py_import_path_attribute,
+            lazy=use_cache,
         )
-        return ClickGenerator.app_help_dump(importer)
+        return ClickGenerator.app_help_dump(importer, ClickUtils._cache(use_cache), command_path, workers)
 
     @staticmethod
     def dump_wrapper(
             py_import_path: str,
             py_import_path_attribute: str = None,
-            output_file: str = None
+            output_file: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+            command_path: List[str] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False,
     ) -> str:
         importer = ClickImporter(
             py_import_path=py_import_path,
             py_import_path_attribute=py_import_path_attribute,
+            lazy=use_cache or static,
+        )
+        return ClickGenerator.app_wrapper(
+            importer,
+            output_file,
+            ClickUtils._cache(use_cache),
+            static,
+            command_path,
+            async_mode,
+            compiled,
+            features,
+            import_runtime
+        )
+
+    @staticmethod
+    def dump_help_chunks(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            use_cache: bool = False,
+            command_path: List[str] = None,
+            workers: int = 1,
+    ) -> Iterator[str]:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=use_cache,
+        )
+        return ClickGenerator.app_help_dump_chunks(importer, ClickUtils._cache(use_cache), command_path, workers)
+
+    @staticmethod
+    def dump_wrapper_chunks(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+            command_path: List[str] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False,
+    ) -> Iterator[str]:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=use_cache or static,
+        )
+        return ClickGenerator.app_wrapper_chunks(
+            importer, ClickUtils._cache(use_cache), static, command_path, async_mode, compiled, features, import_runtime
+        )
+
+    @staticmethod
+    def dump_help_incremental(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            output_file: str = None,
+            use_cache: bool = False,
+            command_path: List[str] = None,
+            workers: int = 1,
+    ) -> ClickExportReport:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=True,
+        )
+        return ClickGenerator.app_help_dump_incremental(
+            importer, output_file, ClickUtils._cache(use_cache), command_path, workers
+        )
+
+    @staticmethod
+    def dump_wrapper_incremental(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            output_file: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+            command_path: List[str] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False,
+    ) -> ClickExportReport:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=True,
+        )
+        return ClickGenerator.app_wrapper_incremental(
+            importer, output_file, ClickUtils._cache(use_cache), static, command_path, async_mode, compiled, features, import_runtime
         )
-        return ClickGenerator.app_wrapper(importer, output_file)
\ No newline at end of file
+
+    @staticmethod
+    def dump_wrapper_package(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            output_dir: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+            command_path: List[str] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            incremental: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False,
+    ) -> ClickExportReport:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=True,
+        )
+        return ClickGenerator.app_wrapper_package(
+            importer, output_dir, ClickUtils._cache(use_cache), static, command_path, async_mode, compiled, incremental,
+            features, import_runtime
+        )
+
+    @staticmethod
+    def profile_import(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            timeout: Optional[float] = None,
+    ) -> ClickImportProfile:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=True,
+        )
+        return ClickImportProfiler.profile(importer, timeout)
+
+    @staticmethod
+    def bench(
+            commands: int = 200,
+            depth: int = 3,
+            params: int = 4,
+            repeat: int = 5,
+            calls: int = 200,
+            benchmarks: List[str] = None,
+    ) -> ClickBenchmarkReport:
+        return ClickBenchmark.run(commands, depth, params, repeat, calls, benchmarks)
+
+    @staticmethod
+    def registry_add(
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            database: str = None,
+            use_cache: bool = False,
+            static: bool = False,
+    ) -> ClickRegistryTarget:
+        importer = ClickImporter(
+            py_import_path=py_import_path,
+            py_import_path_attribute=py_import_path_attribute,
+            lazy=True,
+        )
+        with ClickRegistry(database) as registry:
+            registry.add(importer, ClickUtils._cache(use_cache), static)
+            name = ClickRegistry.target_name(importer)
+            return next(target for target in registry.targets() if target.name == name)
+
+    @staticmethod
+    def registry_refresh(database: str = None, names: List[str] = None, force: bool = False) -> Dict[str, str]:
+        with ClickRegistry(database) as registry:
+            return registry.refresh(names, force)
+
+    @staticmethod
+    def registry_remove(name: str, database: str = None) -> bool:
+        with ClickRegistry(database) as registry:
+            return registry.remove(name)
+
+    @staticmethod
+    def registry_targets(database: str = None) -> List[ClickRegistryTarget]:
+        with ClickRegistry(database) as registry:
+            return registry.targets()
+
+    @staticmethod
+    def registry_query(
+            database: str = None,
+            option: str = None,
+            envvar: str = None,
+            type_name: str = None,
+            text: str = None,
+            command: str = None,
+            target: str = None,
+            limit: int = None,
+    ) -> List[ClickRegistryHit]:
+        with ClickRegistry(database) as registry:
+            return registry.query(option, envvar, type_name, text, command, target, limit)
+
+    @staticmethod
+    def discover(
+            group: str = "console_scripts",
+            distributions: List[str] = None,
+            click_only: bool = True,
+            workers: Optional[int] = None,
+            timeout: Optional[float] = 60.0,
+            max_memory_mb: Optional[float] = None,
+    ) -> Iterator[ClickDiscoveryResult]:
+        entry_points = ClickDiscovery.entry_points(group, distributions, click_only)
+        return ClickDiscovery.discover(entry_points, workers, timeout, max_memory_mb)
+
+    @staticmethod
+    def type_resolver() -> ClickTypeResolver:
+        """Resolver of Python types of Click types used by generated wrappers, see 'register_type'."""
+        return ClickDataUtils.type_resolver
+
+    @staticmethod
+    def register_type(param_type: Union[type, str], python_type: Any):
+        ClickDataUtils.type_resolver.register(param_type, python_type)
+
+    @staticmethod
+    def cache_clear() -> int:
+        return ClickMetadataCache().clear()
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _cache(use_cache: bool) -> Optional[ClickMetadataCache]:
+        return ClickMetadataCache() if use_cache else None
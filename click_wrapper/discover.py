@@ -0,0 +1,254 @@
+import importlib.metadata
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from click_wrapper.parser import ClickMetadata
+from click_wrapper.serializer import ClickMetadataSerializer
+
+# child process: load entry point (optionally under memory limit), report status line, then NDJSON metadata records
+_CHILD_SCRIPT = '''
+import json, os, sys
+name, value, group, max_memory_mb = sys.argv[1:5]
+# target output (e.g. printed at import) must not mix with results, fd 1 goes to stderr
+out = os.fdopen(os.dup(1), "w")
+os.dup2(2, 1)
+def report(status, error=None):
+    out.write(json.dumps({"status": status, "error": error}) + "\\n")
+if float(max_memory_mb):
+    try:
+        import resource
+        limit = int(float(max_memory_mb) * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+try:
+    from importlib.metadata import EntryPoint
+    target = EntryPoint(name, value, group).load()
+    import click
+    if not isinstance(target, click.Command):
+        report("not_click", f"{type(target).__name__} object")
+    else:
+        from click_wrapper.parser import ClickParser
+        from click_wrapper.serializer import ClickMetadataSerializer
+        metadata = ClickParser._traverse(value.split(":")[0].strip().split(".")[0], target)
+        report("ok")
+        for line in ClickMetadataSerializer.iter_ndjson(metadata):
+            out.write(line)
+except MemoryError:
+    report("memory", "Memory limit exceeded")
+except BaseException as e:
+    report("error", f"{type(e).__name__}: {e}")
+out.flush()
+'''
+
+@dataclass
+class ClickEntryPoint:
+    """Entry point of installed distribution."""
+    name: str
+    value: str
+    group: str
+    distribution: str
+    version: str
+
+@dataclass
+class ClickDiscoveryResult:
+    """
+    Outcome of inspecting one entry point in a worker process.
+
+    'status' is 'ok' (Click command, 'records' hold its metadata), 'not_click', 'error',
+    'timeout' or 'memory' (memory limit exceeded).
+    """
+    entry_point: ClickEntryPoint
+    status: str
+    seconds: float
+    error: Optional[str] = None
+    # encoded metadata records (NDJSON lines without newline), see ClickMetadataSerializer
+    records: List[str] = field(default_factory=list)
+
+    @property
+    def metadata(self) -> List[ClickMetadata]:
+        return ClickMetadataSerializer.from_records(json.loads(record) for record in self.records)
+
+    def to_json(self) -> str:
+        """One line snapshot, metadata records are embedded as they are (not re-encoded)."""
+        head = json.dumps(
+            {
+                "name": self.entry_point.name,
+                "value": self.entry_point.value,
+                "group": self.entry_point.group,
+                "distribution": self.entry_point.distribution,
+                "version": self.entry_point.version,
+                "status": self.status,
+                "seconds": round(self.seconds, 3),
+                "error": self.error,
+            },
+            separators=(",", ":")
+        )
+        return f'{head[:-1]},"commands":[{",".join(self.records)}]}}'
+
+    def format_text(self) -> str:
+        detail = f"{len(self.records)} command(s)" if self.status == "ok" else self.error or ""
+        return (
+            f"{self.status:<9} {self.entry_point.name:<24} {self.entry_point.value} "
+            f"({self.entry_point.distribution} {self.entry_point.version}, {self.seconds:.2f} s) {detail}"
+        )
+
+class ClickDiscovery:
+    """
+    Find Click commands among entry points of installed distributions.
+
+    Entry points are listed from distribution metadata without importing anything, by
+    default only those of distributions depending (transitively) on click. Every
+    candidate is loaded and parsed in its own child process, so crashes and side effects
+    of imports stay isolated; processes run in parallel, each with timeout and optional
+    memory limit, and results are yielded as they complete.
+
+    Examples:
+        >>> entry_points = ClickDiscovery.entry_points()
+        >>> for result in ClickDiscovery.discover(entry_points, timeout=30, max_memory_mb=1024):
+        ...     print(result.format_text())
+    """
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def entry_points(
+            group: str = "console_scripts",
+            distributions: Optional[Iterable[str]] = None,
+            click_only: bool = True,
+    ) -> List[ClickEntryPoint]:
+        """
+        Entry points of installed distributions, sorted by distribution and name.
+
+        Args:
+            group: Entry point group
+            distributions: Only entry points of these distributions (all when None)
+            click_only: Only distributions depending on click, directly or through other distributions
+
+        Returns:
+            Entry points, first one of each (name, value) found on sys.path
+        """
+        selected = {ClickDiscovery._normalize(name) for name in distributions} if distributions is not None else None
+        dependents = ClickDiscovery.click_dependents() if click_only else None
+
+        found: Dict[tuple, ClickEntryPoint] = {}
+        for distribution in importlib.metadata.distributions():
+            name = distribution.metadata["Name"]
+            if not name:
+                continue
+            normalized = ClickDiscovery._normalize(name)
+            if (selected is not None and normalized not in selected) or (dependents is not None and normalized not in dependents):
+                continue
+            for entry_point in distribution.entry_points:
+                if entry_point.group == group:
+                    found.setdefault(
+                        (entry_point.name, entry_point.value),
+                        ClickEntryPoint(entry_point.name, entry_point.value, group, name, distribution.version),
+                    )
+        return sorted(found.values(), key=lambda entry_point: (entry_point.distribution.lower(), entry_point.name))
+
+    @staticmethod
+    def click_dependents() -> Set[str]:
+        """Normalized names of installed distributions requiring click, directly or transitively."""
+        requires: Dict[str, Set[str]] = {}
+        for distribution in importlib.metadata.distributions():
+            name = distribution.metadata["Name"]
+            if not name:
+                continue
+            names = requires.setdefault(ClickDiscovery._normalize(name), set())
+            for requirement in distribution.requires or []:
+                match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", requirement)
+                if match:
+                    names.add(ClickDiscovery._normalize(match.group(1)))
+
+        dependents = {"click"}
+        changed = True
+        while changed:
+            changed = False
+            for name, names in requires.items():
+                if name not in dependents and names & dependents:
+                    dependents.add(name)
+                    changed = True
+        dependents.discard("click")
+        return dependents
+
+    @staticmethod
+    def discover(
+            entry_points: Iterable[ClickEntryPoint],
+            workers: Optional[int] = None,
+            timeout: Optional[float] = 60.0,
+            max_memory_mb: Optional[float] = None,
+    ) -> Iterator[ClickDiscoveryResult]:
+        """
+        Inspect entry points in parallel child processes, yield results as they complete.
+
+        Args:
+            entry_points: Entry points to inspect (see 'entry_points')
+            workers: Number of concurrent child processes (CPU count if None)
+            timeout: Seconds per entry point, child process is killed then (no limit if None)
+            max_memory_mb: Address space limit of child processes (POSIX only, no limit if None)
+        """
+        executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        try:
+            futures = [
+                executor.submit(ClickDiscovery.inspect, entry_point, timeout, max_memory_mb)
+                for entry_point in entry_points
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # consumer stopped early, running child processes finish (or time out) on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def inspect(
+            entry_point: ClickEntryPoint,
+            timeout: Optional[float] = 60.0,
+            max_memory_mb: Optional[float] = None,
+    ) -> ClickDiscoveryResult:
+        """Load and parse entry point in child process, see 'discover'."""
+        env = dict(os.environ)
+        # child sees the same modules as this process (e.g. sources on sys.path added at runtime)
+        env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+        start = time.perf_counter()
+        try:
+            process = subprocess.run(
+                [
+                    sys.executable, "-c", _CHILD_SCRIPT,
+                    entry_point.name, entry_point.value, entry_point.group, str(max_memory_mb or 0),
+                ],
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=timeout,
+                stdin=subprocess.DEVNULL,
+            )
+        except subprocess.TimeoutExpired:
+            return ClickDiscoveryResult(
+                entry_point, "timeout", time.perf_counter() - start, f"No result within {timeout} s"
+            )
+        seconds = time.perf_counter() - start
+
+        lines = process.stdout.splitlines()
+        try:
+            status = json.loads(lines[0])
+        except (IndexError, ValueError):
+            errors = process.stderr.strip().splitlines()
+            crashed = f"Worker process crashed (exit code {process.returncode})"
+            return ClickDiscoveryResult(entry_point, "error", seconds, "\n".join([crashed, *errors[-5:]]))
+        return ClickDiscoveryResult(entry_point, status["status"], seconds, status["error"], lines[1:])
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return re.sub(r"[-_.]+", "-", name).lower()
@@ -1,4 +1,4 @@
-from typing import Dict, Union, List, Tuple, Any, Optional
+from typing import Dict, Union, List, Tuple, Any, Optional, Iterator, Iterable
 
 from pathlib import Path
 
@@ -6,59 +6,244 @@ from click_wrapper import (
     ClickImporter,
     ClickParser,
     ClickWrapper,
+    ClickMetadataCache,
+    ClickHelpRenderer,
+    ClickExportManifest,
+    ClickExportReport,
 )
 
 class ClickGenerator:
 
     @staticmethod
-    def app_help_dump(importer: ClickImporter) -> str:
+    def app_help_dump(
+            importer: ClickImporter,
+            cache: Optional[ClickMetadataCache] = None,
+            command_path: Optional[List[str]] = None,
+            workers: int = 1,
+            runner: bool = False
+    ) -> str:
         """
         Convenience function to generate help from a parser.
 
         Args:
             importer: ClickImporter instance
+            cache: Optional metadata cache (help itself is always rendered by target CLI)
+            command_path: Optional command names, only help of this subtree is generated
+            workers: Number of processes rendering help, 1 renders in this process, 0 uses all CPUs
+            runner: Render help by invoking '--help' of each command through CliRunner
+                (reference implementation, much slower)
 
         Returns:
             Returns full help for Click command and its subcommands
         """
-        parser = ClickParser.factory(importer)
+        return "".join(ClickGenerator.app_help_dump_chunks(importer, cache, command_path, workers, runner))
+
+    @staticmethod
+    def app_help_dump_chunks(
+            importer: ClickImporter,
+            cache: Optional[ClickMetadataCache] = None,
+            command_path: Optional[List[str]] = None,
+            workers: int = 1,
+            runner: bool = False
+    ) -> Iterator[str]:
+        """
+        Same as 'app_help_dump', but help is yielded per command as it is rendered.
+
+        Joined chunks are equal to 'app_help_dump' output.
+        """
+        for _, chunk in ClickGenerator.app_help_dump_sections(importer, cache, command_path, workers, runner):
+            yield chunk
+
+    @staticmethod
+    def app_help_dump_sections(
+            importer: ClickImporter,
+            cache: Optional[ClickMetadataCache] = None,
+            command_path: Optional[List[str]] = None,
+            workers: int = 1,
+            runner: bool = False
+    ) -> Iterator[Tuple[str, str]]:
+        """Same as 'app_help_dump_chunks', chunks are paired with command name (e.g. "models list")."""
+        parser = ClickParser.factory(importer, cache, command_path=command_path)
 
         # Code inspired by Simon Willison
         # First find all commands and subcommands
         # List will be [["command"], ["command", "subcommand"], ...]
         # Remove first item of each list (it is 'cli')
         commands = parser.names_short
+        if runner:
+            results = (parser.importer.run_command(command + ["--help"]) for command in commands)
+        else:
+            results = ClickHelpRenderer(parser.importer).iter_render(commands, workers)
+
         # Now generate help for each one, with appropriate heading level
-        output = []
-        for command in commands:
+        for i, (command, result) in enumerate(zip(commands, results)):
             heading_level = len(command) + 2
-            result = parser.importer.run_command(command + ["--help"])
             hyphenated = "-".join(command)
             if hyphenated:
                 hyphenated = "-" + hyphenated
-            output.append(f"\n(help{hyphenated})=")
-            output.append("#" * heading_level + " llm " + " ".join(command) + " --help")
-            output.append("```")
-            output.append(result.replace("Usage: cli", "Usage: llm").strip())
-            output.append("```")
-        return "\n".join(output)
+            output = [
+                f"\n(help{hyphenated})=",
+                "#" * heading_level + " llm " + " ".join(command) + " --help",
+                "```",
+                result.replace("Usage: cli", "Usage: llm").strip(),
+                "```",
+            ]
+            # root command has its own section, "" is reserved for shared content
+            yield " ".join(command) or parser.script_string_package, ("\n" if i else "") + "\n".join(output)
 
     @staticmethod
-    def app_wrapper(importer: ClickImporter, output_file: str = None) -> str:
+    def app_help_dump_incremental(
+            importer: ClickImporter,
+            output_file: str,
+            cache: Optional[ClickMetadataCache] = None,
+            command_path: Optional[List[str]] = None,
+            workers: int = 1
+    ) -> ClickExportReport:
+        """
+        Same as 'app_help_dump' written to 'output_file', rewritten only when content changed.
+
+        Content hash of each command is kept in manifest next to output file. When target
+        sources, click-wrapper and arguments did not change since last export, target is not
+        even imported. Importer should be lazy for that.
+
+        Returns:
+            Report with changed / unchanged commands and written files
+        """
+        manifest = ClickExportManifest(Path(output_file))
+        key = ClickExportManifest.key(importer, kind="help", command_path=command_path)
+        report = manifest.unchanged(key)
+        if report is not None:
+            return report
+        sections = ClickGenerator.app_help_dump_sections(importer, cache, command_path, workers)
+        return manifest.export([(Path(output_file).name, sections)], key)
+
+    @staticmethod
+    def app_wrapper(
+            importer: ClickImporter,
+            output_file: str = None,
+            cache: Optional[ClickMetadataCache] = None,
+            static: bool = False,
+            command_path: Optional[List[str]] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False
+    ) -> str:
         """
         Convenience function to generate wrapper code from a parser.
 
         Args:
             importer: ClickImporter instance
             output_file: file path
+            cache: Optional metadata cache
+            static: Parse target CLI from its sources, without importing it
+            command_path: Optional command names, only this subtree is wrapped
+            async_mode: Additionally generate asyncio client class with awaitable cmd_* methods
+            compiled: Slotted options dataclasses encoded to argv by precomputed tables
+            features: Also generate cmd_*_<feature> methods, see 'ClickWrapper.features_all'
+            import_runtime: Import importer runtime from click_wrapper instead of copying its source
 
         Returns:
             Complete generated Python code as string
         """
-        generator = ClickWrapper(importer)
-        code_string = generator.generate()
+        code_string = "".join(ClickGenerator.app_wrapper_chunks(
+            importer, cache, static, command_path, async_mode, compiled, features, import_runtime
+        ))
 
         if output_file:
             Path(output_file).write_text(code_string)
 
         return code_string
+
+    @staticmethod
+    def app_wrapper_chunks(
+            importer: ClickImporter,
+            cache: Optional[ClickMetadataCache] = None,
+            static: bool = False,
+            command_path: Optional[List[str]] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False
+    ) -> Iterator[str]:
+        """
+        Same as 'app_wrapper', but code is yielded per command and nothing is written.
+
+        Joined chunks are equal to 'app_wrapper' output.
+        """
+        return ClickWrapper(
+            importer, cache, static, command_path, async_mode, compiled, features, import_runtime
+        ).generate_chunks()
+
+    @staticmethod
+    def app_wrapper_incremental(
+            importer: ClickImporter,
+            output_file: str,
+            cache: Optional[ClickMetadataCache] = None,
+            static: bool = False,
+            command_path: Optional[List[str]] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False
+    ) -> ClickExportReport:
+        """
+        Same as 'app_wrapper', but file is rewritten only when generated code changed.
+
+        Content hash of each command section is kept in manifest next to output file. When
+        target sources, click-wrapper and arguments did not change since last export, target
+        is not even imported (importer should be lazy for that).
+
+        Returns:
+            Report with changed / unchanged commands and written files
+        """
+        manifest = ClickExportManifest(Path(output_file))
+        key = ClickExportManifest.key(
+            importer, kind="wrapper", static=static, command_path=command_path, async_mode=async_mode, compiled=compiled,
+            features=sorted(set(features or ())), import_runtime=import_runtime
+        )
+        report = manifest.unchanged(key)
+        if report is not None:
+            return report
+        sections = ClickWrapper(
+            importer, cache, static, command_path, async_mode, compiled, features, import_runtime
+        ).generate_sections()
+        return manifest.export([(Path(output_file).name, sections)], key)
+
+    @staticmethod
+    def app_wrapper_package(
+            importer: ClickImporter,
+            output_dir: str,
+            cache: Optional[ClickMetadataCache] = None,
+            static: bool = False,
+            command_path: Optional[List[str]] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            incremental: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False
+    ) -> ClickExportReport:
+        """
+        Generate wrapper as package with one module per top-level group (see 'ClickWrapper.generate_package').
+
+        Modules are rewritten only when their content changed, with 'incremental' the whole
+        export is skipped (target not even imported) when nothing changed since last export.
+
+        Args:
+            importer: ClickImporter instance
+            output_dir: Package directory, created when missing
+            incremental: Skip export when target sources, click-wrapper and arguments are unchanged
+
+        Returns:
+            Report with changed / unchanged commands and written files
+        """
+        manifest = ClickExportManifest(Path(output_dir) / "__init__.py")
+        key = ClickExportManifest.key(
+            importer, kind="package", static=static, command_path=command_path, async_mode=async_mode, compiled=compiled,
+            features=sorted(set(features or ())), import_runtime=import_runtime
+        ) if incremental else None
+        report = manifest.unchanged(key)
+        if report is not None:
+            return report
+        wrapper = ClickWrapper(importer, cache, static, command_path, async_mode, compiled, features, import_runtime)
+        return manifest.export(wrapper.generate_package(), key)
@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import click
+from click import Command, Context
+
+from click_wrapper.importer import ClickImporter
+
+class ClickHelpRenderer:
+    """
+    Render help of Click commands without invoking them.
+
+    Builds 'click.Context' chain for each command path (exactly as Click does while
+    resolving 'cmd sub --help') and calls 'get_help()' directly. Output is identical
+    to 'ClickImporter.run_command(path + ["--help"])', but no streams are swapped,
+    no argv is parsed and no SystemExit is raised.
+
+    Contexts of the last rendered command path are kept, so commands rendered in
+    pre-order share contexts of their parents.
+    """
+
+    # CliRunner renders help at fixed terminal width
+    width: int = 80
+
+    def __init__(self, importer: ClickImporter):
+        self.importer: ClickImporter = importer
+        # (name, context) from root to the last rendered command
+        self._stack: List[Tuple[str, Context]] = []
+
+    ##############
+    # api extra
+    ##############
+    def render(self, command_path: List[str]) -> str:
+        """
+        Render help of a single command.
+
+        Args:
+            command_path: Command names below root, e.g. ["models", "list"]
+
+        Returns:
+            Help text, same as CliRunner output of 'command_path + ["--help"]'
+
+        Raises:
+            ValueError: If command path does not exist
+        """
+        return self.render_many([command_path])[0]
+
+    def render_many(self, command_paths: List[List[str]], workers: int = 1) -> List[str]:
+        """
+        Render help of several commands, results are in the order of 'command_paths'.
+
+        Args:
+            command_paths: List of command names below root
+            workers: Number of worker processes, 1 renders in this process,
+                0 uses all CPUs. Every worker imports target CLI by itself, so
+                pool pays off only for very large command trees.
+
+        Returns:
+            List of help texts
+        """
+        return list(self.iter_render(command_paths, workers))
+
+    def iter_render(self, command_paths: List[List[str]], workers: int = 1) -> Iterator[str]:
+        """Same as 'render_many', but help texts are yielded one by one as they are rendered."""
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(command_paths) > 1:
+            yield from self._render_pool(command_paths, workers)
+            return
+
+        for path in command_paths:
+            yield click.unstyle(self._context(path).get_help()) + "\n"
+
+    ##############
+    # internal
+    ##############
+    def _context(self, command_path: List[str]) -> Context:
+        stack = self._stack
+        # keep contexts of common prefix with previously rendered command
+        depth = 0
+        while depth < len(command_path) and depth + 1 < len(stack) and stack[depth + 1][0] == command_path[depth]:
+            depth += 1
+        del stack[depth + 1:]
+
+        if not stack:
+            cli: Command = self.importer.click_obj_cli_main
+            # same prog name as CliRunner.invoke, width is inherited by subcommand contexts
+            # (process-wide 'formatting.FORCED_WIDTH' is left alone, context settings still take precedence)
+            settings = {"terminal_width": self.width, "max_content_width": self.width, **cli.context_settings}
+            stack.append(("", cli.context_class(cli, info_name=cli.name or "root", **settings)))
+
+        for i in range(depth, len(command_path)):
+            name = command_path[i]
+            parent = stack[-1][1]
+            cmd = None
+            if isinstance(parent.command, click.Group):
+                cmd = parent.command.get_command(parent, name)
+            if cmd is None:
+                raise ValueError(f"Command '{' '.join(command_path[:i + 1])}' not found")
+            stack.append((name, cmd.context_class(cmd, info_name=name, parent=parent, **cmd.context_settings)))
+
+        return stack[-1][1]
+
+    def _render_pool(self, command_paths: List[List[str]], workers: int) -> Iterator[str]:
+        # contiguous chunks keep siblings together, so parent contexts are reused in worker
+        chunk_size = -(-len(command_paths) // (workers * 4))
+        chunks = [command_paths[i:i + chunk_size] for i in range(0, len(command_paths), chunk_size)]
+        target = (self.importer.py_import_path, self.importer.py_import_path_attribute)
+
+        # fresh interpreters, fork of a process running threads may deadlock
+        with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            for chunk_result in executor.map(_render_chunk, [target] * len(chunks), chunks):
+                yield from chunk_result
+
+
+def _render_chunk(target: Tuple[str, Optional[str]], command_paths: List[List[str]]) -> List[str]:
+    """Process pool worker, module level to be picklable."""
+    importer = ClickImporter(py_import_path=target[0], py_import_path_attribute=target[1], lazy=True)
+    return ClickHelpRenderer(importer).render_many(command_paths)
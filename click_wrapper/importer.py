@@ -1,16 +1,859 @@
+import codecs
+import errno
 import importlib
-from typing import Union, List, Optional
+import io
+import mmap
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Union, List, Optional, Tuple, IO, Iterator, Generator, Iterable, Sequence, Callable
 from types import ModuleType
-from click import Command
+from click import Command, Context, Group, echo, termui
+from click import core as click_core
+from click.exceptions import Abort, ClickException, Exit
 from click.testing import CliRunner
 
 class ClickImporterError(Exception):
     """Exception raised when cli command fails"""
     pass
 
+def _failure_message(description: str, output: str, exception: Optional[BaseException] = None) -> str:
+    """Message of ClickImporterError, names unexpected exception raised by the command."""
+    message = f"Command {description} failed: {output}"
+    if exception is not None:
+        message += f"\n{type(exception).__name__}: {exception}"
+    return message
+
+class _ThreadLocalStream:
+    """
+    Replacement of sys.stdin / sys.stdout / sys.stderr routing to the stream bound to current thread.
+
+    Threads without bound stream use the stream which was in place when proxy was installed.
+    """
+
+    def __init__(self, default: IO):
+        self._default = default
+        self._local = threading.local()
+
+    @property
+    def _stream(self) -> IO:
+        return getattr(self._local, "stream", None) or self._default
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def write(self, s):
+        return self._stream.write(s)
+
+    def flush(self):
+        return self._stream.flush()
+
+    def isatty(self) -> bool:
+        return self._stream.isatty()
+
+class _CapturedTextIO(io.TextIOWrapper):
+    """Text stream over in-memory buffer, named like CliRunner streams."""
+
+    def __init__(self, buffer: IO[bytes], name: str, mode: str, **kwargs):
+        super().__init__(buffer, encoding="utf-8", **kwargs)
+        self._name = name
+        self._mode = mode
+
+    def close(self):
+        # buffer belongs to the caller, do not close it when wrapper is garbage collected
+        pass
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+class _QueueSink(io.RawIOBase):
+    """Binary output handing written chunks over to consuming thread, bounded for constant memory."""
+
+    def __init__(self, maxsize: int = 64):
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize)
+        self.cancelled = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if self.cancelled:
+            raise BrokenPipeError(errno.EPIPE, "Output stream closed")
+        self.queue.put(bytes(b))
+        return len(b)
+
+    def cancel(self):
+        self.cancelled = True
+        # unblock pending write, at most one more chunk and end marker follow
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+class _PipeSink(io.RawIOBase):
+    """Binary output sending written chunks over a pipe (pool worker)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.conn.send(bytes(b))
+        return len(b)
+
+class _SpoolSink(io.RawIOBase):
+    """Binary output kept in memory up to threshold, then moved to a temporary file."""
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.file: IO[bytes] = io.BytesIO()
+        self.size = 0
+        self.spooled = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if not self.spooled and self.size + len(b) > self.threshold:
+            file = tempfile.TemporaryFile()
+            with self.file.getbuffer() as view:
+                file.write(view)
+            self.file = file
+            self.spooled = True
+        self.file.write(b)
+        self.size += len(b)
+        return len(b)
+
+class _IsolationState:
+    """
+    Stream proxies and prompt hooks installed while commands run, with what they replaced.
+
+    Kept on 'click.termui' module, so copies of this module inlined in generated wrappers
+    share it and commands run by any of them in the same process stay isolated.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # stdin of command running in current thread, used by prompt hooks
+        self.local = threading.local()
+        # number of commands running in this process
+        self.active = 0
+        # stream proxies followed by prompt hooks, and what they replaced
+        self.installed: tuple = ()
+        self.originals: tuple = ()
+
+class _ThreadIsolation:
+    """
+    Per-thread equivalent of CliRunner isolation.
+
+    Stream proxies and prompt hooks are installed when the first command starts and removed
+    when the last running command finishes, every call only binds its own stdin and output
+    to the current thread. Commands running in different threads never see each other's
+    streams, threads not running a command are left untouched.
+    """
+
+    # replaced while commands run, in order of '_IsolationState.installed'
+    _targets = (
+        (sys, "stdin"), (sys, "stdout"), (sys, "stderr"),
+        (termui, "visible_prompt_func"), (termui, "hidden_prompt_func"), (termui, "_getchar"),
+    )
+
+    @classmethod
+    def acquire(cls) -> Tuple[Tuple[_ThreadLocalStream, _ThreadLocalStream, _ThreadLocalStream], threading.local]:
+        """
+        Install stream proxies and prompt hooks unless a command is already running, returns
+        proxies and thread-local stdin used by hooks. Every call must be paired with 'release'.
+        """
+        state = cls._state()
+        with state.lock:
+            if state.active == 0:
+                state.originals = tuple(getattr(owner, name) for owner, name in cls._targets)
+                stdin, stdout, stderr, visible, hidden, getchar = state.originals
+                state.installed = (
+                    _ThreadLocalStream(stdin), _ThreadLocalStream(stdout), _ThreadLocalStream(stderr),
+                    cls._hook(visible, cls._visible_input, state.local),
+                    cls._hook(hidden, cls._hidden_input, state.local),
+                    cls._hook(getchar, cls._getchar, state.local),
+                )
+                for (owner, name), replacement in zip(cls._targets, state.installed):
+                    setattr(owner, name, replacement)
+            state.active += 1
+            return state.installed[:3], state.local
+
+    @classmethod
+    def release(cls):
+        """Restore original streams and prompt functions when the last running command finishes."""
+        state = cls._state()
+        with state.lock:
+            state.active -= 1
+            if state.active:
+                return
+            for (owner, name), replacement, original in zip(cls._targets, state.installed, state.originals):
+                # replaced by someone else meanwhile (e.g. redirect_stdout), proxies keep forwarding to originals
+                if getattr(owner, name) is replacement:
+                    setattr(owner, name, original)
+            state.installed = state.originals = ()
+
+    @classmethod
+    def run(
+            cls,
+            cli: Command,
+            args: List[str],
+            input: Optional[Union[str, bytes, IO]] = None,
+            main: Optional[Callable[[dict], None]] = None
+    ) -> Tuple[int, str, Optional[BaseException]]:
+        """
+        Invoke cli like CliRunner.invoke, returns exit code, mixed stdout / stderr output
+        and unexpected exception raised by the command.
+        """
+        output = io.BytesIO()
+        exit_code, exception = cls.run_to(cli, args, input, output, main)
+        return exit_code, output.getvalue().decode("utf-8", "replace").replace("\r\n", "\n"), exception
+
+    @classmethod
+    def stream(
+            cls,
+            cli: Command,
+            args: List[str],
+            input: Optional[Union[str, bytes, IO]] = None
+    ) -> Generator[bytes, None, Tuple[int, Optional[BaseException]]]:
+        """Invoke cli in a new thread, output is yielded as written, returns exit code and unexpected exception."""
+        sink = _QueueSink()
+        result = []
+
+        def target():
+            try:
+                result.append(cls.run_to(cli, args, input, sink))
+            finally:
+                sink.queue.put(None)
+
+        thread = threading.Thread(target=target, name=f"click-command {' '.join(args)}", daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = sink.queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            if not result:
+                # consumer stopped early, next write of the command fails with EPIPE
+                sink.cancel()
+        thread.join()
+        return result[0]
+
+    @classmethod
+    def run_to(
+            cls,
+            cli: Command,
+            args: List[str],
+            input: Optional[Union[str, bytes, IO]],
+            output: IO[bytes],
+            main: Optional[Callable[[dict], None]] = None
+    ) -> Tuple[int, Optional[BaseException]]:
+        """
+        Invoke cli like CliRunner.invoke, output is written to binary 'output', returns exit code
+        and unexpected exception raised by the command (exit code is 1 then, as of CliRunner).
+
+        'main' replaces 'cli.main(args)', it gets extra root context settings and exits like 'cli.main'.
+        """
+        if isinstance(input, str):
+            input = input.encode("utf-8")
+        if not hasattr(input, "read"):
+            input = io.BytesIO(input or b"")
+        elif isinstance(input, io.TextIOBase):
+            input = input.buffer
+
+        stdin = _CapturedTextIO(input, name="<stdin>", mode="r")
+        stdout = _CapturedTextIO(output, name="<stdout>", mode="w", errors="backslashreplace", write_through=True)
+
+        proxies, local = cls.acquire()
+        previous = [getattr(proxy._local, "stream", None) for proxy in proxies]
+        previous_stdin = getattr(local, "stdin", None)
+        for proxy, stream in zip(proxies, (stdin, stdout, stdout)):
+            proxy._local.stream = stream
+        local.stdin = stdin
+
+        extra = {}
+        if "terminal_width" not in cli.context_settings:
+            # CliRunner renders at fixed width
+            extra["terminal_width"] = 80
+        exception = None
+        try:
+            if main is None:
+                cli.main(args=args, prog_name=cli.name or "root", **extra)
+            else:
+                main(extra)
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = e.code if e.code is not None else 0
+            if not isinstance(exit_code, int):
+                stdout.write(f"{exit_code}\n")
+                exit_code = 1
+        except Exception as e:
+            exit_code, exception = 1, e
+        finally:
+            stdout.flush()
+            for proxy, stream in zip(proxies, previous):
+                proxy._local.stream = stream
+            local.stdin = previous_stdin
+            cls.release()
+
+        return exit_code, exception
+
+    ##############
+    # internal, prompt hooks behave as of CliRunner
+    ##############
+    @staticmethod
+    def _state() -> _IsolationState:
+        state = getattr(termui, "_thread_isolation", None)
+        if state is None:
+            # setdefault is atomic, first copy of this module to get here wins
+            state = termui.__dict__.setdefault("_thread_isolation", _IsolationState())
+        return state
+
+    @staticmethod
+    def _hook(original, isolated, local: threading.local):
+        def hook(*args):
+            stdin = getattr(local, "stdin", None)
+            if stdin is None:
+                if original is None:
+                    # termui._getchar is resolved lazily by click
+                    from click._termui_impl import getchar
+                    return getchar(*args)
+                return original(*args)
+            return isolated(stdin, *args)
+        return hook
+
+    @staticmethod
+    def _visible_input(stdin: IO, prompt: Optional[str] = None) -> str:
+        sys.stdout.write(prompt or "")
+        line = stdin.readline()
+        if not line:
+            raise EOFError()
+        val = line.rstrip("\r\n")
+        sys.stdout.write(f"{val}\n")
+        sys.stdout.flush()
+        return val
+
+    @staticmethod
+    def _hidden_input(stdin: IO, prompt: Optional[str] = None) -> str:
+        sys.stdout.write(f"{prompt or ''}\n")
+        sys.stdout.flush()
+        line = stdin.readline()
+        if not line:
+            raise EOFError()
+        return line.rstrip("\r\n")
+
+    @staticmethod
+    def _getchar(stdin: IO, echo: bool) -> str:
+        char = stdin.read(1)
+        if echo:
+            sys.stdout.write(char)
+        sys.stdout.flush()
+        return char
+
+class _DirectCommand:
+    """
+    Command path resolved once, invoked with already typed parameters instead of argv.
+
+    Contexts are built as 'Command.main' builds them (root to leaf, every group callback runs
+    before its subcommand context is created), but nothing is parsed: parameters given by caller
+    are put to leaf context as they are, all other parameters get their defaults, environment
+    variables and conversions from Click.
+    """
+
+    def __init__(self, cli: Command, command_path: List[str]):
+        self.chain: List[Tuple[str, Command]] = [(cli.name or "root", cli)]
+        ctx = cli.context_class(cli, info_name=cli.name or "root", **cli.context_settings)
+        for i, name in enumerate(command_path):
+            group = self.chain[-1][1]
+            cmd = group.get_command(ctx, name) if isinstance(group, Group) else None
+            if cmd is None:
+                raise ValueError(f"Command '{' '.join(command_path[:i + 1])}' not found")
+            self.chain.append((name, cmd))
+            ctx = cmd.context_class(cmd, info_name=name, parent=ctx, **cmd.context_settings)
+        self.param_names = {param.name for param in self.chain[-1][1].params if param.expose_value}
+
+    def main(self, params: dict, extra: dict):
+        """Same as 'Command.main' in standalone mode: errors are shown, exits with SystemExit."""
+        try:
+            try:
+                self._invoke(params, extra)
+            except (EOFError, KeyboardInterrupt) as e:
+                echo(file=sys.stderr)
+                raise Abort() from e
+            except ClickException as e:
+                e.show()
+                sys.exit(e.exit_code)
+            except OSError as e:
+                if e.errno == errno.EPIPE:
+                    sys.exit(1)
+                raise
+        except Exit as e:
+            sys.exit(e.exit_code)
+        except Abort:
+            echo("Aborted!", file=sys.stderr)
+            sys.exit(1)
+
+    def _invoke(self, params: dict, extra: dict):
+        leaf = len(self.chain) - 1
+        ctx: Optional[Context] = None
+        contexts: List[Context] = []
+        with ExitStack() as stack:
+            for i, (name, cmd) in enumerate(self.chain):
+                settings = {**extra, **cmd.context_settings} if i == 0 else cmd.context_settings
+                ctx = stack.enter_context(cmd.context_class(cmd, info_name=name, parent=ctx, **settings))
+                contexts.append(ctx)
+                self._process_params(ctx, params if i == leaf else {})
+                if i == leaf:
+                    value = cmd.invoke(ctx)
+                else:
+                    ctx.invoked_subcommand = "*" if cmd.chain else self.chain[i + 1][0]
+                    Command.invoke(cmd, ctx)
+
+            # result callbacks of groups, innermost first
+            for ctx in reversed(contexts[:-1]):
+                group = ctx.command
+                if group.chain:
+                    value = [value]
+                if group._result_callback is not None:
+                    value = ctx.invoke(group._result_callback, value, **ctx.params)
+
+    @staticmethod
+    def _process_params(ctx: Context, params: dict):
+        unset = getattr(click_core, "UNSET", None)
+        with ctx.scope(cleanup=False):
+            for param in click_core.iter_params_for_processing([], ctx.command.get_params(ctx)):
+                if param.name in params and param.expose_value:
+                    ctx.params[param.name] = params[param.name]
+                else:
+                    param.handle_parse_result(ctx, {}, [])
+        for name, value in ctx.params.items():
+            if unset is not None and value is unset:
+                ctx.params[name] = None
+
+class _ProcessPool:
+    """
+    Long-lived worker processes, each importing target CLI once and running commands sent over a pipe.
+
+    Every call takes an idle worker (or waits for one), so at most 'workers' commands run at once.
+    Workers are replaced after 'max_calls_per_worker' calls, when their memory exceeds 'max_memory_mb'
+    and when they crash (the crashing call fails, following calls run in a fresh worker).
+    Workers are spawned, target must be importable from 'sys.path' of this process.
+    """
+
+    def __init__(
+            self,
+            py_import_path: str,
+            py_import_path_attribute: Optional[str],
+            workers: Optional[int] = None,
+            max_calls_per_worker: Optional[int] = None,
+            max_memory_mb: Optional[float] = None
+    ):
+        self.target = (py_import_path, py_import_path_attribute)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_calls_per_worker = max_calls_per_worker
+        self.max_memory_mb = max_memory_mb
+
+        # fresh interpreters: forking would copy locks held by other threads of this process and
+        # modules imported here (including target), spawned workers import only what they need
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_PoolWorker]" = queue.Queue()
+        self._all: List[_PoolWorker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+
+    def run(
+            self,
+            args: List[str],
+            input: Optional[Union[str, bytes, IO]] = None
+    ) -> Tuple[int, str, Optional[BaseException]]:
+        if hasattr(input, "read"):
+            input = input.read()
+
+        worker = self._acquire()
+        try:
+            worker.conn.send((list(args), input, False))
+            exit_code, output, exception, memory_mb = worker.conn.recv()
+        except (EOFError, OSError):
+            return 1, self._crashed(worker).decode(), None
+
+        self._release(worker, memory_mb)
+        return exit_code, output, exception
+
+    def stream(
+            self,
+            args: List[str],
+            input: Optional[Union[str, bytes, IO]] = None
+    ) -> Generator[bytes, None, Tuple[int, Optional[BaseException]]]:
+        """Output is yielded as the worker writes it, returns exit code and unexpected exception."""
+        if hasattr(input, "read"):
+            input = input.read()
+
+        worker = self._acquire()
+        done = False
+        try:
+            worker.conn.send((list(args), input, True))
+            while True:
+                message = worker.conn.recv()
+                if isinstance(message, bytes):
+                    yield message
+                    continue
+                exit_code, output, exception, memory_mb = message
+                done = True
+                break
+        except (EOFError, OSError):
+            done = True
+            yield self._crashed(worker)
+            return 1, None
+        finally:
+            if not done:
+                # consumer stopped early, worker is still writing
+                worker.process.kill()
+                worker.process.join(timeout=1)
+                self._replace(worker)
+
+        self._release(worker, memory_mb)
+        if output:
+            # worker failed to import target
+            yield output.encode()
+        return exit_code, exception
+
+    def close(self, timeout: float = 10):
+        """Stop all workers, running calls are waited for (up to timeout)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._all)
+
+        for _ in workers:
+            try:
+                self._retire(self._idle.get(timeout=timeout))
+            except queue.Empty:
+                break
+        for worker in workers:
+            worker.process.join(timeout=timeout)
+            if worker.process.is_alive():
+                worker.process.kill()
+
+    ##############
+    # internal
+    ##############
+    def _acquire(self) -> "_PoolWorker":
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        return self._idle.get()
+
+    def _release(self, worker: "_PoolWorker", memory_mb: float):
+        worker.calls += 1
+        if (
+            (self.max_calls_per_worker and worker.calls >= self.max_calls_per_worker) or
+            (self.max_memory_mb and memory_mb > self.max_memory_mb)
+        ):
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+    def _crashed(self, worker: "_PoolWorker") -> bytes:
+        worker.process.join(timeout=1)
+        self._replace(worker)
+        return f"Worker process crashed (exit code {worker.process.exitcode})\n".encode()
+
+    def _spawn(self) -> "_PoolWorker":
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_pool_worker, args=(child_conn, *self.target), daemon=True)
+        process.start()
+        child_conn.close()
+        worker = _PoolWorker(process, conn)
+        self._all.append(worker)
+        return worker
+
+    def _replace(self, worker: "_PoolWorker"):
+        self._retire(worker)
+        with self._lock:
+            # closing pool waits for the retired worker itself
+            if not self._closed:
+                self._all.remove(worker)
+                worker = self._spawn()
+        self._idle.put(worker)
+
+    @staticmethod
+    def _retire(worker: "_PoolWorker"):
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.conn.close()
+
+class _PoolWorker:
+
+    def __init__(self, process: multiprocessing.Process, conn):
+        self.process = process
+        self.conn = conn
+        self.calls = 0
+
+def _pool_worker(conn, py_import_path: str, py_import_path_attribute: Optional[str]):
+    """Worker process main loop, requests are (args, input, stream), None stops the worker."""
+    try:
+        importer = ClickImporter(py_import_path, py_import_path_attribute, engine="threads")
+        error = None
+    except Exception as e:
+        importer, error = None, f"Worker failed to import '{py_import_path}': {e}\n"
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        args, input, stream = request
+        if importer is None:
+            exit_code, output, exception = 1, error, None
+        elif stream:
+            exit_code, exception = _ThreadIsolation.run_to(importer.click_obj_cli_main, args, input, _PipeSink(conn))
+            output = None
+        else:
+            exit_code, output, exception = importer._execute(args, input)
+        conn.send((exit_code, output, _picklable(exception), _memory_mb()))
+
+def _picklable(exception: Optional[BaseException]) -> Optional[BaseException]:
+    """Exception sent to parent process, replaced by its description when it does not survive pickling."""
+    if exception is None:
+        return None
+    try:
+        pickle.loads(pickle.dumps(exception))
+        return exception
+    except Exception:
+        return Exception(f"{type(exception).__name__}: {exception}")
+
+def _memory_mb() -> float:
+    """Resident memory of current process (peak where current is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+class ClickImporterStream:
+    """
+    Output of a running command, iterated while the command writes it.
+
+    Yields text chunks as written by the command (or complete lines with 'lines=True').
+    'exit_code' (and 'exception', unexpected exception raised by the command) is set when the
+    stream ends, non-zero exit code raises ClickImporterError at the end of iteration. Stopping iteration early ('close()') stops the command.
+
+    Examples:
+        >>> for line in importer.run_command_stream(["logs", "list"], lines=True):
+        ...     print(line, end="")
+    """
+
+    # characters of output kept for error message
+    tail_size: int = 4096
+
+    def __init__(
+            self,
+            description: str,
+            chunks: Generator[bytes, None, Tuple[int, Optional[BaseException]]],
+            lines: bool = False
+    ):
+        self.description = description
+        self.lines = lines
+        self.exit_code: Optional[int] = None
+        self.exception: Optional[BaseException] = None
+        self._chunks = chunks
+        self._iterated = False
+
+    def __iter__(self) -> Iterator[str]:
+        if self._iterated:
+            raise RuntimeError("Command output stream can be iterated only once")
+        self._iterated = True
+
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        tail = ""
+        pending = ""
+        while True:
+            try:
+                chunk = next(self._chunks)
+                final = False
+            except StopIteration as e:
+                self.exit_code, self.exception = e.value
+                chunk, final = b"", True
+
+            decoded = decoder.decode(chunk, final)
+            tail = (tail + decoded)[-self.tail_size:]
+            text = pending + decoded
+            pending = ""
+            # same newline handling as CliRunner output, '\r\n' may be split across chunks
+            if not final and text.endswith("\r"):
+                text, pending = text[:-1], "\r"
+            text = text.replace("\r\n", "\n")
+
+            if self.lines:
+                *complete, pending_line = text.split("\n") if text else [""]
+                for line in complete:
+                    yield line + "\n"
+                if final and pending_line:
+                    yield pending_line
+                else:
+                    pending = pending_line + pending
+            elif text:
+                yield text
+
+            if final:
+                break
+
+        if self.exit_code != 0:
+            raise ClickImporterError(_failure_message(self.description, tail, self.exception)) from self.exception
+
+    def close(self):
+        """Stop reading output, running command is stopped."""
+        self._chunks.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ClickImporterOutput:
+    """
+    Captured output of a finished command.
+
+    Output is kept in memory up to 'spool_threshold' bytes, larger output is spooled to
+    a temporary file. Raw output is available without copies as 'view()' (memory or mmap
+    of the file), text is decoded only on access. Release views and call 'close()'
+    (or use as context manager) to free the temporary file.
+
+    Examples:
+        >>> with importer.run_command_output(["logs", "list", "-n", "0"]) as out:
+        ...     out.size, out.spooled
+        ...     for text in out.iter_text():
+        ...         sink.write(text)
+    """
+
+    def __init__(self, exit_code: int, sink: _SpoolSink, exception: Optional[BaseException] = None):
+        self.exit_code: int = exit_code
+        # unexpected exception raised by the command
+        self.exception: Optional[BaseException] = exception
+        self.size: int = sink.size
+        self.spooled: bool = sink.spooled
+        self._file = sink.file
+        self._mmap: Optional[mmap.mmap] = None
+        self._text: Optional[str] = None
+
+    def view(self) -> memoryview:
+        """Zero-copy read-only view of raw (utf-8) output."""
+        if not self.spooled:
+            return self._file.getbuffer().toreadonly()
+        if self.size == 0:
+            return memoryview(b"")
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def to_bytes(self) -> bytes:
+        """Copy of raw (utf-8) output."""
+        with self.view() as view:
+            return view.tobytes()
+
+    @property
+    def text(self) -> str:
+        """Decoded output (same as 'run_command' result), decoded on first access."""
+        if self._text is None:
+            with self.view() as view:
+                self._text = str(view, "utf-8", "replace").replace("\r\n", "\n")
+        return self._text
+
+    def iter_text(self, chunk_size: int = 1024 * 1024) -> Iterator[str]:
+        """Decoded output in chunks of at most 'chunk_size' bytes, for outputs too large to decode at once."""
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        pending = ""
+        with self.view() as view:
+            for start in range(0, self.size, chunk_size):
+                text = pending + decoder.decode(view[start:start + chunk_size])
+                pending = ""
+                if text.endswith("\r"):
+                    text, pending = text[:-1], "\r"
+                if text:
+                    yield text.replace("\r\n", "\n")
+        text = pending + decoder.decode(b"", True)
+        if text:
+            yield text
+
+    def close(self):
+        """Release captured output, views must be released first."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+@dataclass
+class ClickImporterResult:
+    """Result of one invocation of 'run_many'."""
+    args: List[str]
+    exit_code: int
+    output: str
+    duration: float
+    # unexpected exception raised by the command (exit code is 1 then)
+    exception: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
 class ClickImporter:
 
-    def __init__(self, py_import_path: str, py_import_path_attribute: str = None):
+    # output larger than this is spooled to temporary file by 'run_command_output'
+    spool_threshold: int = 8 * 1024 * 1024
+
+    def __init__(
+            self,
+            py_import_path: str,
+            py_import_path_attribute: str = None,
+            lazy: bool = False,
+            engine: str = "runner",
+            workers: Optional[int] = None,
+            max_calls_per_worker: Optional[int] = None,
+            max_memory_mb: Optional[float] = None
+    ):
         """
         Wrapper for Click CLI operations using Click's CliRunner.
 
@@ -29,6 +872,16 @@ class ClickImporter:
             py_import_path_attribute: Optional attribute name to retrieve from the
                 'py_import_path' module. When None and py_import_path is a simple
                 module name, defaults to 'cli' from '__main__' module.
+            lazy: When True, construction costs nothing: target module is imported on first command
+                (or first access of 'click_obj_cli_main') and 'pool' workers are started on first
+                command, see 'preload' to do it at a convenient time instead.
+            engine: How commands are executed in this process
+                'runner'  - Click's CliRunner, which swaps process-wide streams (one command at a time, default)
+                'threads' - streams are isolated per thread, commands can run from several threads at once
+                'pool'    - long-lived worker processes importing target once, commands run on all cores
+            workers: Number of worker processes of 'pool' engine (CPU count if None)
+            max_calls_per_worker: 'pool' worker is replaced after this many commands
+            max_memory_mb: 'pool' worker is replaced when its resident memory exceeds this limit
 
         Examples:
             >>> # Explicit import path
@@ -44,7 +897,11 @@ class ClickImporter:
         Raises:
             ImportError: If the module cannot be imported
             AttributeError: If the specified attribute doesn't exist in the module
+            ValueError: If engine is unknown
         """
+        if engine not in ("threads", "runner", "pool"):
+            raise ValueError(f"Unknown engine '{engine}', expected 'threads', 'runner' or 'pool'")
+
         # check if user expect simple structure of Click CLI application
         if (not py_import_path_attribute) and len(py_import_path.split('.')) == 1:
             py_import_path           = py_import_path + ".__main__"
@@ -54,13 +911,63 @@ class ClickImporter:
         self.py_import_path_attribute: str = py_import_path_attribute
         self.py_import_package: str = py_import_path.split(".")[0]
 
+        self.engine: str = engine
         self.runner = CliRunner()
-        self.click_obj_cli_main: Union[ModuleType, Command] = self._import_from_string()
+        self._click_obj_cli_main: Optional[Union[ModuleType, Command]] = None
+
+        # resolved command paths of 'run_command_direct'
+        self._direct_commands: dict = {}
+
+        self._pool: Optional[_ProcessPool] = None
+        self._pool_options = (workers, max_calls_per_worker, max_memory_mb)
+        # one-time initialization of target import and worker pool (double-checked)
+        self._load_lock = threading.Lock()
+        if not lazy:
+            # 'pool' engine starts its workers only, target is not imported in this process
+            self.preload()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop worker processes of 'pool' engine (no-op for other engines)."""
+        if self._pool is not None:
+            self._pool.close()
+
+    def preload(self) -> "ClickImporter":
+        """
+        Import target now instead of on first command ('pool' engine starts its workers instead).
+
+        Safe to call from several threads and several times, initialization runs only once.
+
+        Returns:
+            self, e.g. for 'wrapper = LlmClickWrapper().preload()'
+        """
+        if self.engine == "pool":
+            self._get_pool()
+        else:
+            self.click_obj_cli_main
+        return self
+
+    @property
+    def click_obj_cli_main(self) -> Union[ModuleType, Command]:
+        click_obj = self._click_obj_cli_main
+        if click_obj is None:
+            with self._load_lock:
+                if self._click_obj_cli_main is None:
+                    self._click_obj_cli_main = self._import_from_string()
+                click_obj = self._click_obj_cli_main
+        return click_obj
 
     def run_command(self, args: List[str], input: Optional[str] = None) -> str:
         """
         Run a CLI command and return the result.
 
+        Safe to call from several threads at once with 'threads' and 'pool' engines.
+
         Args:
             args: List of command arguments
             input: Optional stdin input
@@ -71,13 +978,229 @@ class ClickImporter:
         Raises:
             ClickImporterError: If command fails (non-zero exit code)
         """
-        result = self.runner.invoke(self.click_obj_cli_main, args, input=input)
+        exit_code, output, exception = self._execute(args, input)
 
-        if result.exit_code != 0:
+        if exit_code != 0:
             full_cmd = [self.py_import_package] + args + ([input] if input else [])
-            raise ClickImporterError(f"""Command {' '.join(full_cmd)} failed: {result.output}""")
+            raise ClickImporterError(_failure_message(' '.join(full_cmd), output, exception)) from exception
+
+        return output
+
+    def run_command_direct(
+            self,
+            command_path: List[str],
+            params: Optional[dict] = None,
+            input: Optional[str] = None
+    ) -> str:
+        """
+        Run a CLI command by calling its callback with already typed parameters.
+
+        No argv is built nor parsed: command path is resolved once (then cached), contexts
+        are built as Click builds them and group callbacks run as usual. Parameters missing
+        in 'params' get defaults, environment variables and conversions from Click. Output
+        capture and exit codes are the same as of 'run_command'. Commands run in this process,
+        'pool' engine is not supported.
+
+        Args:
+            command_path: Command names below root, e.g. ["models", "list"]
+            params: Values of leaf command parameters by parameter name, e.g. {"async_": True}
+            input: Optional stdin input
+
+        Returns:
+            Result output
+
+        Raises:
+            ClickImporterError: If command fails (non-zero exit code)
+            ValueError: If command or parameter does not exist, or engine is 'pool'
+
+        Examples:
+            >>> importer.run_command_direct(["models", "list"], {"options": True})
+        """
+        exit_code, output, exception = self._execute_direct(command_path, params or {}, input)
+
+        if exit_code != 0:
+            full_cmd = [self.py_import_package] + command_path + [f"{k}={v!r}" for k, v in (params or {}).items()]
+            raise ClickImporterError(_failure_message(' '.join(full_cmd), output, exception)) from exception
+
+        return output
+
+    def run_command_stream(
+            self,
+            args: List[str],
+            input: Optional[str] = None,
+            lines: bool = False
+    ) -> ClickImporterStream:
+        """
+        Run a CLI command, output is yielded while the command writes it.
+
+        Output is never held in memory as a whole. With 'runner' engine, output is
+        yielded at once when the command finishes.
+
+        Args:
+            args: List of command arguments
+            input: Optional stdin input
+            lines: Yield complete lines instead of chunks as written
+
+        Returns:
+            Iterable of output chunks, ClickImporterError is raised at its end if command fails
+        """
+        full_cmd = [self.py_import_package] + args + ([input] if input else [])
+        return ClickImporterStream(' '.join(full_cmd), self._execute_stream(args, input), lines)
+
+    def run_command_output(
+            self,
+            args: List[str],
+            input: Optional[str] = None,
+            spool_threshold: Optional[int] = None
+    ) -> ClickImporterOutput:
+        """
+        Run a CLI command, output is captured as bytes and spooled to disk when large.
+
+        Peak memory stays bounded by 'spool_threshold' regardless of output size
+        (except 'runner' engine, which captures output in memory first).
+
+        Args:
+            args: List of command arguments
+            input: Optional stdin input
+            spool_threshold: Output larger than this (bytes) is moved to a temporary file
+
+        Returns:
+            Captured output
+
+        Raises:
+            ClickImporterError: If command fails (non-zero exit code)
+        """
+        sink = _SpoolSink(self.spool_threshold if spool_threshold is None else spool_threshold)
+        if self.engine == "threads":
+            exit_code, exception = _ThreadIsolation.run_to(self.click_obj_cli_main, args, input, sink)
+        else:
+            chunks = self._execute_stream(args, input)
+            while True:
+                try:
+                    sink.write(next(chunks))
+                except StopIteration as e:
+                    exit_code, exception = e.value
+                    break
+
+        output = ClickImporterOutput(exit_code, sink, exception)
+        if exit_code != 0:
+            with output, output.view() as view:
+                tail = str(view[-ClickImporterStream.tail_size:], "utf-8", "replace")
+            full_cmd = [self.py_import_package] + args + ([input] if input else [])
+            raise ClickImporterError(_failure_message(' '.join(full_cmd), tail, exception)) from exception
+        return output
+
+    def run_many(
+            self,
+            invocations: Iterable[Union[Sequence[str], Tuple[Sequence[str], Optional[str]]]],
+            max_workers: Optional[int] = None,
+            stop_on_error: bool = False
+    ) -> List[ClickImporterResult]:
+        """
+        Run many CLI commands, failures are reported in results instead of raised.
+
+        Target CLI is resolved and streams are isolated once for all invocations. With
+        'max_workers' above 1 invocations run in parallel threads ('threads' and 'pool'
+        engines, 'runner' engine always runs one at a time).
+
+        Args:
+            invocations: Command arguments, or (arguments, stdin input) tuples
+            max_workers: Number of invocations running at the same time
+            stop_on_error: Do not start further invocations after first failure
+
+        Returns:
+            Results in order of invocations; with stop_on_error, invocations not started
+            after a failure are missing
+
+        Examples:
+            >>> results = importer.run_many([["embed", "-c", text] for text in texts], max_workers=8)
+            >>> failed = [r for r in results if not r.ok]
+        """
+        items = [
+            (list(item[0]), item[1]) if isinstance(item, tuple) else (list(item), None)
+            for item in invocations
+        ]
+        if self.engine != "pool":
+            # resolve target once, before any worker starts
+            self.click_obj_cli_main
+        failed = threading.Event()
+
+        def invoke(item: Tuple[List[str], Optional[str]]) -> Optional[ClickImporterResult]:
+            if stop_on_error and failed.is_set():
+                return None
+            args, input = item
+            start = time.perf_counter()
+            exit_code, output, exception = self._execute(args, input)
+            if exit_code != 0:
+                failed.set()
+            return ClickImporterResult(args, exit_code, output, time.perf_counter() - start, exception)
+
+        if not max_workers or max_workers <= 1 or self.engine == "runner":
+            results = [invoke(item) for item in items]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(invoke, items))
+        return [result for result in results if result is not None]
+
+    def _execute_stream(
+            self,
+            args: List[str],
+            input: Optional[str] = None
+    ) -> Generator[bytes, None, Tuple[int, Optional[BaseException]]]:
+        """Run command with selected engine, yields output, returns exit code and unexpected exception."""
+        if self.engine == "runner":
+            result = self.runner.invoke(self.click_obj_cli_main, args, input=input)
+            yield result.output.encode("utf-8")
+            return result.exit_code, self._runner_exception(result)
+        if self.engine == "pool":
+            return (yield from self._get_pool().stream(args, input))
+        return (yield from _ThreadIsolation.stream(self.click_obj_cli_main, args, input))
+
+    def _execute_direct(
+            self,
+            command_path: List[str],
+            params: dict,
+            input: Optional[str] = None
+    ) -> Tuple[int, str, Optional[BaseException]]:
+        """Run command callback with typed parameters in this process, returns exit code, output and unexpected exception."""
+        if self.engine == "pool":
+            raise ValueError("Direct invocation runs commands in this process, not supported by 'pool' engine")
+
+        key = tuple(command_path)
+        command = self._direct_commands.get(key)
+        if command is None:
+            command = self._direct_commands[key] = _DirectCommand(self.click_obj_cli_main, command_path)
+        unknown = set(params) - command.param_names
+        if unknown:
+            raise ValueError(f"Command '{' '.join(command_path)}' has no parameter(s) {', '.join(sorted(unknown))}")
+
+        return _ThreadIsolation.run(
+            self.click_obj_cli_main, command_path, input, main=lambda extra: command.main(params, extra)
+        )
+
+    def _execute(self, args: List[str], input: Optional[str] = None) -> Tuple[int, str, Optional[BaseException]]:
+        """Run command with selected engine, returns exit code, output and unexpected exception."""
+        if self.engine == "runner":
+            result = self.runner.invoke(self.click_obj_cli_main, args, input=input)
+            return result.exit_code, result.output, self._runner_exception(result)
+        if self.engine == "pool":
+            return self._get_pool().run(args, input)
+        return _ThreadIsolation.run(self.click_obj_cli_main, args, input)
+
+    @staticmethod
+    def _runner_exception(result) -> Optional[BaseException]:
+        # CliRunner reports every exit as SystemExit
+        return None if isinstance(result.exception, SystemExit) else result.exception
 
-        return result.output
+    def _get_pool(self) -> _ProcessPool:
+        pool = self._pool
+        if pool is None:
+            with self._load_lock:
+                if self._pool is None:
+                    self._pool = _ProcessPool(self.py_import_path, self.py_import_path_attribute, *self._pool_options)
+                    weakref.finalize(self, self._pool.close)
+                pool = self._pool
+        return pool
 
     def _import_from_string(self) -> Union[ModuleType, Command]:
 
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from click_wrapper.importer import ClickImporter
+from click_wrapper.cache import ClickMetadataCache
+
+@dataclass
+class ClickExportReport:
+    """Outcome of incremental export."""
+    output: Path
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # files actually rewritten (content differs from file on disk)
+    written: List[Path] = field(default_factory=list)
+
+    @property
+    def summary(self) -> str:
+        removed = f", {len(self.removed)} removed" if self.removed else ""
+        return (
+            f"{len(self.changed)} changed, {len(self.unchanged)} unchanged command(s){removed}, "
+            f"{len(self.written)} file(s) written"
+        )
+
+class ClickExportManifest:
+    """
+    Content hashes of exported files and of their command sections, stored next to output.
+
+    Export goes through temporary files and replaces an output file only when its content
+    differs, so untouched files keep their mtime (and downstream .pyc / import caches stay
+    valid). When target sources, click-wrapper itself and export options are unchanged since
+    last export (same key) and output files were not modified, nothing is generated at all.
+    """
+
+    # bump when manifest layout changes
+    manifest_version: int = 1
+
+    def __init__(self, output: Path):
+        self.output: Path = Path(output)
+        self.path: Path = self.output.parent / f"{self.output.name}.manifest.json"
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def key(importer: ClickImporter, **options) -> Optional[str]:
+        """
+        Hash of target sources, click-wrapper sources and export options, computed without importing target.
+
+        Returns None when target sources cannot be located (every export then regenerates).
+        """
+        source_key = ClickMetadataCache.source_key(importer)
+        if source_key is None:
+            return None
+        digest = hashlib.sha256()
+        digest.update(json.dumps([source_key, options], sort_keys=True, default=str).encode())
+        for source in sorted(Path(__file__).parent.glob("*.py")):
+            digest.update(f"{source.name}:{source.stat().st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    def load(self) -> dict:
+        """Stored manifest, empty when missing, unreadable or of other layout version."""
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != self.manifest_version:
+            return {}
+        return manifest
+
+    def unchanged(self, key: Optional[str]) -> Optional[ClickExportReport]:
+        """
+        Report of no-op export when manifest key matches and output files are as exported.
+
+        Only file sizes and mtimes are compared, no content is read nor generated.
+        """
+        manifest = self.load()
+        if key is None or manifest.get("key") != key:
+            return None
+        for name, (_, size, mtime_ns) in manifest["files"].items():
+            try:
+                stat = (self.output.parent / name).stat()
+            except OSError:
+                return None
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                return None
+        return ClickExportReport(self.output, unchanged=[name for name in manifest["sections"] if name])
+
+    def export(
+            self,
+            files: Iterable[Tuple[Path, Iterable[Tuple[str, str]]]],
+            key: Optional[str] = None
+    ) -> ClickExportReport:
+        """
+        Write files from (section name, chunk) pairs, rewriting only files whose content changed.
+
+        Args:
+            files: (file path, sections) pairs, file paths are relative to manifest directory
+                or absolute below it; section "" holds content shared by all commands
+            key: Manifest key of this export (see 'key'), enables no-op shortcut of next export
+
+        Returns:
+            Changed, unchanged and removed commands (compared to previous export) and rewritten files
+
+        Files of previous export which are not exported any more (e.g. module of removed group
+        of split package) are deleted, unless they were modified since.
+        """
+        previous = self.load()
+        previous_sections: Dict[str, str] = previous.get("sections", {})
+        report = ClickExportReport(self.output)
+        sections: Dict[str, Any] = {}
+        manifest_files = {}
+
+        for path, file_sections in files:
+            path = self.output.parent / path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_digest = hashlib.sha256()
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "w", encoding="utf-8", newline="") as f:
+                    for name, chunk in file_sections:
+                        data = chunk.encode("utf-8")
+                        file_digest.update(data)
+                        sections.setdefault(name, hashlib.sha256()).update(data)
+                        f.write(chunk)
+                if self._file_digest(path) == file_digest.hexdigest():
+                    tmp.unlink()
+                else:
+                    os.replace(tmp, path)
+                    report.written.append(path)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+            stat = path.stat()
+            manifest_files[os.path.relpath(path, self.output.parent)] = [
+                file_digest.hexdigest(), stat.st_size, stat.st_mtime_ns
+            ]
+
+        for name, (digest, _, _) in previous.get("files", {}).items():
+            path = self.output.parent / name
+            if name not in manifest_files and self._file_digest(path) == digest:
+                path.unlink()
+
+        hashes = {name: digest.hexdigest() for name, digest in sections.items()}
+        for name, digest in hashes.items():
+            if name:
+                (report.unchanged if previous_sections.get(name) == digest else report.changed).append(name)
+        report.removed = [name for name in previous_sections if name and name not in hashes]
+
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "version": self.manifest_version,
+            "key": key,
+            "files": manifest_files,
+            "sections": hashes,
+        }), encoding="utf-8")
+        os.replace(tmp, self.path)
+        return report
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _file_digest(path: Path) -> Optional[str]:
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
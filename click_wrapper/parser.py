@@ -1,14 +1,192 @@
+import importlib.metadata
+import dataclasses
+import json
 import pathlib
+import sys
+import threading
 import uuid
+import warnings
+from contextlib import contextmanager
 
+import click
 from click import Command
 from click import types
 from click.core import UNSET
 
-from typing import Dict, Union, List, Tuple, Any, Type, Optional
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Union, List, Tuple, Any, Type, Optional, Iterator, Set, TYPE_CHECKING
+from dataclasses import dataclass, field
 
 from click_wrapper.importer import ClickImporter
+from click_wrapper.static import ClickStaticLoader
+
+if TYPE_CHECKING:
+    from click_wrapper.cache import ClickMetadataCache
+
+@dataclass
+class ClickTypeDiagnostic:
+    """Click type without Python type mapping, annotated by fallback type."""
+    type_path: str
+    name: Optional[str]
+    fallback: str
+    # number of parameters of this type
+    occurrences: int = 0
+    # ids of counted parameters, each is counted once however often its type is resolved
+    _params: Set[int] = field(default_factory=set, repr=False, compare=False)
+
+class ClickTypeResolver:
+    """
+    Python type of Click parameter type, resolved along the MRO and memoized per type.
+
+    Mappings are keyed by qualified class name ('module.QualName'), so a subclass of a
+    mapped type (e.g. of 'click.Choice') resolves like its base and types restored from
+    serialized metadata resolve without importing target CLI. Custom types are mapped by
+    'register' or by packages exposing 'click_wrapper.types' entry points, loaded on first
+    unresolved type; entry point refers to mapping (class or qualified name -> Python type)
+    or to callable receiving the resolver. Types resolved to no mapping are annotated by the
+    fallback type and reported to 'collect' blocks running in current thread (e.g. one export).
+
+    Examples:
+        >>> ClickDataUtils.type_resolver.register(ColorParamType, str)
+        >>> ClickDataUtils.type_resolver.register("mycli.types.Timestamp", int)
+        >>> with ClickDataUtils.type_resolver.collect() as unknown:
+        ...     ClickGenerator.app_wrapper(importer)
+        >>> print(ClickTypeResolver.format_text(unknown))
+
+        # pyproject.toml of package providing mappings
+        [project.entry-points."click_wrapper.types"]
+        mycli = "mycli.types:CLICK_WRAPPER_TYPES"
+    """
+
+    entry_point_group: str = "click_wrapper.types"
+
+    def __init__(self, mapping: Optional[Dict[Union[Type[types.ParamType], str], Any]] = None, entry_points: bool = True):
+        self._mapping: Dict[str, Any] = {}
+        # type class (or qualified names of restored type) -> mapped Python type, None when unknown
+        self._resolved: Dict[Any, Any] = {}
+        self._entry_points_loaded: bool = not entry_points
+        # unknown types of 'collect' blocks running in current thread, innermost last
+        self._collectors = threading.local()
+        for param_type, python_type in (mapping or {}).items():
+            self.register(param_type, python_type)
+
+    ##############
+    # api extra
+    ##############
+    def register(self, param_type: Union[Type[types.ParamType], str], python_type: Any):
+        """Map Click type class (or its qualified name) and its subclasses to Python type."""
+        self._mapping[param_type if isinstance(param_type, str) else self._qualified_name(param_type)] = python_type
+        self._resolved.clear()
+
+    def resolve(self, param_type: types.ParamType, default: Any, param: Any = None) -> Any:
+        """
+        Mapped Python type of nearest mapped class in the MRO, 'default' when there is none.
+
+        Unknown type is reported to running 'collect' blocks, counted once per 'param' (the
+        parameter being annotated, every call counts when None).
+        """
+        key = self._key(param_type)
+        try:
+            python_type = self._resolved[key]
+        except KeyError:
+            python_type = self._resolved[key] = self._lookup(param_type)
+        if python_type is None:
+            for unknown in getattr(self._collectors, "stack", ()):
+                self._count(unknown, param_type, default, param)
+            return default
+        return python_type
+
+    @contextmanager
+    def collect(self) -> Iterator[Dict[str, ClickTypeDiagnostic]]:
+        """Collect unknown types resolved in current thread within the block, by qualified name."""
+        unknown: Dict[str, ClickTypeDiagnostic] = {}
+        stack = self._collectors.__dict__.setdefault("stack", [])
+        stack.append(unknown)
+        try:
+            yield unknown
+        finally:
+            stack.remove(unknown)
+
+    @staticmethod
+    def annotation(python_type: Any) -> str:
+        """Annotation usable in generated code, other than builtin types are quoted qualified names."""
+        if python_type is Any:
+            return "Any"
+        if getattr(python_type, "__module__", None) == "builtins":
+            return python_type.__name__
+        if hasattr(python_type, "__qualname__"):
+            return repr(f"{python_type.__module__}.{python_type.__qualname__}")
+        return str(python_type)
+
+    @staticmethod
+    def report(unknown: Dict[str, ClickTypeDiagnostic]) -> List[ClickTypeDiagnostic]:
+        """Unknown types collected by 'collect', by occurrences."""
+        return sorted(unknown.values(), key=lambda diagnostic: diagnostic.occurrences, reverse=True)
+
+    @staticmethod
+    def format_text(unknown: Dict[str, ClickTypeDiagnostic]) -> str:
+        lines = [f"{len(unknown)} Click type(s) without Python type mapping:"] if unknown else []
+        for diagnostic in ClickTypeResolver.report(unknown):
+            lines.append(
+                f"  {diagnostic.type_path} ('{diagnostic.name}'): {diagnostic.occurrences} parameter(s), "
+                f"annotated as {diagnostic.fallback}"
+            )
+        return "\n".join(lines)
+
+    ##############
+    # internal
+    ##############
+    def _count(self, unknown: Dict[str, ClickTypeDiagnostic], param_type: types.ParamType, default: Any, param: Any):
+        type_path = self._type_names(param_type)[0]
+        diagnostic = unknown.get(type_path)
+        if diagnostic is None:
+            diagnostic = unknown[type_path] = ClickTypeDiagnostic(
+                type_path, getattr(param_type, "name", None), self.annotation(default)
+            )
+        if param is None or id(param) not in diagnostic._params:
+            if param is not None:
+                diagnostic._params.add(id(param))
+            diagnostic.occurrences += 1
+
+    @staticmethod
+    def _qualified_name(cls: type) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    @staticmethod
+    def _key(param_type: types.ParamType) -> Any:
+        if isinstance(param_type, ClickDataUnknownType):
+            return tuple(ClickTypeResolver._type_names(param_type))
+        return type(param_type)
+
+    @staticmethod
+    def _type_names(param_type: types.ParamType) -> List[str]:
+        """Qualified names of type and its bases (restored types keep them in spec)."""
+        if isinstance(param_type, ClickDataUnknownType):
+            spec = param_type.spec
+            return [f"{spec.get('module', 'click.types')}.{spec['param_type']}", *spec.get("bases", [])]
+        return [ClickTypeResolver._qualified_name(cls) for cls in type(param_type).__mro__]
+
+    def _lookup(self, param_type: types.ParamType) -> Any:
+        names = self._type_names(param_type)
+        for name in names:
+            if name in self._mapping:
+                return self._mapping[name]
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+            return self._lookup(param_type)
+        return None
+
+    def _load_entry_points(self):
+        self._entry_points_loaded = True
+        for entry_point in importlib.metadata.entry_points(group=self.entry_point_group):
+            try:
+                mapping = entry_point.load()
+                if callable(mapping):
+                    mapping(self)
+                else:
+                    for param_type, python_type in mapping.items():
+                        self.register(param_type, python_type)
+            except Exception as e:
+                warnings.warn(f"Failed to load Click type mappings '{entry_point.name}' ({entry_point.value}): {e}")
 
 class ClickDataUtils:
 
@@ -26,6 +204,8 @@ class ClickDataUtils:
         types.DateTime: str,  # or datetime.datetime
         types.Tuple: tuple
     }
+    # resolves also subclasses and registered custom types, see ClickTypeResolver
+    type_resolver: ClickTypeResolver = ClickTypeResolver(type_mapping)
 
     @staticmethod
     def to_help_string_lines(
@@ -56,46 +236,196 @@ class ClickDataUtils:
     @staticmethod
     def click_type_to_python_type_as_string(
             click_param_type: types.ParamType,
-            default_type_class: Type
+            default_type_class: Type,
+            param: Any = None
     ) -> str:
         """Get the string representation of the base Python type."""
 
-        python_type: Type = ClickDataUtils.click_type_to_python_type(click_param_type, default_type_class)
-        # Convert Type to string representation
-        if hasattr(python_type, '__name__'):
-            return python_type.__name__
-
-        return str(python_type)
+        python_type: Type = ClickDataUtils.click_type_to_python_type(click_param_type, default_type_class, param)
+        return ClickTypeResolver.annotation(python_type)
 
     @staticmethod
     def click_type_to_python_type(
             click_param_type: types.ParamType,
-            default_type_class: Type
+            default_type_class: Type,
+            param: Any = None
     ) -> Type:
-        py_type: Type = default_type_class
-        if ClickDataUtils.is_click_type(click_param_type):
-            py_type = ClickDataUtils.type_mapping[type(click_param_type)]
-        else:
-            print(f"{str(click_param_type)} not in type mapping dictionary")
-        return py_type
+        """Python type of Click type, 'default_type_class' for unknown types (reported by 'type_resolver')."""
+        return ClickDataUtils.type_resolver.resolve(click_param_type, default_type_class, param)
 
     @staticmethod
     def is_click_type(click_param_type: types.ParamType) -> bool:
         return type(click_param_type) in ClickDataUtils.type_mapping
 
+    @staticmethod
+    def click_type_to_spec(click_param_type: types.ParamType) -> dict:
+        """JSON-friendly description of Click type, inverse of 'click_type_from_spec'."""
+        if isinstance(click_param_type, ClickDataUnknownType):
+            return dict(click_param_type.spec)
+        if ClickDataUtils.is_click_type(click_param_type):
+            spec = click_param_type.to_info_dict()
+            if isinstance(click_param_type, types.Tuple):
+                spec["types"] = [ClickDataUtils.click_type_to_spec(t) for t in click_param_type.types]
+            return ClickParser._safe_serialize(spec)
+        # custom type, only identity (and bases for ClickTypeResolver) is kept
+        return {
+            "param_type": type(click_param_type).__name__,
+            "name": getattr(click_param_type, "name", None),
+            "module": type(click_param_type).__module__,
+            "bases": ClickTypeResolver._type_names(click_param_type)[1:],
+        }
+
+    @staticmethod
+    def click_type_from_spec(spec: dict) -> types.ParamType:
+        """Rebuild Click type from 'click_type_to_spec' output, without importing target CLI."""
+        if "module" in spec:
+            return ClickDataUnknownType(spec)
+
+        param_type = spec["param_type"]
+        if param_type == "String":
+            return types.STRING
+        if param_type == "Int":
+            return types.INT
+        if param_type == "Float":
+            return types.FLOAT
+        if param_type == "Bool":
+            return types.BOOL
+        if param_type == "UUID":
+            return types.UUID
+        if param_type == "File":
+            return types.File(mode=spec["mode"], encoding=spec["encoding"])
+        if param_type == "Path":
+            return types.Path(**{
+                k: spec[k] for k in ("exists", "file_okay", "dir_okay", "writable", "readable", "allow_dash")
+            })
+        if param_type == "Choice":
+            return types.Choice(spec["choices"], case_sensitive=spec["case_sensitive"])
+        if param_type in ("IntRange", "FloatRange"):
+            range_class = types.IntRange if param_type == "IntRange" else types.FloatRange
+            return range_class(**{k: spec[k] for k in ("min", "max", "min_open", "max_open", "clamp")})
+        if param_type == "DateTime":
+            return types.DateTime(formats=spec["formats"])
+        if param_type == "Tuple":
+            return types.Tuple([ClickDataUtils.click_type_from_spec(t) for t in spec["types"]])
+
+        return ClickDataUnknownType(spec)
+
+
+class ClickDataUnknownType(types.ParamType):
+    """Placeholder for Click type restored from serialized metadata (e.g. custom type of target CLI)."""
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.name = spec.get("name")
+
+    def __repr__(self):
+        return f"<{self.spec.get('module', 'click.types')}.{self.spec['param_type']} (restored)>"
+
 ################################################################################################################
 
-@dataclass
+class ClickDataPool:
+    """
+    Hash-consing table of one parse (or cache restore).
+
+    Identical parameter definitions (e.g. '--model' repeated across dozens of subcommands)
+    become one shared ClickDataParam and identifier-like strings (names, option strings,
+    command paths) are interned, so very large CLIs need a fraction of memory. ClickDataParam
+    is frozen, so sharing is safe (mutable 'default' / 'envvar' values must not be modified).
+    """
+
+    __slots__ = ("_params", "_types")
+
+    def __init__(self):
+        self._params: Dict[tuple, 'ClickDataParam'] = {}
+        # id -> (type, key), type is referenced so its id is not reused while pool lives
+        self._types: Dict[int, Tuple[types.ParamType, str]] = {}
+
+    ##############
+    # api extra
+    ##############
+    def param(self, param: 'ClickDataParam') -> 'ClickDataParam':
+        """Shared instance equal to 'param' (copy of the first one seen, with interned strings)."""
+        key = (
+            param.name,
+            self._type_key(param.param_type_click),
+            param.param_type_name,
+            param.is_flag,
+            tuple(param.opts),
+            tuple(param.secondary_opts),
+            param.required,
+            self._freeze(param.default),
+            param.nargs,
+            param.multiple,
+            param.help,
+            self._freeze(param.envvar),
+        )
+        shared = self._params.get(key)
+        if shared is None:
+            shared = self._params[key] = dataclasses.replace(
+                param,
+                name=self.intern(param.name),
+                param_type_name=self.intern(param.param_type_name),
+                opts=tuple(sys.intern(opt) for opt in param.opts),
+                secondary_opts=tuple(sys.intern(opt) for opt in param.secondary_opts),
+                envvar=self.intern(param.envvar),
+            )
+        return shared
+
+    @staticmethod
+    def intern(value: Optional[str]) -> Optional[str]:
+        return sys.intern(value) if isinstance(value, str) else value
+
+    ##############
+    # internal
+    ##############
+    def _type_key(self, param_type: types.ParamType) -> str:
+        """
+        Equal Click types (e.g. two 'Choice' of same choices) have equal key.
+
+        Spec of custom (or subclassed) type holds only its identity, not its settings,
+        such types are equal only to themselves.
+        """
+        cached = self._types.get(id(param_type))
+        if cached is None:
+            if self._described_by_spec(param_type):
+                key = json.dumps(ClickDataUtils.click_type_to_spec(param_type), sort_keys=True, default=str)
+            else:
+                key = f"id:{id(param_type)}"
+            cached = self._types[id(param_type)] = (param_type, key)
+        return cached[1]
+
+    @staticmethod
+    def _described_by_spec(param_type: types.ParamType) -> bool:
+        if isinstance(param_type, ClickDataUnknownType):
+            # restored placeholder, spec is all it holds
+            return True
+        if not ClickDataUtils.is_click_type(param_type):
+            return False
+        if isinstance(param_type, types.Tuple):
+            return all(ClickDataPool._described_by_spec(t) for t in param_type.types)
+        return True
+
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        if isinstance(value, (list, tuple)):
+            return tuple(ClickDataPool._freeze(v) for v in value)
+        if isinstance(value, dict):
+            return tuple((k, ClickDataPool._freeze(v)) for k, v in value.items())
+        return value
+
+################################################################################################################
+
+@dataclass(slots=True, frozen=True)
 class ClickDataParam:
-    """Information about a Click command parameter."""
+    """Information about a Click command parameter (immutable, instances are shared by ClickDataPool)."""
     name: str
     param_type_click: types.ParamType
     param_type_name: str
     param_type_is_argument: bool
     param_type_is_option: bool
     is_flag: bool
-    opts: list[str] = field(default_factory=list)
-    secondary_opts: list[str] = field(default_factory=list)
+    opts: Tuple[str, ...] = ()
+    secondary_opts: Tuple[str, ...] = ()
     required: bool = False
     default: Any = None
     nargs: int = 1
@@ -110,7 +440,23 @@ class ClickDataParam:
         return self.required #or self.param_type_is_argument
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        """JSON-friendly dict, Click type is described by 'ClickDataUtils.click_type_to_spec' (lists are not copied)."""
+        return {
+            "name": self.name,
+            "param_type_click": ClickDataUtils.click_type_to_spec(self.param_type_click),
+            "param_type_name": self.param_type_name,
+            "param_type_is_argument": self.param_type_is_argument,
+            "param_type_is_option": self.param_type_is_option,
+            "is_flag": self.is_flag,
+            "opts": list(self.opts),
+            "secondary_opts": list(self.secondary_opts),
+            "required": self.required,
+            "default": self.default,
+            "nargs": self.nargs,
+            "multiple": self.multiple,
+            "help": self.help,
+            "envvar": self.envvar,
+        }
 
     def to_help_string_lines(self, indent: str , dump_empty: bool = False) -> List[str]:
         return ClickDataUtils.to_help_string_lines(
@@ -123,14 +469,14 @@ class ClickDataParam:
         """Determine Python type annotation string from Click parameter."""
 
         # Get base type using the mapping
-        base_type = ClickDataUtils.click_type_to_python_type_as_string(self.param_type_click, str)
+        base_type = ClickDataUtils.click_type_to_python_type_as_string(self.param_type_click, str, self)
 
         # Handle multiple values
         if self.multiple or self.nargs > 1 or self.nargs == -1:
             if isinstance(self.param_type_click, types.Tuple):
                 # Get tuple element types as strings
                 element_types = ', '.join(
-                    ClickDataUtils.click_type_to_python_type_as_string(t, str) for t in self.param_type_click.types
+                    ClickDataUtils.click_type_to_python_type_as_string(t, str, self) for t in self.param_type_click.types
                 )
                 base_type = f"List[Tuple[{element_types}]]"
             else:
@@ -165,14 +511,12 @@ class ClickDataParam:
 
 ################################################################################################################
 
-@dataclass
+@dataclass(slots=True)
 class ClickDataCommand:
     """Metadata for a Click command."""
     fnc_name: str
     default_cmd_name: Optional[str] = None
     default_if_no_args: Optional[bool] = None
-    fnc_dbg_params: list[str] = field(default_factory=list)
-    fnc_dbg_subcommands: list[str] = field(default_factory=list)
     fnc_help_short: str = ""
     fnc_help: str = ""
     fnc_params: list[ClickDataParam] = field(default_factory=list)
@@ -181,6 +525,16 @@ class ClickDataCommand:
     ##############
     # api extra
     ##############
+    @property
+    def fnc_dbg_params(self) -> List[str]:
+        """Parameter names (derived from 'fnc_params')."""
+        return [p.name for p in self.fnc_params]
+
+    @property
+    def fnc_dbg_subcommands(self) -> List[str]:
+        """Registered subcommand names (derived from 'fnc_subcommands')."""
+        return list(self.fnc_subcommands)
+
     @property
     def is_leaf(self):
         return False if len(self.fnc_subcommands) else True
@@ -197,8 +551,24 @@ class ClickDataCommand:
     def params_optional(self):
         return [p for p in self.fnc_params if not p.is_mandatory_python()]
 
-    def to_dict(self) -> dict:
-        return asdict(self)
+    def to_dict(self, params: bool = True) -> dict:
+        """
+        JSON-friendly dict, subcommands are given by registered names (their metadata are separate records).
+
+        Args:
+            params: Include 'fnc_params' (last key)
+        """
+        data = {
+            "fnc_name": self.fnc_name,
+            "default_cmd_name": self.default_cmd_name,
+            "default_if_no_args": self.default_if_no_args,
+            "fnc_help_short": self.fnc_help_short,
+            "fnc_help": self.fnc_help,
+            "fnc_subcommands": list(self.fnc_subcommands),
+        }
+        if params:
+            data["fnc_params"] = [p.to_dict() for p in self.fnc_params]
+        return data
 
     def to_help_string_lines(
             self,
@@ -216,7 +586,7 @@ class ClickDataCommand:
 
 ################################################################################################################
 
-@dataclass
+@dataclass(slots=True)
 class ClickMetadata:
     cmd_base: str
     cmd_path: list[str]
@@ -243,7 +613,8 @@ class ClickMetadata:
         return self.cmd_data.is_leaf
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        """JSON-friendly record of this command, see ClickMetadataSerializer."""
+        return {"cmd_base": self.cmd_base, "cmd_path": self.cmd_path, "cmd_data": self.cmd_data.to_dict()}
 
     ##############
     # internal
@@ -257,10 +628,132 @@ class ClickMetadata:
 
 ################################################################################################################
 
+class ClickCommandIndex:
+    """
+    Lookup structures over parsed metadata, built once.
+
+    Holds trie keyed by command path (names without main command) and reverse maps
+    of option strings, environment variables and parameter types to commands using them.
+
+    Examples:
+        >>> index = ClickParser.factory(importer).index
+        >>> index.get("models options set")
+        >>> index.under("embed-models")         # 'embed-models' and all its subcommands
+        >>> index.by_option("--model")          # every command accepting '--model'
+    """
+
+    class _Node:
+        __slots__ = ("children", "metadata")
+
+        def __init__(self):
+            self.children: Dict[str, 'ClickCommandIndex._Node'] = {}
+            self.metadata: Optional[ClickMetadata] = None
+
+    def __init__(self, metadata: List[ClickMetadata]):
+        self.metadata = metadata
+        self.size = len(metadata)
+
+        self.names_short: List[List[str]] = []
+        self.names_short_joined: List[str] = []
+        self.names_full_joined: List[str] = []
+        self.commands_map: Dict[str, ClickMetadata] = {}
+
+        self._root = ClickCommandIndex._Node()
+        self._options: Dict[str, List[ClickMetadata]] = {}
+        self._envvars: Dict[str, List[ClickMetadata]] = {}
+        self._types: Dict[Type[types.ParamType], List[ClickMetadata]] = {}
+        self._type_names: Dict[str, List[ClickMetadata]] = {}
+
+        for m in metadata:
+            name_short = m.name_short
+            self.names_short.append(name_short)
+            self.names_short_joined.append(" ".join(name_short))
+            self.names_full_joined.append(" ".join([m.cmd_base] + name_short))
+            self.commands_map[" ".join(name_short) or m.cmd_base] = m
+
+            node = self._root
+            for name in name_short:
+                node = node.children.setdefault(name, ClickCommandIndex._Node())
+            node.metadata = m
+
+            for p in m.cmd_data.fnc_params:
+                for opt in (p.opts + p.secondary_opts) if p.param_type_is_option else []:
+                    self._add(self._options, opt, m)
+                envvars = [p.envvar] if isinstance(p.envvar, str) else (p.envvar or [])
+                for envvar in envvars:
+                    self._add(self._envvars, envvar, m)
+                self._add(self._types, type(p.param_type_click), m)
+                self._add(self._type_names, p.param_type_click.name, m)
+
+    ##############
+    # api extra
+    ##############
+    def get(self, command_path: Union[str, List[str]]) -> Optional[ClickMetadata]:
+        """Exact lookup, '' or [] is main command."""
+        node = self._find(command_path)
+        return node.metadata if node else None
+
+    def under(self, command_path: Union[str, List[str]]) -> List[ClickMetadata]:
+        """Command and all its subcommands (pre-order)."""
+        node = self._find(command_path)
+        if node is None:
+            return []
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.metadata is not None:
+                found.append(node.metadata)
+            stack.extend(reversed(node.children.values()))
+        return found
+
+    def by_option(self, opt: str) -> List[ClickMetadata]:
+        """Commands accepting option, e.g. '--model' or '-m'."""
+        return list(self._options.get(opt, []))
+
+    def by_envvar(self, envvar: str) -> List[ClickMetadata]:
+        """Commands reading environment variable."""
+        return list(self._envvars.get(envvar, []))
+
+    def by_type(self, param_type: Union[str, Type[types.ParamType]]) -> List[ClickMetadata]:
+        """Commands with parameter of Click type, given by type name (e.g. 'choice') or class (incl. subclasses)."""
+        if isinstance(param_type, str):
+            return list(self._type_names.get(param_type, []))
+        found = []
+        for type_class, commands in self._types.items():
+            if issubclass(type_class, param_type):
+                found.extend(m for m in commands if not any(m is f for f in found))
+        return found
+
+    ##############
+    # internal
+    ##############
+    def _find(self, command_path: Union[str, List[str]]) -> Optional['ClickCommandIndex._Node']:
+        names = command_path.split() if isinstance(command_path, str) else command_path
+        node = self._root
+        for name in names:
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _add(mapping: Dict[Any, List[ClickMetadata]], key: Any, m: ClickMetadata):
+        commands = mapping.setdefault(key, [])
+        # parameter can repeat option (e.g. '--flag/--no-flag'), command is listed once
+        if not commands or commands[-1] is not m:
+            commands.append(m)
+
+################################################################################################################
+
 @dataclass
 class ClickParser:
     importer: ClickImporter
     metadata: List[ClickMetadata] = field(default_factory=list)
+    _subtrees: Dict[Tuple[str, ...], List[ClickMetadata]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _index: Optional[ClickCommandIndex] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.importer.py_import_path_attribute:
@@ -281,101 +774,195 @@ class ClickParser:
     def script_string_package(self) -> str:
         return self.importer.py_import_package
 
+    @property
+    def index(self) -> ClickCommandIndex:
+        """Command index, built on first access after (re)parsing."""
+        if self._index is None or self._index.metadata is not self.metadata or self._index.size != len(self.metadata):
+            self._index = ClickCommandIndex(self.metadata)
+        return self._index
+
     @property
     def names_short(self):
-        return [m.name_short for m in self.metadata]
+        return self.index.names_short
 
     @property
     def names_short_joined(self):
-        return [m.name_short_joined for m in self.metadata]
+        return self.index.names_short_joined
 
     @property
     def names_full_joined(self):
-        return [m.name_full_joined for m in self.metadata]
+        return self.index.names_full_joined
 
     @property
     def commands_map(self) -> Dict[str, ClickMetadata]:
-        return self._commands_map(full_dict=False)
+        return self.index.commands_map
 
     @property
     def commands_as_dict(self) -> Dict[str, Dict[str,Dict]]:
-        return self._commands_map(full_dict=True)
-
-    ##############
-    # internal
-    ##############
-    def _commands_map(self, full_dict: bool = False) -> Union[Dict[str, ClickMetadata], Dict[str, Dict[str,Dict]]]:
-        data = {}
-        for m in self.metadata:
-            cmd_path = m.name_short_joined or self.importer.py_import_package
-            data[cmd_path] = m.to_dict() if full_dict else m
-        return data
+        return {name: m.to_dict() for name, m in self.commands_map.items()}
 
     ##############
     # parsing
     ##############
     @staticmethod
-    def factory(importer: ClickImporter) -> 'ClickParser':
-        """Traverse Click command tree and return metadata"""
+    def factory(
+            importer: ClickImporter,
+            cache: Optional['ClickMetadataCache'] = None,
+            static: bool = False,
+            command_path: Optional[List[str]] = None
+    ) -> 'ClickParser':
+        """
+        Traverse Click command tree and return metadata
+
+        Args:
+            importer: ClickImporter instance, created with 'lazy=True' the target is
+                not imported at all when metadata are loaded from cache (or statically)
+            cache: Optional ClickMetadataCache, warm entry skips traversal
+            static: Build command tree from target sources (see ClickStaticLoader),
+                target is imported only for subtrees too dynamic for static analysis
+            command_path: Optional command names (e.g. ['models', 'options']), only
+                that command and its subcommands are parsed (see 'subtree')
+        """
         parser = ClickParser(importer)
 
+        if cache is not None:
+            cached = cache.load(importer, static)
+            if cached is not None:
+                parser.metadata = cached
+                if command_path:
+                    parser.metadata = parser.subtree(command_path)
+                return parser
+
+        if static:
+            click_obj_cli_main = ClickStaticLoader(importer).load()
+        else:
+            click_obj_cli_main = importer.click_obj_cli_main
+
+        if command_path:
+            # partial metadata are never cached
+            parser.metadata = parser.subtree(command_path, click_obj_cli_main)
+            return parser
+
+        parser.metadata = ClickParser._traverse(parser.script_string_package, click_obj_cli_main)
+
+        if cache is not None:
+            cache.store(importer, parser.metadata, static)
+
+        return parser
+
+    def subtree(self, command_path: List[str], click_obj_cli_main: Optional[Command] = None) -> List[ClickMetadata]:
+        """
+        Metadata of command given by path and all its subcommands.
+
+        Subtree is parsed on first access only (and memoized), command path is resolved
+        by 'Group.get_command', so single command queries cost is proportional to
+        the subtree, not to whole application. When full tree is already parsed,
+        subtree is taken from it.
+
+        Args:
+            command_path: Command names without main command, e.g. ['models', 'options']
+            click_obj_cli_main: Optional main command object, defaults to importer's one
+
+        Raises:
+            ValueError: If command path does not exist
+        """
+        key = tuple(command_path)
+        if key in self._subtrees:
+            return self._subtrees[key]
+
+        if self.metadata and len(self.metadata[0].cmd_path) == 1:
+            metadata = [m for m in self.metadata if m.name_short[:len(key)] == list(key)]
+            if not metadata:
+                raise ValueError(f"Command '{' '.join(command_path)}' not found in '{self.script_string_package}'")
+        else:
+            command_obj, cmds_names = self._click_resolve_command_path(
+                click_obj_cli_main or self.importer.click_obj_cli_main,
+                command_path
+            )
+            metadata = ClickParser._traverse(self.script_string_package, command_obj, cmds_names[:-1])
+
+        self._subtrees[key] = metadata
+        return metadata
+
+    def _click_resolve_command_path(self, click_obj_cli_main: Command, command_path: List[str]) -> Tuple[Command, List[str]]:
+        """Resolve command by names like Click does, returns command and its full 'cmd_path'."""
+        command_obj = click_obj_cli_main
+        cmds_names = [command_obj.name]
+        ctx = click.Context(command_obj, info_name=command_obj.name, resilient_parsing=True)
+        for name in command_path:
+            if not isinstance(command_obj, click.Group) or name not in command_obj.list_commands(ctx):
+                raise ValueError(f"Command '{' '.join(command_path)}' not found in '{self.script_string_package}'")
+            command_obj = command_obj.get_command(ctx, name)
+            ctx = click.Context(command_obj, info_name=name, parent=ctx, resilient_parsing=True)
+            cmds_names.append(command_obj.name)
+        return command_obj, cmds_names
+
+    @staticmethod
+    def _traverse(
+            cmd_base: str,
+            click_command_obj: Command,
+            parent_cmds_names: Optional[List[str]] = None
+    ) -> List[ClickMetadata]:
+        """Parse command and all its subcommands."""
+        metadata = []
+
         # Code inspired by Simon Willison
         #  - First find all commands and subcommands
         #  - List will be [ (["command"], click_object), (["command", "subcommand"], click_object) ...]
-
-        def find_commands(command_obj: Command, parent_cmds_names = None):
-            parent_cmds_names  = parent_cmds_names or []
-            current_cmds_names = parent_cmds_names + [command_obj.name]
-
-            cmd_path_obj = ClickMetadata(
-                cmd_base=parser.script_string_package,
+        #  - Every command is parsed exactly once, the node is shared between
+        #    ClickMetadata.cmd_data and parent's fnc_subcommands
+        #  - Explicit stack (pre-order) instead of recursion, so deep trees never hit recursion limit
+        #  - Identical parameters are shared and names interned (see ClickDataPool)
+        pool = ClickDataPool()
+        cmd_base = pool.intern(cmd_base)
+        stack: List[Tuple[Command, List[str], Optional[ClickDataCommand], Optional[str]]] = [
+            (click_command_obj, [pool.intern(name) for name in parent_cmds_names or []], None, None)
+        ]
+        while stack:
+            command_obj, parent_cmds_names, parent_data, registered_name = stack.pop()
+            current_cmds_names = parent_cmds_names + [pool.intern(command_obj.name)]
+
+            cmd_data = ClickParser._click_parse_command_obj(command_obj, pool)
+            if parent_data is not None:
+                parent_data.fnc_subcommands[pool.intern(registered_name)] = cmd_data
+
+            metadata.append(ClickMetadata(
+                cmd_base=cmd_base,
                 cmd_path=current_cmds_names,
-                cmd_data=ClickParser._click_parse_command_obj(command_obj)
-            )
+                cmd_data=cmd_data
+            ))
 
-            parser.metadata.append(cmd_path_obj)
             if hasattr(command_obj, "commands"):
-                for subcommand in command_obj.commands.values():
-                    find_commands(subcommand, current_cmds_names)
+                # reversed, so subcommands are popped (and listed) in definition order
+                for name, subcommand in reversed(list(command_obj.commands.items())):
+                    stack.append((subcommand, current_cmds_names, cmd_data, name))
 
-        find_commands(importer.click_obj_cli_main)
-
-        return parser
+        return metadata
 
     @staticmethod
-    def _click_parse_command_obj(click_command_obj) -> ClickDataCommand:
-        """Extract metadata from a Click command as a CommandMetadata dataclass."""
+    def _click_parse_command_obj(click_command_obj, pool: Optional[ClickDataPool] = None) -> ClickDataCommand:
+        """
+        Extract metadata from a Click command as a CommandMetadata dataclass.
+
+        Subcommands are NOT parsed here, 'fnc_subcommands' is filled by tree traversal in factory.
+        """
+        pool = pool or ClickDataPool()
 
         # Extract parameters
         params = []
-        dbg_params = []
         for param in click_command_obj.params:
             param_info = ClickParser._click_parse_param_obj(param)
             # if 'attachment_types' == param_info.name:
             #     print(param_info.help)
-            params.append(param_info)
-            dbg_params.append(param.name)
-
-        # Extract subcommands
-        subcommands = {}
-        dbg_subcommands = []
-        if hasattr(click_command_obj, "commands"):
-            subcommands = {
-                name: ClickParser._click_parse_command_obj(subcmd)
-                for name, subcmd in click_command_obj.commands.items()
-            }
-            dbg_subcommands = list(click_command_obj.commands.keys())
+            params.append(pool.param(param_info))
 
         return ClickDataCommand(
-            fnc_name=click_command_obj.name,
-            default_cmd_name=getattr(click_command_obj, "default_cmd_name", None),
+            fnc_name=pool.intern(click_command_obj.name),
+            default_cmd_name=pool.intern(getattr(click_command_obj, "default_cmd_name", None)),
             default_if_no_args=getattr(click_command_obj, "default_if_no_args", None),
-            fnc_dbg_params=dbg_params,
-            fnc_dbg_subcommands=dbg_subcommands,
             fnc_help_short=click_command_obj.short_help or "",
             fnc_help=ClickDataUtils.sanitize_help_string(click_command_obj.help or ""),
             fnc_params=params,
-            fnc_subcommands=subcommands,
         )
 
     @staticmethod
@@ -388,8 +975,8 @@ class ClickParser:
             param_type_is_argument=click_param_obj.param_type_name == 'argument',
             param_type_is_option=click_param_obj.param_type_name == 'option',
             is_flag=getattr(click_param_obj, "is_flag", False),
-            opts=getattr(click_param_obj, "opts", []),
-            secondary_opts=getattr(click_param_obj, "secondary_opts", []),
+            opts=tuple(getattr(click_param_obj, "opts", ())),
+            secondary_opts=tuple(getattr(click_param_obj, "secondary_opts", ())),
             required=getattr(click_param_obj, "required", False),
             default=ClickParser._safe_serialize(getattr(click_param_obj, "default", None)),
             nargs=getattr(click_param_obj, "nargs", 1),
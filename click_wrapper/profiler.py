@@ -0,0 +1,285 @@
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from click_wrapper.importer import ClickImporter
+
+# child process: import target under '-X importtime' between markers, then report callback module of every command
+_CHILD_SCRIPT = '''
+import json, sys
+path, attribute, start, end = sys.argv[1:5]
+sys.stderr.write(start + "\\n")
+sys.stderr.flush()
+# builtin import is traced by '-X importtime', 'importlib.import_module' is not
+__import__(path)
+target = sys.modules[path]
+if attribute:
+    target = getattr(target, attribute)
+sys.stderr.write(end + "\\n")
+sys.stderr.flush()
+
+commands = {}
+def walk(command, names):
+    commands[" ".join(names)] = getattr(getattr(command, "callback", None), "__module__", None)
+    if hasattr(command, "list_commands"):
+        import click
+        ctx = click.Context(command, info_name=command.name)
+        for name in command.list_commands(ctx):
+            sub_command = command.get_command(ctx, name)
+            if sub_command is not None:
+                walk(sub_command, names + [name])
+if hasattr(target, "callback"):
+    walk(target, [])
+print(json.dumps(commands))
+'''
+
+@dataclass
+class ClickImportNode:
+    """Module imported by target, with import times (microseconds) as reported by '-X importtime'."""
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List["ClickImportNode"] = field(default_factory=list)
+    # subcommands whose callbacks are defined in this module
+    commands: List[str] = field(default_factory=list)
+
+    def walk(self, stack: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], "ClickImportNode"]]:
+        """Depth-first (module names stack, node) pairs of this node and its descendants."""
+        stack = stack + (self.name,)
+        yield stack, self
+        for child in self.children:
+            yield from child.walk(stack)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "self_us": self.self_us,
+            "cumulative_us": self.cumulative_us,
+            "commands": self.commands,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+@dataclass
+class ClickImportProfile:
+    """
+    Import cost of target CLI.
+
+    'modules' are imported by target import itself, 'deferred' while resolving subcommands
+    (lazy groups, plugins), both sorted by cumulative time. Subcommand specific modules are
+    callback modules of subcommands other than the module of root command callback, their
+    cumulative time is paid only because of those subcommands.
+    """
+    target: str
+    modules: List[ClickImportNode]
+    deferred: List[ClickImportNode]
+    # command name ("" for root) -> module of its callback
+    command_modules: Dict[str, Optional[str]]
+
+    @property
+    def total_us(self) -> int:
+        return sum(node.cumulative_us for node in self.modules)
+
+    @property
+    def deferred_us(self) -> int:
+        return sum(node.cumulative_us for node in self.deferred)
+
+    def specific(self) -> List[ClickImportNode]:
+        """Nodes of callback modules used only by subcommands, by cumulative time."""
+        root_module = self.command_modules.get("")
+        nodes = [
+            node
+            for roots in (self.modules, self.deferred) for root in roots for _, node in root.walk()
+            if node.commands and node.name != root_module
+        ]
+        return sorted(nodes, key=lambda node: node.cumulative_us, reverse=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "target": self.target,
+            "total_us": self.total_us,
+            "deferred_us": self.deferred_us,
+            "modules": [node.to_dict() for node in self.modules],
+            "deferred": [node.to_dict() for node in self.deferred],
+            "command_modules": self.command_modules,
+            "specific": [
+                {"module": node.name, "cumulative_us": node.cumulative_us, "commands": node.commands}
+                for node in self.specific()
+            ],
+        }
+
+    def format_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_collapsed(self) -> str:
+        """Collapsed stacks ('a;b;c <self us>' lines), input of flamegraph.pl, speedscope, inferno."""
+        lines = []
+        for roots, prefix in ((self.modules, ()), (self.deferred, ("<subcommands>",))):
+            for root in roots:
+                for stack, node in root.walk(prefix):
+                    lines.append(f"{';'.join(stack)} {node.self_us}")
+        return "\n".join(lines)
+
+    def format_text(self, min_ms: float = 1.0, depth: Optional[int] = None) -> str:
+        """
+        Tree of cumulative and self time per module, children sorted by cumulative time.
+
+        Args:
+            min_ms: Hide modules whose cumulative time is below this threshold
+            depth: Hide modules nested deeper than this (all when None)
+        """
+        lines = [
+            f"Import of {self.target}: {self.total_us / 1000:.1f} ms"
+            f" (+{self.deferred_us / 1000:.1f} ms resolving subcommands)",
+            f"{'cumulative':>11} {'self':>9}  module [ms]",
+        ]
+        lines.extend(self._format_nodes(self.modules, min_ms, depth))
+        if self.deferred:
+            lines.extend(["", "Imported while resolving subcommands:"])
+            lines.extend(self._format_nodes(self.deferred, min_ms, depth))
+        specific = self.specific()
+        if specific:
+            lines.extend(["", "Modules needed only by specific subcommands:"])
+            for node in specific:
+                lines.append(f"{node.cumulative_us / 1000:11.1f}  {node.name} ({', '.join(node.commands)})")
+        return "\n".join(lines)
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _format_nodes(nodes: List[ClickImportNode], min_ms: float, depth: Optional[int], level: int = 0) -> Iterator[str]:
+        for node in nodes:
+            if node.cumulative_us < min_ms * 1000:
+                continue
+            commands = ""
+            if node.commands:
+                commands = f"  [{', '.join(node.commands) if len(node.commands) <= 3 else f'{len(node.commands)} commands'}]"
+            yield (
+                f"{node.cumulative_us / 1000:11.1f} {node.self_us / 1000:9.1f}  "
+                f"{'  ' * level}{node.name}{commands}"
+            )
+            if depth is None or level + 1 < depth:
+                yield from ClickImportProfile._format_nodes(node.children, min_ms, depth, level + 1)
+
+class ClickImportProfiler:
+    """
+    Profile import of target CLI in a child process run with '-X importtime'.
+
+    Child process starts from scratch, so nothing imported by the caller hides the real
+    cost. Import tree is parsed from child stderr, callback module of every command is
+    reported by the child to attribute modules to subcommands.
+    """
+
+    _start_marker: str = "click-wrapper: import start"
+    _end_marker: str = "click-wrapper: import end"
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def profile(importer: ClickImporter, timeout: Optional[float] = None) -> ClickImportProfile:
+        """
+        Import target of importer in child process and return its import profile.
+
+        Args:
+            importer: ClickImporter of target, should be lazy (target is not imported here)
+            timeout: Seconds to wait for child process (no limit if None)
+
+        Returns:
+            Import profile with module tree and subcommand attribution
+
+        Raises:
+            ImportError: If target cannot be imported in child process
+            subprocess.TimeoutExpired: If child process does not finish in time
+
+        Examples:
+            >>> profile = ClickImportProfiler.profile(ClickImporter('llm', lazy=True))
+            >>> print(profile.format_text(min_ms=5))
+        """
+        env = dict(os.environ)
+        # child sees the same modules as this process (e.g. sources on sys.path added at runtime)
+        env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+        env.pop("PYTHONPROFILEIMPORTTIME", None)
+        process = subprocess.run(
+            [
+                sys.executable, "-X", "importtime", "-c", _CHILD_SCRIPT,
+                importer.py_import_path, importer.py_import_path_attribute or "",
+                ClickImportProfiler._start_marker, ClickImportProfiler._end_marker,
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=timeout,
+        )
+        stderr_lines = process.stderr.splitlines()
+        if process.returncode != 0 or ClickImportProfiler._end_marker not in stderr_lines:
+            errors = [
+                line for line in stderr_lines
+                if not line.startswith("import time:") and line != ClickImportProfiler._start_marker
+            ]
+            raise ImportError(
+                f"Failed to import '{importer.py_import_path}' in profiling process: " + "\n".join(errors[-20:])
+            )
+
+        start = stderr_lines.index(ClickImportProfiler._start_marker)
+        end = stderr_lines.index(ClickImportProfiler._end_marker)
+        command_modules = json.loads(process.stdout.splitlines()[-1])
+        profile = ClickImportProfile(
+            target=":".join(filter(None, (importer.py_import_path, importer.py_import_path_attribute))),
+            modules=ClickImportProfiler.parse(stderr_lines[start + 1:end]),
+            deferred=ClickImportProfiler.parse(stderr_lines[end + 1:]),
+            command_modules=command_modules,
+        )
+        ClickImportProfiler._attribute(profile)
+        return profile
+
+    @staticmethod
+    def parse(lines: List[str]) -> List[ClickImportNode]:
+        """
+        Build import tree from '-X importtime' lines, roots and children sorted by cumulative time.
+
+        Lines are in post-order (module is reported after all modules it imported) and
+        nesting is given by two spaces of indentation per level.
+        """
+        pending: Dict[int, List[ClickImportNode]] = {}
+        for line in lines:
+            fields = line[len("import time:"):].split("|", 2)
+            if not line.startswith("import time:") or len(fields) != 3:
+                continue
+            self_us, cumulative_us, name = fields
+            try:
+                node = ClickImportNode(name.strip(), int(self_us), int(cumulative_us))
+            except ValueError:
+                # header line
+                continue
+            # nesting adds two spaces of indentation per level
+            level = (len(name) - len(name.lstrip(" "))) // 2
+            node.children = pending.pop(level + 1, [])
+            pending.setdefault(level, []).append(node)
+        roots = pending[min(pending)] if pending else []
+        ClickImportProfiler._sort(roots)
+        return roots
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _sort(nodes: List[ClickImportNode]):
+        nodes.sort(key=lambda node: node.cumulative_us, reverse=True)
+        for node in nodes:
+            ClickImportProfiler._sort(node.children)
+
+    @staticmethod
+    def _attribute(profile: ClickImportProfile):
+        """Record subcommands on nodes of modules defining their callbacks."""
+        by_module: Dict[str, List[str]] = {}
+        for command, module in profile.command_modules.items():
+            if command and module:
+                by_module.setdefault(module, []).append(command)
+        for roots in (profile.modules, profile.deferred):
+            for root in roots:
+                for _, node in root.walk():
+                    node.commands = by_module.get(node.name, [])
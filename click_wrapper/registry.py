@@ -0,0 +1,402 @@
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from click_wrapper.importer import ClickImporter
+from click_wrapper.parser import ClickParser, ClickMetadata, ClickTypeResolver
+from click_wrapper.serializer import ClickMetadataSerializer
+from click_wrapper.cache import ClickMetadataCache
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS targets (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    py_import_path TEXT NOT NULL,
+    py_import_path_attribute TEXT,
+    package TEXT NOT NULL,
+    static INTEGER NOT NULL,
+    source_key TEXT,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commands (
+    id INTEGER PRIMARY KEY,
+    target_id INTEGER NOT NULL REFERENCES targets(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    is_leaf INTEGER NOT NULL,
+    help TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    id INTEGER PRIMARY KEY,
+    command_id INTEGER NOT NULL REFERENCES commands(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    opts TEXT NOT NULL,
+    type_name TEXT NOT NULL,
+    type_class TEXT NOT NULL,
+    required INTEGER NOT NULL,
+    help TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS param_opts (
+    param_id INTEGER NOT NULL REFERENCES params(id) ON DELETE CASCADE,
+    opt TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS param_envvars (
+    param_id INTEGER NOT NULL REFERENCES params(id) ON DELETE CASCADE,
+    envvar TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commands_target ON commands(target_id, position);
+CREATE INDEX IF NOT EXISTS commands_name ON commands(name);
+CREATE INDEX IF NOT EXISTS params_command ON params(command_id);
+CREATE INDEX IF NOT EXISTS params_type_name ON params(type_name);
+CREATE INDEX IF NOT EXISTS params_type_class ON params(type_class);
+CREATE INDEX IF NOT EXISTS param_opts_opt ON param_opts(opt);
+CREATE INDEX IF NOT EXISTS param_opts_param ON param_opts(param_id);
+CREATE INDEX IF NOT EXISTS param_envvars_envvar ON param_envvars(envvar);
+CREATE INDEX IF NOT EXISTS param_envvars_param ON param_envvars(param_id);
+'''
+
+@dataclass
+class ClickRegistryTarget:
+    """CLI registered in ClickRegistry."""
+    name: str
+    py_import_path: str
+    py_import_path_attribute: Optional[str]
+    static: bool
+    source_key: Optional[str]
+    updated: float
+    commands: int = 0
+
+@dataclass
+class ClickRegistryHit:
+    """Command (and its parameter when query matched parameters) found by 'ClickRegistry.query'."""
+    target: str
+    command: str
+    param: Optional[str] = None
+    opts: List[str] = field(default_factory=list)
+    help: str = ""
+
+    def format_text(self) -> str:
+        param = f"  {', '.join(self.opts) or self.param}" if self.param is not None else ""
+        return f"{self.target}  {self.command}{param}"
+
+class ClickRegistry:
+    """
+    Searchable SQLite database of parsed metadata of many CLIs.
+
+    Every command and parameter of registered targets is stored as a row, options and
+    environment variables of parameters in indexed tables, help texts of commands and
+    parameters in FTS5 full-text index (plain table searched by LIKE when SQLite lacks
+    FTS5). Queries never import targets, 'refresh' re-parses only targets whose sources
+    changed (see 'ClickMetadataCache.source_key').
+
+    Examples:
+        >>> with ClickRegistry() as registry:
+        ...     registry.add(ClickImporter('llm', lazy=True))
+        ...     registry.query(option="--database")
+        ...     registry.query(envvar="OPENAI_API_KEY")
+        ...     registry.query(text="embedding")
+    """
+
+    # bump when stored rows change, 'refresh' then re-parses all targets
+    schema_version: int = 3
+    _fts_module: str = "fts5"
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path: Path = Path(path) if path else self.default_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.fts: bool = self._create_schema()
+
+    def __enter__(self) -> "ClickRegistry":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def default_path() -> Path:
+        """'registry.sqlite' in cache directory, can be overridden by 'CLICK_WRAPPER_REGISTRY' environment variable."""
+        if os.environ.get("CLICK_WRAPPER_REGISTRY"):
+            return Path(os.environ["CLICK_WRAPPER_REGISTRY"])
+        return ClickMetadataCache.default_cache_dir() / "registry.sqlite"
+
+    @staticmethod
+    def target_name(importer: ClickImporter) -> str:
+        return ":".join(filter(None, (importer.py_import_path, importer.py_import_path_attribute)))
+
+    def add(
+            self,
+            importer: ClickImporter,
+            cache: Optional[ClickMetadataCache] = None,
+            static: bool = False,
+    ) -> int:
+        """
+        Parse target and store (replace) its metadata.
+
+        Args:
+            importer: ClickImporter of target, with 'lazy=True' target is not imported
+                when metadata are loaded from cache (or statically)
+            cache: Optional ClickMetadataCache used by parsing
+            static: Build command tree from target sources (see ClickStaticLoader)
+
+        Returns:
+            Number of stored commands
+        """
+        source_key = ClickMetadataCache.source_key(importer)
+        metadata = ClickParser.factory(importer, cache, static).metadata
+        with self.connection:
+            self._store(importer, metadata, static, source_key)
+        return len(metadata)
+
+    def refresh(self, names: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, str]:
+        """
+        Re-parse registered targets whose sources changed since they were stored.
+
+        Args:
+            names: Targets to refresh (see 'targets'), all when None
+            force: Re-parse even unchanged targets
+
+        Returns:
+            Target name -> 'unchanged', 'updated' or 'error: <message>' (failed target keeps old rows)
+
+        Raises:
+            KeyError: If target is not registered
+        """
+        registered = {target.name: target for target in self.targets()}
+        selected = list(names) if names is not None else list(registered)
+        for name in selected:
+            if name not in registered:
+                raise KeyError(f"Target '{name}' is not registered")
+        if self._schema_changed():
+            force = True
+
+        status = {}
+        for name in selected:
+            target = registered[name]
+            importer = ClickImporter(
+                py_import_path=target.py_import_path,
+                py_import_path_attribute=target.py_import_path_attribute,
+                lazy=True,
+            )
+            source_key = ClickMetadataCache.source_key(importer)
+            if not force and source_key is not None and source_key == target.source_key:
+                status[name] = "unchanged"
+                continue
+            try:
+                self.add(importer, static=target.static)
+                status[name] = "updated"
+            except Exception as e:
+                status[name] = f"error: {e}"
+        if names is None:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO info VALUES ('schema_version', ?)", (str(self.schema_version),)
+                )
+        return status
+
+    def remove(self, name: str) -> bool:
+        """Remove target and all its rows, returns False when it is not registered."""
+        with self.connection:
+            target_id = self._target_id(name)
+            if target_id is None:
+                return False
+            self._delete(target_id)
+        return True
+
+    def targets(self) -> List[ClickRegistryTarget]:
+        rows = self.connection.execute(
+            "SELECT t.name, t.py_import_path, t.py_import_path_attribute, t.static, t.source_key, t.updated,"
+            " (SELECT COUNT(*) FROM commands c WHERE c.target_id = t.id)"
+            " FROM targets t ORDER BY t.name"
+        )
+        return [
+            ClickRegistryTarget(name, path, attribute, bool(static), source_key, updated, commands)
+            for name, path, attribute, static, source_key, updated, commands in rows
+        ]
+
+    def metadata(self, name: str) -> List[ClickMetadata]:
+        """
+        Stored metadata of target, equal to freshly parsed ones (nothing is imported).
+
+        Raises:
+            KeyError: If target is not registered
+        """
+        target_id = self._target_id(name)
+        if target_id is None:
+            raise KeyError(f"Target '{name}' is not registered")
+        rows = self.connection.execute(
+            "SELECT record FROM commands WHERE target_id = ? ORDER BY position", (target_id,)
+        )
+        return ClickMetadataSerializer.from_records(json.loads(record) for record, in rows)
+
+    def query(
+            self,
+            option: Optional[str] = None,
+            envvar: Optional[str] = None,
+            type_name: Optional[str] = None,
+            text: Optional[str] = None,
+            command: Optional[str] = None,
+            target: Optional[str] = None,
+            limit: Optional[int] = None,
+    ) -> List[ClickRegistryHit]:
+        """
+        Find commands of registered targets, all given criteria must match.
+
+        With parameter criteria (option, envvar, type_name) hits are matching parameters,
+        otherwise matching commands.
+
+        Args:
+            option: Option string accepted by parameter, e.g. '--database' or '-d'
+            envvar: Environment variable read by parameter
+            type_name: Click type name (e.g. 'integer', 'choice'), ParamType class name or its dotted path
+            text: Words (phrase) in help of command or of any of its parameters
+            command: Command name (without main command) or its prefix, e.g. 'models'
+            target: Registered target name (see 'targets')
+            limit: Maximum number of hits
+
+        Returns:
+            Hits ordered by target and command position
+        """
+        by_param = option is not None or envvar is not None or type_name is not None
+        conditions, args = [], []
+        if option is not None:
+            conditions.append("p.id IN (SELECT param_id FROM param_opts WHERE opt = ?)")
+            args.append(option)
+        if envvar is not None:
+            conditions.append("p.id IN (SELECT param_id FROM param_envvars WHERE envvar = ?)")
+            args.append(envvar)
+        if type_name is not None:
+            conditions.append("(p.type_name = ? OR p.type_class = ? OR p.type_class LIKE ? ESCAPE '\\')")
+            escaped = type_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.extend([type_name, type_name, f"%.{escaped}"])
+        if text is not None:
+            if self.fts:
+                conditions.append("c.id IN (SELECT command_id FROM help_text WHERE help_text MATCH ?)")
+                # searched as phrase, FTS query syntax (e.g. leading '-') is not interpreted
+                args.append('"' + text.replace('"', '""') + '"')
+            else:
+                conditions.append("c.id IN (SELECT command_id FROM help_text WHERE text LIKE ?)")
+                args.append(f"%{text}%")
+        if command is not None:
+            conditions.append("(c.name = ? OR c.name LIKE ? ESCAPE '\\')")
+            escaped = command.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.extend([command, f"{escaped} %"])
+        if target is not None:
+            conditions.append("t.name = ?")
+            args.append(target)
+
+        columns = "t.name, c.full_name, p.name, p.opts, p.help" if by_param else "t.name, c.full_name, NULL, '[]', c.help"
+        sql = (
+            f"SELECT {columns} FROM commands c JOIN targets t ON t.id = c.target_id"
+            + (" JOIN params p ON p.command_id = c.id" if by_param else "")
+            + (" WHERE " + " AND ".join(conditions) if conditions else "")
+            + " ORDER BY t.name, c.position" + (", p.id" if by_param else "")
+            + (" LIMIT ?" if limit is not None else "")
+        )
+        if limit is not None:
+            args.append(limit)
+        return [
+            ClickRegistryHit(target_name, full_name, param, json.loads(opts), help)
+            for target_name, full_name, param, opts, help in self.connection.execute(sql, args)
+        ]
+
+    ##############
+    # internal
+    ##############
+    def _create_schema(self) -> bool:
+        """Create tables when missing, returns whether help texts are FTS5 indexed."""
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(
+                "INSERT OR IGNORE INTO info VALUES ('schema_version', ?)", (str(self.schema_version),)
+            )
+            row = self.connection.execute("SELECT sql FROM sqlite_master WHERE name = 'help_text'").fetchone()
+            if row is not None:
+                return "VIRTUAL TABLE" in row[0].upper()
+            try:
+                self.connection.execute(
+                    f"CREATE VIRTUAL TABLE help_text USING {self._fts_module}(text, command_id UNINDEXED)"
+                )
+                return True
+            except sqlite3.OperationalError:
+                self.connection.execute("CREATE TABLE help_text (text TEXT NOT NULL, command_id INTEGER NOT NULL)")
+                self.connection.execute("CREATE INDEX help_text_command ON help_text(command_id)")
+                return False
+
+    def _schema_changed(self) -> bool:
+        row = self.connection.execute("SELECT value FROM info WHERE key = 'schema_version'").fetchone()
+        return row is None or row[0] != str(self.schema_version)
+
+    def _target_id(self, name: str) -> Optional[int]:
+        row = self.connection.execute("SELECT id FROM targets WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _delete(self, target_id: int):
+        # virtual (FTS) table is not covered by foreign keys
+        self.connection.execute(
+            "DELETE FROM help_text WHERE command_id IN (SELECT id FROM commands WHERE target_id = ?)", (target_id,)
+        )
+        self.connection.execute("DELETE FROM targets WHERE id = ?", (target_id,))
+
+    def _store(self, importer: ClickImporter, metadata: List[ClickMetadata], static: bool, source_key: Optional[str]):
+        name = self.target_name(importer)
+        target_id = self._target_id(name)
+        if target_id is not None:
+            self._delete(target_id)
+        target_id = self.connection.execute(
+            "INSERT INTO targets (name, py_import_path, py_import_path_attribute, package, static, source_key, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                name, importer.py_import_path, importer.py_import_path_attribute, importer.py_import_package,
+                int(static), source_key, time.time(),
+            ),
+        ).lastrowid
+
+        records = ClickMetadataSerializer.iter_records(metadata)
+        for position, (m, record) in enumerate(zip(metadata, records)):
+            data = m.cmd_data
+            command_id = self.connection.execute(
+                "INSERT INTO commands (target_id, position, name, full_name, is_leaf, help, record)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (target_id, position, m.name_short_joined, m.name_full_joined, int(m.is_leaf), data.fnc_help, record),
+            ).lastrowid
+            help_rows = [(data.fnc_help, command_id)] if data.fnc_help else []
+
+            for p in data.fnc_params:
+                opts = (p.opts + p.secondary_opts) if p.param_type_is_option else []
+                param_id = self.connection.execute(
+                    "INSERT INTO params (command_id, name, kind, opts, type_name, type_class, required, help)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        command_id, p.name, "option" if p.param_type_is_option else "argument", json.dumps(opts),
+                        getattr(p.param_type_click, "name", ""),
+                        # dotted path recorded in type spec, custom types restored from cache keep their class
+                        ClickTypeResolver._type_names(p.param_type_click)[0],
+                        int(p.required), p.help or "",
+                    ),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO param_opts VALUES (?, ?)", [(param_id, opt) for opt in opts]
+                )
+                envvars = [p.envvar] if isinstance(p.envvar, str) else (p.envvar or [])
+                self.connection.executemany(
+                    "INSERT INTO param_envvars VALUES (?, ?)", [(param_id, envvar) for envvar in envvars]
+                )
+                if p.help:
+                    help_rows.append((p.help, command_id))
+            self.connection.executemany("INSERT INTO help_text (text, command_id) VALUES (?, ?)", help_rows)
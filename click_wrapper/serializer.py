@@ -0,0 +1,180 @@
+import json
+from typing import IO, Dict, Iterable, Iterator, List, Tuple, Union
+
+from click_wrapper.parser import (
+    ClickDataUtils,
+    ClickDataPool,
+    ClickDataCommand,
+    ClickDataParam,
+    ClickMetadata,
+)
+
+class ClickMetadataSerializer:
+    """
+    Streaming JSON / NDJSON encoder and loader of parsed metadata.
+
+    Every command is one flat record ('ClickMetadata.to_dict'), subcommands are referenced by
+    registered name, Click types by their spec ('ClickDataUtils.click_type_to_spec'). Metadata
+    are walked once, each (shared) parameter is encoded once and records are yielded as they
+    are encoded, nothing is copied.
+
+    JSON document:  {"version": 1, "commands": [<record>, ...]}, one record per line
+    NDJSON:         <record> per line
+
+    Records must be in pre-order (as parsed), loader rebuilds the command tree from 'cmd_path'.
+
+    Examples:
+        >>> with open("llm.ndjson", "w") as f:
+        ...     ClickMetadataSerializer.dump(parser.metadata, f, format="ndjson")
+        >>> with open("llm.ndjson") as f:
+        ...     metadata = ClickMetadataSerializer.load(f)
+    """
+
+    # bump when record layout changes
+    format_version: int = 1
+    formats: Tuple[str, ...] = ("json", "ndjson")
+
+    ##############
+    # api extra
+    ##############
+    @staticmethod
+    def iter_json(metadata: Iterable[ClickMetadata]) -> Iterator[str]:
+        """Chunks of JSON document."""
+        yield f'{{"version":{ClickMetadataSerializer.format_version},"commands":['
+        separator = "\n"
+        for record in ClickMetadataSerializer.iter_records(metadata):
+            yield separator + record
+            separator = ",\n"
+        yield "\n]}\n"
+
+    @staticmethod
+    def iter_ndjson(metadata: Iterable[ClickMetadata]) -> Iterator[str]:
+        """Lines of NDJSON, one command per line."""
+        for record in ClickMetadataSerializer.iter_records(metadata):
+            yield record + "\n"
+
+    @staticmethod
+    def iter_records(metadata: Iterable[ClickMetadata]) -> Iterator[str]:
+        """Encoded record of each command."""
+        # id -> (param, encoded), param is referenced so its id is not reused while encoding
+        encoded_params: Dict[int, Tuple[ClickDataParam, str]] = {}
+        for m in metadata:
+            params = []
+            for p in m.cmd_data.fnc_params:
+                encoded = encoded_params.get(id(p))
+                if encoded is None:
+                    encoded = encoded_params[id(p)] = (p, json.dumps(p.to_dict(), separators=(",", ":")))
+                params.append(encoded[1])
+            head = json.dumps(
+                {"cmd_base": m.cmd_base, "cmd_path": m.cmd_path, "cmd_data": m.cmd_data.to_dict(params=False)},
+                separators=(",", ":")
+            )
+            # 'fnc_params' is appended to 'cmd_data' (head ends by '}}')
+            yield f'{head[:-2]},"fnc_params":[{",".join(params)}]}}}}'
+
+    @staticmethod
+    def iter_chunks(metadata: Iterable[ClickMetadata], format: str = "json") -> Iterator[str]:
+        """
+        Chunks of 'json' document or 'ndjson' lines.
+
+        Raises:
+            ValueError: If format is unknown
+        """
+        if format == "json":
+            return ClickMetadataSerializer.iter_json(metadata)
+        if format == "ndjson":
+            return ClickMetadataSerializer.iter_ndjson(metadata)
+        raise ValueError(f"Unknown format '{format}', expected {' or '.join(ClickMetadataSerializer.formats)}")
+
+    @staticmethod
+    def dump(metadata: Iterable[ClickMetadata], fp: IO[str], format: str = "json"):
+        """Write metadata to text file, see 'iter_chunks'."""
+        for chunk in ClickMetadataSerializer.iter_chunks(metadata, format):
+            fp.write(chunk)
+
+    @staticmethod
+    def dumps(metadata: Iterable[ClickMetadata], format: str = "json") -> str:
+        return "".join(ClickMetadataSerializer.iter_chunks(metadata, format))
+
+    @staticmethod
+    def load(fp: Union[IO[str], Iterable[str]]) -> List[ClickMetadata]:
+        """
+        Rebuild metadata from JSON document or NDJSON lines (detected by first line).
+
+        Raises:
+            ValueError: If input is not valid metadata or of other format version
+        """
+        lines = iter(fp)
+        first = next(lines, "")
+        if not ClickMetadataSerializer._is_record(first):
+            return ClickMetadataSerializer._from_document(json.loads(first + "".join(lines)))
+        records = (json.loads(line) for line in [first, *lines] if line.strip())
+        return ClickMetadataSerializer.from_records(records)
+
+    @staticmethod
+    def loads(text: str) -> List[ClickMetadata]:
+        if not ClickMetadataSerializer._is_record(text.partition("\n")[0]):
+            return ClickMetadataSerializer._from_document(json.loads(text))
+        return ClickMetadataSerializer.load(text.splitlines())
+
+    @staticmethod
+    def from_records(records: Iterable[dict]) -> List[ClickMetadata]:
+        """
+        Rebuild metadata from decoded records (pre-order).
+
+        Identical parameters are shared and names interned (see ClickDataPool), subcommands
+        are linked to their parents, so result equals freshly parsed metadata.
+
+        Raises:
+            ValueError: If records are not valid metadata
+        """
+        metadata = []
+        pool = ClickDataPool()
+        # parent path -> (parent node, iterator over registered subcommand names)
+        parents: Dict[tuple, tuple] = {}
+        try:
+            for record in records:
+                data = record["cmd_data"]
+                node = ClickDataCommand(
+                    fnc_name=pool.intern(data["fnc_name"]),
+                    default_cmd_name=pool.intern(data["default_cmd_name"]),
+                    default_if_no_args=data["default_if_no_args"],
+                    fnc_help_short=data["fnc_help_short"],
+                    fnc_help=data["fnc_help"],
+                    fnc_params=[
+                        pool.param(ClickDataParam(**{
+                            **p,
+                            "param_type_click": ClickDataUtils.click_type_from_spec(p["param_type_click"])
+                        }))
+                        for p in data["fnc_params"]
+                    ],
+                )
+
+                cmd_path = [pool.intern(name) for name in record["cmd_path"]]
+                parent = parents.get(tuple(cmd_path[:-1]))
+                if parent is not None:
+                    parent_node, registered_names = parent
+                    parent_node.fnc_subcommands[pool.intern(next(registered_names))] = node
+                parents[tuple(cmd_path)] = (node, iter(data["fnc_subcommands"]))
+
+                metadata.append(ClickMetadata(cmd_base=pool.intern(record["cmd_base"]), cmd_path=cmd_path, cmd_data=node))
+        except (KeyError, TypeError, StopIteration) as e:
+            raise ValueError(f"Invalid metadata record: {e!r}") from e
+        return metadata
+
+    ##############
+    # internal
+    ##############
+    @staticmethod
+    def _is_record(line: str) -> bool:
+        """Line is NDJSON record (not a line of JSON document)."""
+        try:
+            return "cmd_base" in json.loads(line)
+        except (ValueError, TypeError):
+            return False
+
+    @staticmethod
+    def _from_document(document: dict) -> List[ClickMetadata]:
+        if not isinstance(document, dict) or document.get("version") != ClickMetadataSerializer.format_version:
+            raise ValueError("Not a metadata document or unsupported format version")
+        return ClickMetadataSerializer.from_records(document["commands"])
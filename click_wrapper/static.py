@@ -0,0 +1,477 @@
+import ast
+import importlib
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Any, Callable
+
+import click
+from click import Command, Group, types
+
+from click_wrapper.importer import ClickImporter
+
+class ClickStaticUnresolved(Exception):
+    """Raised when expression cannot be evaluated without executing target code"""
+    pass
+
+class _Unresolved:
+    """Namespace value of a name bound by code that was not evaluated"""
+
+    def __repr__(self):
+        return "<unresolved>"
+
+_UNRESOLVED = _Unresolved()
+
+class _StaticModule:
+    """Namespace of statically analyzed module (result of 'import x' / 'from . import x')"""
+
+    def __init__(self, name: str, path: Optional[Path], package: str):
+        self.name = name
+        self.path = path
+        self.package = package
+        self.namespace: Dict[str, Any] = {}
+
+class ClickStaticLoader:
+    """
+    Build Click command tree of target CLI from its source code, without executing it.
+
+    Source files are analyzed with 'ast'. Click decorators (@click.group, @click.command,
+    @click.option, @click.argument, @<group>.command ...) and '<group>.add_command(...)' calls
+    are evaluated with real Click objects, while everything else (target functions, imports
+    of third party packages, plugin hooks ...) is left unresolved.
+
+    Groups touched by code which cannot be evaluated statically (unknown decorators,
+    plugin registration, non-literal arguments ...) are replaced by live objects
+    imported by 'importer', so only those subtrees pay the import cost.
+
+    Examples:
+        >>> importer = ClickImporter('llm', lazy=True)
+        >>> cli = ClickStaticLoader(importer).load()
+    """
+
+    # modules evaluated for real, decorators and types of these do not execute target code
+    trusted_modules = ("click", "click_default_group")
+
+    # only functions of these modules can be called (e.g. not 'click.echo' nor 'click.prompt')
+    callable_modules = ("click.core", "click.decorators", "click.types", "click_default_group")
+
+    # keyword arguments which do not affect metadata, dropped when not resolvable
+    ignored_kwargs = ("callback", "shell_complete", "autocompletion")
+
+    safe_builtins = {
+        "str": str, "int": int, "float": float, "bool": bool,
+        "dict": dict, "list": list, "tuple": tuple, "set": set,
+        "True": True, "False": False, "None": None,
+    }
+
+    def __init__(self, importer: ClickImporter):
+        self.importer = importer
+        self.modules: Dict[str, _StaticModule] = {}
+        self.dynamic: List[Command] = []
+        self.fallbacks: List[str] = []
+
+    ##############
+    # api extra
+    ##############
+    def load(self) -> Command:
+        """Return statically built command tree, with live subtrees where static analysis was not possible."""
+        module = self._analyze(self.importer.py_import_path)
+        root = None
+        if module is not None:
+            root = module.namespace.get(self.importer.py_import_path_attribute)
+
+        if not isinstance(root, Command) or self._is_dynamic(root):
+            self.fallbacks.append(self.importer.py_import_path_attribute)
+            return self.importer.click_obj_cli_main
+
+        # replace dynamic subtrees by live ones (iterative, pre-order)
+        stack = [(root, [])]
+        while stack:
+            group, path = stack.pop()
+            for name, subcommand in list(getattr(group, "commands", {}).items()):
+                sub_path = path + [name]
+                if self._is_dynamic(subcommand):
+                    live = self._live_command(sub_path)
+                    if live is not None:
+                        self.fallbacks.append(" ".join(sub_path))
+                        group.commands[name] = live
+                        continue
+                stack.append((subcommand, sub_path))
+
+        return root
+
+    ##############
+    # internal live fallback
+    ##############
+    def _is_dynamic(self, command_obj: Command) -> bool:
+        return any(command_obj is d for d in self.dynamic)
+
+    def _live_command(self, path: List[str]) -> Optional[Command]:
+        command_obj = self.importer.click_obj_cli_main
+        for name in path:
+            command_obj = getattr(command_obj, "commands", {}).get(name)
+            if command_obj is None:
+                return None
+        return command_obj
+
+    def _mark_dynamic(self, node: ast.AST, namespace: Dict[str, Any]):
+        """Every command referenced by statement which could not be evaluated is considered dynamic."""
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # body is never executed, only decorators can touch existing commands
+            nodes = node.decorator_list
+        else:
+            nodes = [node]
+        for child in (c for n in nodes for c in ast.walk(n)):
+            if isinstance(child, ast.Name):
+                value = namespace.get(child.id)
+                if isinstance(value, Command) and not self._is_dynamic(value):
+                    self.dynamic.append(value)
+
+    ##############
+    # internal modules
+    ##############
+    def _analyze(self, module_name: str) -> Optional[_StaticModule]:
+        """Analyze module (and its parent packages) once, like import would execute it once."""
+        if module_name in self.modules:
+            return self.modules[module_name]
+
+        parent_name = module_name.rpartition(".")[0]
+        if parent_name and self._analyze(parent_name) is None:
+            return None
+
+        path = self._find_source(module_name)
+        if path is None:
+            return None
+
+        module = _StaticModule(module_name, path, module_name if path.name == "__init__.py" else parent_name)
+        # registered before analysis, circular imports see partially filled namespace
+        self.modules[module_name] = module
+        if parent_name:
+            self.modules[parent_name].namespace[module_name.rpartition(".")[2]] = module
+
+        module.namespace["__name__"] = module_name
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        self._exec_body(tree.body, module)
+        return module
+
+    def _find_source(self, module_name: str) -> Optional[Path]:
+        """Locate module source without importing it (nor its parent packages)."""
+        parts = module_name.split(".")
+        if parts[0] != self.importer.py_import_package:
+            # only target package is analyzed, anything else is unresolved
+            return None
+        try:
+            spec = importlib.util.find_spec(parts[0])
+        except (ImportError, ValueError):
+            return None
+        if spec is None:
+            return None
+
+        if not spec.submodule_search_locations:
+            return Path(spec.origin) if len(parts) == 1 and spec.origin and spec.origin.endswith(".py") else None
+
+        locations = [Path(p) for p in spec.submodule_search_locations]
+        path = Path(spec.origin) if spec.origin and spec.origin.endswith(".py") else None
+        for part in parts[1:]:
+            path, next_locations = None, []
+            for location in locations:
+                if (location / part / "__init__.py").exists():
+                    path = location / part / "__init__.py"
+                    next_locations = [location / part]
+                    break
+                if (location / f"{part}.py").exists():
+                    path = location / f"{part}.py"
+                    break
+            if path is None:
+                return None
+            locations = next_locations
+        return path
+
+    def _resolve_module_name(self, module: _StaticModule, name: Optional[str], level: int) -> str:
+        if not level:
+            return name
+        base = module.package.split(".")
+        if level > 1:
+            base = base[:-(level - 1)]
+        return ".".join(base + ([name] if name else []))
+
+    def _import(self, module_name: str) -> Any:
+        if module_name.split(".")[0] in self.trusted_modules:
+            return importlib.import_module(module_name)
+        module = self._analyze(module_name)
+        return module if module is not None else _UNRESOLVED
+
+    ##############
+    # internal statements
+    ##############
+    def _exec_body(self, body: List[ast.stmt], module: _StaticModule):
+        for node in body:
+            try:
+                self._exec_stmt(node, module)
+            except ClickStaticUnresolved:
+                self._mark_dynamic(node, module.namespace)
+                for target in self._bound_names(node):
+                    module.namespace[target] = _UNRESOLVED
+
+    def _exec_stmt(self, node: ast.stmt, module: _StaticModule):
+        namespace = module.namespace
+
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imported = self._import(alias.name)
+                if alias.asname:
+                    namespace[alias.asname] = imported
+                else:
+                    top = alias.name.split(".")[0]
+                    namespace[top] = self._import(top) if imported is not _UNRESOLVED else _UNRESOLVED
+
+        elif isinstance(node, ast.ImportFrom):
+            module_name = self._resolve_module_name(module, node.module, node.level)
+            source = self._import(module_name)
+            for alias in node.names:
+                if alias.name == "*":
+                    continue
+                namespace[alias.asname or alias.name] = self._import_attribute(source, module_name, alias.name)
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            namespace[node.name] = self._exec_function(node, module)
+
+        elif isinstance(node, ast.ClassDef):
+            namespace[node.name] = self._exec_class(node, namespace)
+
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if node.value is None:
+                return
+            value = self._eval(node.value, namespace)
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    raise ClickStaticUnresolved(ast.dump(target))
+                namespace[target.id] = value
+
+        elif isinstance(node, ast.Expr):
+            if isinstance(node.value, ast.Constant):
+                return  # docstring
+            self._eval(node.value, namespace)
+
+        elif isinstance(node, ast.Try):
+            self._exec_body(node.body + node.orelse + node.finalbody, module)
+
+        elif isinstance(node, ast.If) and self._is_main_guard(node):
+            return
+
+        elif isinstance(node, (ast.If, ast.For, ast.While, ast.With, ast.AsyncWith, ast.AsyncFor)):
+            # control flow is not evaluated, anything it touches is unknown
+            raise ClickStaticUnresolved(type(node).__name__)
+
+    def _import_attribute(self, source: Any, module_name: str, name: str) -> Any:
+        if source is _UNRESOLVED:
+            return _UNRESOLVED
+        if isinstance(source, _StaticModule):
+            if name not in source.namespace:
+                # 'from package import submodule'
+                submodule = self._analyze(f"{module_name}.{name}")
+                return submodule if submodule is not None else _UNRESOLVED
+            return source.namespace[name]
+        try:
+            return getattr(source, name)
+        except AttributeError:
+            return _UNRESOLVED
+
+    def _exec_function(self, node: ast.AST, module: _StaticModule) -> Any:
+        if not node.decorator_list:
+            return _UNRESOLVED
+
+        # decorator expressions are evaluated top-down, applied bottom-up
+        decorators = [self._eval(d, module.namespace) for d in node.decorator_list]
+        for decorator in decorators:
+            if not self._is_callable_safe(decorator):
+                raise ClickStaticUnresolved(f"decorator {decorator!r}")
+        obj: Any = self._make_function(node, module)
+        for decorator in reversed(decorators):
+            obj = decorator(obj)
+        return obj
+
+    @staticmethod
+    def _make_function(node: ast.AST, module: _StaticModule) -> Callable:
+        """Stub function with the same name and docstring, compiled from docstring only."""
+        body = []
+        if node.body and isinstance(node.body[0], ast.Expr) and isinstance(node.body[0].value, ast.Constant) \
+                and isinstance(node.body[0].value.value, str):
+            body.append(node.body[0])
+        body.append(ast.Pass())
+        stub = ast.FunctionDef(
+            name=node.name,
+            args=ast.arguments(
+                posonlyargs=[], args=[], vararg=ast.arg(arg="args"), kwonlyargs=[], kw_defaults=[],
+                kwarg=ast.arg(arg="kwargs"), defaults=[]
+            ),
+            body=body,
+            decorator_list=[],
+            returns=None,
+            type_params=[],
+        )
+        code = compile(ast.fix_missing_locations(ast.Module(body=[stub], type_ignores=[])), "<static>", "exec")
+        namespace = {"__name__": module.name}
+        exec(code, namespace)
+        return namespace[node.name]
+
+    def _exec_class(self, node: ast.ClassDef, namespace: Dict[str, Any]) -> Any:
+        """Custom Click types are recreated with their bases and literal class attributes only."""
+        bases = tuple(self._eval(b, namespace) for b in node.bases)
+        if node.keywords or not bases or not all(isinstance(b, type) and issubclass(b, types.ParamType) for b in bases):
+            return _UNRESOLVED
+
+        attributes = {"__module__": namespace["__name__"], "__qualname__": node.name}
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                try:
+                    attributes[stmt.targets[0].id] = self._eval(stmt.value, namespace)
+                except ClickStaticUnresolved:
+                    continue
+        return type(node.name, bases, attributes)
+
+    @staticmethod
+    def _is_main_guard(node: ast.If) -> bool:
+        test = node.test
+        return (
+            isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+        )
+
+    @staticmethod
+    def _bound_names(node: ast.stmt) -> List[str]:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return [node.name]
+        if isinstance(node, ast.Assign):
+            return [n.id for t in node.targets for n in ast.walk(t) if isinstance(n, ast.Name)]
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            return [node.target.id]
+        return []
+
+    ##############
+    # internal expressions
+    ##############
+    def _eval(self, node: ast.expr, namespace: Dict[str, Any]) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        if isinstance(node, ast.Name):
+            if node.id in namespace:
+                value = namespace[node.id]
+            elif node.id in self.safe_builtins:
+                value = self.safe_builtins[node.id]
+            else:
+                raise ClickStaticUnresolved(node.id)
+            if value is _UNRESOLVED:
+                raise ClickStaticUnresolved(node.id)
+            return value
+
+        if isinstance(node, ast.Attribute):
+            return self._eval_attribute(self._eval(node.value, namespace), node.attr)
+
+        if isinstance(node, ast.Call):
+            return self._eval_call(node, namespace)
+
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            if any(isinstance(e, ast.Starred) for e in node.elts):
+                raise ClickStaticUnresolved("starred")
+            values = [self._eval(e, namespace) for e in node.elts]
+            return {ast.Tuple: tuple, ast.List: list, ast.Set: set}[type(node)](values)
+
+        if isinstance(node, ast.Dict):
+            if any(k is None for k in node.keys):
+                raise ClickStaticUnresolved("dict unpacking")
+            return {self._eval(k, namespace): self._eval(v, namespace) for k, v in zip(node.keys, node.values)}
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Not)):
+            operand = self._eval(node.operand, namespace)
+            if isinstance(node.op, ast.Not):
+                return not operand
+            if not isinstance(operand, (int, float)):
+                raise ClickStaticUnresolved("unary operand")
+            return -operand if isinstance(node.op, ast.USub) else operand
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mult, ast.Sub, ast.Mod)):
+            left, right = self._eval(node.left, namespace), self._eval(node.right, namespace)
+            literal = (str, int, float, tuple, list)
+            if not (isinstance(left, literal) and isinstance(right, literal + (dict,))):
+                raise ClickStaticUnresolved("binary operand")
+            if isinstance(node.op, ast.Add):
+                return left + right
+            if isinstance(node.op, ast.Sub):
+                return left - right
+            if isinstance(node.op, ast.Mod):
+                return left % right
+            return left * right
+
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.FormattedValue):
+                    resolved = self._eval(value.value, namespace)
+                    if not isinstance(resolved, (str, int, float)) or value.conversion != -1 or value.format_spec:
+                        raise ClickStaticUnresolved("formatted value")
+                    parts.append(str(resolved))
+                else:
+                    parts.append(value.value)
+            return "".join(parts)
+
+        raise ClickStaticUnresolved(type(node).__name__)
+
+    def _eval_attribute(self, value: Any, attr: str) -> Any:
+        if isinstance(value, _StaticModule):
+            if attr not in value.namespace or value.namespace[attr] is _UNRESOLVED:
+                raise ClickStaticUnresolved(f"{value.name}.{attr}")
+            return value.namespace[attr]
+        if isinstance(value, Command):
+            # registration only, e.g. 'cli.main' must never be reachable
+            if isinstance(value, Group) and attr in ("command", "group", "add_command"):
+                return getattr(value, attr)
+            raise ClickStaticUnresolved(attr)
+        if self._is_trusted(value):
+            try:
+                return getattr(value, attr)
+            except AttributeError as e:
+                raise ClickStaticUnresolved(attr) from e
+        raise ClickStaticUnresolved(attr)
+
+    def _eval_call(self, node: ast.Call, namespace: Dict[str, Any]) -> Any:
+        func = self._eval(node.func, namespace)
+        if not self._is_callable_safe(func):
+            raise ClickStaticUnresolved(getattr(func, "__name__", repr(func)))
+
+        if any(isinstance(a, ast.Starred) for a in node.args):
+            raise ClickStaticUnresolved("starred arguments")
+        args = [self._eval(a, namespace) for a in node.args]
+
+        kwargs = {}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise ClickStaticUnresolved("keyword unpacking")
+            try:
+                kwargs[keyword.arg] = self._eval(keyword.value, namespace)
+            except ClickStaticUnresolved:
+                if keyword.arg not in self.ignored_kwargs:
+                    raise
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            raise ClickStaticUnresolved(str(e)) from e
+
+    def _is_trusted(self, value: Any) -> bool:
+        module_name = getattr(value, "__name__", None) if isinstance(value, ModuleType) \
+            else getattr(value, "__module__", None)
+        return isinstance(module_name, str) and module_name.split(".")[0] in self.trusted_modules
+
+    def _is_callable_safe(self, func: Any) -> bool:
+        if isinstance(func, (Command, click.Parameter, types.ParamType, click.Context)):
+            # calling command instance would run the CLI
+            return False
+        if isinstance(func, type):
+            # includes custom types recreated by '_exec_class' (their __init__ is inherited from Click)
+            return issubclass(func, (types.ParamType, click.Parameter, Command)) or \
+                func in (str, int, float, bool, dict, list, tuple, set)
+        if isinstance(getattr(func, "__self__", None), Group):
+            return func.__name__ in ("command", "group", "add_command")
+        module_name = getattr(func, "__module__", None) or ""
+        return module_name in self.callable_modules or module_name.split(".")[0] in self.callable_modules
@@ -1,4 +1,4 @@
-from typing import Dict, Union, List, Tuple, Any, Optional
+from typing import Dict, Union, List, Tuple, Any, Optional, Iterator, Iterable
 import inspect
 from pathlib import Path
 
@@ -7,63 +7,230 @@ from click_wrapper import (
     ClickParser,
     ClickImporter,
     ClickDataParam,
+    ClickMetadataCache,
 )
 
 class ClickWrapper:
     """Generates wrapper code for Click CLI commands."""
 
-    def __init__(self, importer: ClickImporter):
-        self.parser = ClickParser.factory(importer)
+    # optional cmd_<command>_<feature> methods, generated next to cmd_<command> on request
+    features_all: Tuple[str, ...] = ("stream", "output", "many", "direct")
+
+    def __init__(
+            self,
+            importer: ClickImporter,
+            cache: Optional[ClickMetadataCache] = None,
+            static: bool = False,
+            command_path: Optional[List[str]] = None,
+            async_mode: bool = False,
+            compiled: bool = False,
+            features: Optional[Iterable[str]] = None,
+            import_runtime: bool = False
+    ):
+        unknown = set(features or ()) - set(self.features_all)
+        if unknown:
+            raise ValueError(
+                f"Unknown wrapper feature(s) {', '.join(sorted(unknown))}, expected {', '.join(self.features_all)}"
+            )
+
+        self.parser = ClickParser.factory(importer, cache, static, command_path)
         self.indent = "    "
+        # additionally generate asyncio client class
+        self.async_mode = async_mode
+        # slotted option dataclasses, argv built by single table driven encoder
+        self.compiled = compiled
+        # additional method variants of every command, in order of 'features_all'
+        self.features: Tuple[str, ...] = tuple(f for f in self.features_all if f in set(features or ()))
+        # importer runtime imported from installed click_wrapper instead of copied into generated code
+        self.import_runtime = import_runtime
 
     ##############
     # api extra
     ##############
     def generate(self) -> str:
         """Generate complete wrapper code including imports, dataclasses, and methods."""
-        parts = [
-            self._generate_imports(),
-            self._generate_base_class(),
-            self._generate_dataclasses(),
-            self._generate_wrapper_class(),
-        ]
-        return "\n\n".join(parts)
+        return "".join(self.generate_chunks())
+
+    def generate_chunks(self) -> Iterator[str]:
+        """
+        Generate wrapper code piece by piece (one chunk per command).
+
+        Joined chunks are equal to 'generate()', only one command is kept in memory at a time.
+        """
+        for _, chunk in self.generate_sections():
+            yield chunk
+
+    def generate_sections(self) -> Iterator[Tuple[str, str]]:
+        """
+        Same as 'generate_chunks', chunks are paired with the command they belong to.
+
+        Imports, base class and class headers shared by all commands belong to section "".
+        """
+        yield "", self._generate_imports()
+        yield "", "\n\n"
+        yield "", self._generate_base_class()
+        yield "", "\n\n"
+        for i, (name, dataclass_code) in enumerate(self._iter_dataclasses()):
+            yield name, "\n\n" + dataclass_code if i else dataclass_code
+        yield "", "\n\n"
+        yield from self._iter_wrapper_class()
+        if self.async_mode:
+            yield "", "\n\n"
+            yield from self._iter_async_wrapper_class()
+
+    def generate_package(self) -> Iterator[Tuple[str, Iterator[Tuple[str, str]]]]:
+        """
+        Generate wrapper split to package modules, (file name, sections) for each module.
+
+        '_base.py' holds importer base class, every top-level group gets its own module
+        ('_root.py' for leaf commands of root) with its option dataclasses and command
+        methods. '__init__.py' holds wrapper class(es), command methods are bound from
+        group modules on first access, option dataclasses are imported by module
+        '__getattr__', so only groups actually used are ever imported.
+        """
+        modules = self._package_modules()
+        yield "_base.py", iter([("", f"{self._generate_imports()}\n\n{self._generate_base_class()}\n")])
+        yield "__init__.py", self._iter_package_init(modules)
+        for module, names in modules.items():
+            yield f"{module}.py", self._iter_package_module(names)
 
     ##############
     # internal imports
     ##############
     def _generate_imports(self) -> str:
         """Generate import statements."""
-        return '\n'.join([
+        lines = [
             "from typing import Tuple",
             "from dataclasses import dataclass"
-        ])
+        ]
+        if self.async_mode:
+            lines.extend([
+                "import asyncio",
+                "import functools",
+                "from concurrent.futures import Executor",
+                "from typing import Any, Awaitable, Callable, Iterable",
+            ])
+        return '\n'.join(lines)
 
     ##############
     # internal base class (importer + runner)
     ##############
     def _generate_base_class(self) -> str:
-        """Generate base exception class."""
-        module = inspect.getmodule(ClickImporter)
-        source = inspect.getsource(module)
-        return source.replace(ClickImporter.__name__, self._get_class_base_name())
+        """Generate importer base classes, copied from click_wrapper (imported when import_runtime)."""
+        if not self.import_runtime:
+            module = inspect.getmodule(ClickImporter)
+            source = inspect.getsource(module)
+            return source.replace(ClickImporter.__name__, self._get_class_base_name())
+
+        return "\n".join([
+            "from typing import Any, Iterable, List, Optional, Union",
+            "",
+            f"from {ClickImporter.__module__} import (",
+            *[
+                f"{self.indent}{ClickImporter.__name__}{suffix} as {self._get_class_base_name()}{suffix},"
+                for suffix in ("", "Error", "Output", "Result", "Stream")
+            ],
+            ")",
+            "",
+        ])
+
+    ##############
+    # internal encoder (compiled mode)
+    ##############
+    def _argv_encoding_table(
+            self,
+            cmd_data: ClickDataCommand
+    ) -> List[Tuple[str, str, str, str, Optional[str], Optional[str]]]:
+        """
+        Precompute how each parameter is encoded to command line arguments.
+
+        Returns:
+            List of (parameter name, field name, kind, flag, secondary flag, default literal)
+            in parameter order, default literal is None for mandatory parameters
+        """
+        table = []
+        for param in cmd_data.fnc_params:
+            if param.param_type_is_argument:
+                kind = "arguments" if param.multiple or param.nargs != 1 else "argument"
+            elif param.is_flag:
+                kind = "flag"
+            elif param.multiple:
+                kind = "option_multiple_nargs" if param.nargs != 1 else "option_multiple"
+            elif param.nargs != 1:
+                kind = "option_nargs"
+            else:
+                kind = "option"
+            table.append((
+                param.name,
+                self._sanitize_field_name(param.name),
+                kind,
+                self._get_option_flag(param),
+                param.secondary_opts[0] if param.secondary_opts else None,
+                None if param.is_mandatory_python() else param.as_string_default_value(),
+            ))
+        return table
+
+    def _generate_argv_encoder(self, cmd_data: ClickDataCommand) -> List[str]:
+        """Generate straight-line encoder of options dataclass, fields at their default are skipped."""
+        i2, i3 = self.indent * 2, self.indent * 3
+        lines = []
+        for _, field_name, kind, flag, secondary, default in self._argv_encoding_table(cmd_data):
+            if kind == "flag" and not secondary and default in ("None", "False"):
+                lines += [f"{i2}if opts.{field_name}:", f"{i3}args.append({flag!r})"]
+                continue
+
+            if default is None:
+                # mandatory, always encoded
+                lines.append(f"{i2}value = opts.{field_name}")
+                body = i2
+            elif kind in ("arguments", "option_multiple", "option_multiple_nargs"):
+                # empty sequence encodes nothing, same as default None
+                lines.append(f"{i2}if value := opts.{field_name}:")
+                body = i3
+            elif default == "None":
+                lines.append(f"{i2}if (value := opts.{field_name}) is not None:")
+                body = i3
+            else:
+                lines.append(f"{i2}if (value := opts.{field_name}) != {default}:")
+                body = i3
+
+            if kind == "arguments":
+                lines.append(f"{body}args.extend(map(str, value))")
+            elif kind in ("option_multiple", "option_multiple_nargs"):
+                lines.append(f"{body}for item in value:")
+                lines.append(f"{body}{self.indent}args.append({flag!r})")
+                lines.append(
+                    f"{body}{self.indent}args.extend(map(str, item))" if kind == "option_multiple_nargs" else
+                    f"{body}{self.indent}args.append(str(item))"
+                )
+            elif kind == "flag" and secondary:
+                lines.append(f"{body}args.append({flag!r} if value else {secondary!r})")
+            elif kind == "flag":
+                lines += [f"{body}if value:", f"{body}{self.indent}args.append({flag!r})"]
+            elif kind == "argument":
+                lines.append(f"{body}args.append(str(value))")
+            elif kind == "option_nargs":
+                lines += [f"{body}args.append({flag!r})", f"{body}args.extend(map(str, value))"]
+            else:
+                lines += [f"{body}args.append({flag!r})", f"{body}args.append(str(value))"]
+        return lines
 
     ##############
     # internal dataclass (input parameters)
     ##############
     def _generate_dataclasses(self) -> str:
         """Generate dataclasses for all leaf commands."""
-        dataclasses = []
+        return "\n\n".join(code for _, code in self._iter_dataclasses())
+
+    def _iter_dataclasses(self) -> Iterator[Tuple[str, str]]:
         for name, metadata in self.parser.commands_map.items():
             if metadata.is_leaf:
-                dataclass_code = self._generate_dataclass(name, metadata.cmd_data)
-                dataclasses.append(dataclass_code)
-        return "\n\n".join(dataclasses)
+                yield name, self._generate_dataclass(name, metadata.cmd_data)
 
     def _generate_dataclass(self, cmd_name: str, cmd_data: ClickDataCommand) -> str:
         """Generate a dataclass for a specific command."""
         lines = [
-            "@dataclass",
+            "@dataclass(slots=True)" if self.compiled else "@dataclass",
             f"class {self._get_dataclass_name(cmd_name)}:",
             *cmd_data.to_help_string_lines(indent=self.indent, no_help_msg=f"Options for '{cmd_name}' command")
         ]
@@ -107,6 +274,19 @@ class ClickWrapper:
     ##############
     def _generate_wrapper_class(self) -> str:
         """Generate the main wrapper class with all command methods."""
+        return "".join(chunk for _, chunk in self._iter_wrapper_class())
+
+    def _iter_wrapper_class(self) -> Iterator[Tuple[str, str]]:
+        yield "", "\n".join(self._generate_wrapper_class_header())
+
+        # Generate methods for all leaf commands
+        for name, metadata in self.parser.commands_map.items():
+            if metadata.is_leaf:
+                method_lines = self._generate_wrapper_method(name, metadata.cmd_data)
+                yield name, "\n" + "\n".join(["", *method_lines])
+
+    def _generate_wrapper_class_header(self) -> List[str]:
+        """Generate wrapper class statement, constructor and version method."""
         lines = [
             f"class {self._get_class_wrapper_name()}({self._get_class_base_name()}):",
             f'{self.indent}"""',
@@ -114,34 +294,34 @@ class ClickWrapper:
             f"{self.indent}allowing you to execute CLI commands programmatically without subprocess overhead.",
             f'{self.indent}"""',
             "",
-            f"{self.indent}def __init__(self):",
+            f"{self.indent}def __init__(self, engine: str = 'runner', lazy: bool = True, **engine_options):",
             f'{self.indent}{self.indent}"""',
             f"{self.indent}{self.indent}Initialize the ClickWrapper.",
             f"{self.indent}{self.indent}",
+            f"{self.indent}{self.indent}Args:",
+            f"{self.indent}{self.indent}    engine: 'runner' (CliRunner, default), 'threads' (in-process, thread-safe) or 'pool' (worker processes)",
+            f"{self.indent}{self.indent}    lazy: Import target on first command (construction costs nothing), see 'preload'",
+            f"{self.indent}{self.indent}    engine_options: 'pool' engine options (workers, max_calls_per_worker, max_memory_mb)",
+            f"{self.indent}{self.indent}",
             f"{self.indent}{self.indent}Raises:",
-            f"{self.indent}{self.indent}    ImportError: If the module cannot be imported",
+            f"{self.indent}{self.indent}    ImportError: If the module cannot be imported (here when not lazy, else on first command)",
             f"{self.indent}{self.indent}    AttributeError: If the specified attribute doesn't exist in the module",
             f'{self.indent}{self.indent}"""',
             f"{self.indent}{self.indent}super().__init__(",
             f"{self.indent}{self.indent}{self.indent}py_import_path='{self.parser.script_string_import_path}',",
-            f"{self.indent}{self.indent}{self.indent}py_import_path_attribute='{self.parser.script_string_import_attribute}'",
+            f"{self.indent}{self.indent}{self.indent}py_import_path_attribute='{self.parser.script_string_import_attribute}',",
+            f"{self.indent}{self.indent}{self.indent}lazy=lazy,",
+            f"{self.indent}{self.indent}{self.indent}engine=engine,",
+            f"{self.indent}{self.indent}{self.indent}**engine_options",
             f"{self.indent}{self.indent})",
             ""
         ]
 
         # Generate method for version
-        for name, metadata in self.parser.commands_map.items():
-            if name == metadata.cmd_base and ('version' in metadata.cmd_data.fnc_dbg_params):
-                lines.extend(self._generate_wrapper_version())
-
-        # Generate methods for all leaf commands
-        for name, metadata in self.parser.commands_map.items():
-            if metadata.is_leaf:
-                method_lines = self._generate_wrapper_method(name, metadata.cmd_data)
-                lines.append("")
-                lines.extend(method_lines)
-
-        return "\n".join(lines)
+        root = self.parser.index.get([])
+        if root is not None and ('version' in root.cmd_data.fnc_dbg_params):
+            lines.extend(self._generate_wrapper_version())
+        return lines
 
     def _generate_wrapper_version(self, cmd_name: str = "version") -> List[str]:
         """Generate a wrapper version command."""
@@ -157,23 +337,201 @@ class ClickWrapper:
         return lines
 
     def _generate_wrapper_method(self, cmd_name: str, cmd_data: ClickDataCommand) -> List[str]:
-        """Generate a wrapper method for a specific command."""
+        """Generate argument builder and wrapper methods (cmd_* and requested features) for a specific command."""
         method_name = self._get_method_name(cmd_name)
-        class_name = self._get_dataclass_name(cmd_name)
-        cmd_path = cmd_name.split()
 
         lines = [
             f"{self.indent}# {'=' * 10} {cmd_name.upper()} COMMAND {'=' * 10}",
             "",
+            *self._generate_argv_builder(cmd_name, cmd_data),
+            "",
+            *self._generate_method_signature(cmd_name, cmd_data, f"cmd_{method_name}", "str"),
+            *self._generate_method_doc(cmd_name, cmd_data, "Command output"),
+            f"{self.indent}{self.indent}return self.run_command(self._argv_{method_name}(opts), input=stdin_input)",
+        ]
+        if "stream" in self.features:
+            lines += [
+                "",
+                *self._generate_method_signature(
+                    cmd_name, cmd_data, f"cmd_{method_name}_stream", self._get_class_stream_name(), "lines: bool = False"
+                ),
+                *self._generate_method_doc(
+                    cmd_name, cmd_data, "Iterable of output chunks yielded while command runs",
+                    ["lines: Yield complete lines instead of chunks as written"]
+                ),
+                (
+                    f"{self.indent}{self.indent}return self.run_command_stream("
+                    f"self._argv_{method_name}(opts), input=stdin_input, lines=lines)"
+                ),
+            ]
+        if "output" in self.features:
+            lines += [
+                "",
+                *self._generate_method_signature(
+                    cmd_name, cmd_data, f"cmd_{method_name}_output", self._get_class_output_name(),
+                    "spool_threshold: Optional[int] = None"
+                ),
+                *self._generate_method_doc(
+                    cmd_name, cmd_data, "Captured output (bytes, zero-copy view, lazily decoded text)",
+                    ["spool_threshold: Output larger than this (bytes) is spooled to a temporary file"]
+                ),
+                (
+                    f"{self.indent}{self.indent}return self.run_command_output("
+                    f"self._argv_{method_name}(opts), input=stdin_input, spool_threshold=spool_threshold)"
+                ),
+            ]
+        if "many" in self.features:
+            lines += ["", *self._generate_many_method(cmd_name, cmd_data)]
+        if "direct" in self.features:
+            lines += [
+                "",
+                *self._generate_params_builder(cmd_name, cmd_data),
+                "",
+                *self._generate_method_signature(cmd_name, cmd_data, f"cmd_{method_name}_direct", "str"),
+                *self._generate_method_doc(
+                    cmd_name, cmd_data, "Command output (callback called with typed values, no argv parsing)"
+                ),
+                (
+                    f"{self.indent}{self.indent}return self.run_command_direct("
+                    f"{cmd_name.split()}, self._params_{method_name}(opts), input=stdin_input)"
+                ),
+            ]
+        return lines
+
+    def _generate_many_method(self, cmd_name: str, cmd_data: ClickDataCommand) -> List[str]:
+        """Generate batch method running command once per options dataclass."""
+        method_name = self._get_method_name(cmd_name)
+        class_name = self._get_dataclass_name(cmd_name)
+        opts_type = f"Optional[{class_name}]" if not cmd_data.has_mandatory else class_name
+        i1, i2 = self.indent, self.indent * 2
+
+        return [
+            (
+                f"{i1}def cmd_{method_name}_many(self, opts_list: Iterable[{opts_type}], "
+                f"max_workers: Optional[int] = None, stop_on_error: bool = False) -> List[{self._get_class_result_name()}]:"
+            ),
+            f'{i2}"""',
+            f"{i2}Execute '{cmd_name}' command once for each options dataclass, failures are reported in results.",
+            f"{i2}",
+            f"{i2}Args:",
+            f"{i2}    opts_list: {class_name} dataclasses",
+            f"{i2}    max_workers: Number of commands running at the same time",
+            f"{i2}    stop_on_error: Do not start further commands after first failure",
+            f"{i2}",
+            f"{i2}Returns:",
+            f"{i2}    Results (exit code, output, duration) in order of opts_list",
+            f'{i2}"""',
+            f"{i2}return self.run_many(",
+            f"{i2}{i1}[self._argv_{method_name}(opts) for opts in opts_list], max_workers=max_workers, stop_on_error=stop_on_error",
+            f"{i2})",
+        ]
+
+    def _generate_params_builder(self, cmd_name: str, cmd_data: ClickDataCommand) -> List[str]:
+        """Generate method collecting typed parameter values set in options dataclass (direct mode)."""
+        method_name = self._get_method_name(cmd_name)
+        class_name = self._get_dataclass_name(cmd_name)
+        i2, i3 = self.indent * 2, self.indent * 3
+
+        lines = [
             (
-                f"{self.indent}def cmd_{method_name}(self, opts: Optional[{class_name}] = None, stdin_input: Optional[str] = None) -> str:"
+                f"{self.indent}def _params_{method_name}(self, opts: Optional[{class_name}] = None) -> dict:"
                 if not cmd_data.has_mandatory else
-                f"{self.indent}def cmd_{method_name}(self, opts: {class_name}, stdin_input: Optional[str] = None) -> str:"
+                f"{self.indent}def _params_{method_name}(self, opts: {class_name}) -> dict:"
             ),
+            f"{i2}params = {{}}",
+            f"{i2}if opts is None:" if not cmd_data.has_mandatory else None,
+            f"{i3}return params" if not cmd_data.has_mandatory else None,
+        ]
+        # fields at their default are left to Click (defaults, environment variables, conversions)
+        for param_name, field_name, kind, _, _, default in self._argv_encoding_table(cmd_data):
+            # Click passes nargs / multiple values as tuples
+            sequence = kind in ("arguments", "option_nargs", "option_multiple", "option_multiple_nargs")
+            if default is None:
+                field = f"opts.{field_name}"
+                lines.append(f"{i2}params[{param_name!r}] = {f'tuple({field})' if sequence else field}")
+                continue
+            if kind in ("arguments", "option_multiple", "option_multiple_nargs"):
+                lines.append(f"{i2}if value := opts.{field_name}:")
+            elif default == "None":
+                lines.append(f"{i2}if (value := opts.{field_name}) is not None:")
+            else:
+                lines.append(f"{i2}if (value := opts.{field_name}) != {default}:")
+            lines.append(f"{i3}params[{param_name!r}] = {'tuple(value)' if sequence else 'value'}")
+        lines.append(f"{i2}return params")
+        return [l for l in lines if l is not None]
+
+    def _generate_argv_builder(self, cmd_name: str, cmd_data: ClickDataCommand) -> List[str]:
+        """Generate method building command line arguments from options dataclass."""
+        method_name = self._get_method_name(cmd_name)
+        class_name = self._get_dataclass_name(cmd_name)
+        cmd_path = cmd_name.split()
+
+        if self.compiled:
+            lines = [
+                (
+                    f"{self.indent}def _argv_{method_name}(self, opts: Optional[{class_name}] = None) -> List[str]:"
+                    if not cmd_data.has_mandatory else
+                    f"{self.indent}def _argv_{method_name}(self, opts: {class_name}) -> List[str]:"
+                ),
+                f"{self.indent}{self.indent}args = {cmd_path}",
+                # no options, nothing to encode (dataclass is not even instantiated)
+                f"{self.indent}{self.indent}if opts is None:" if not cmd_data.has_mandatory else None,
+                f"{self.indent}{self.indent}{self.indent}return args" if not cmd_data.has_mandatory else None,
+                *self._generate_argv_encoder(cmd_data),
+                f"{self.indent}{self.indent}return args",
+            ]
+            return [l for l in lines if l is not None]
+
+        lines = [
+            (
+                f"{self.indent}def _argv_{method_name}(self, opts: Optional[{class_name}] = None) -> List[str]:"
+                if not cmd_data.has_mandatory else
+                f"{self.indent}def _argv_{method_name}(self, opts: {class_name}) -> List[str]:"
+            ),
+            f"{self.indent}{self.indent}if opts is None:" if not cmd_data.has_mandatory else None,
+            f"{self.indent}{self.indent}{self.indent}opts = {class_name}()" if not cmd_data.has_mandatory else None,
+            f"{self.indent}{self.indent}",
+            f"{self.indent}{self.indent}args = {cmd_path}",
+            f"{self.indent}{self.indent}",
+        ]
+
+        # Generate argument building logic
+        arg_building = self._generate_arg_building(cmd_data)
+        lines.extend(arg_building)
+
+        lines.append(f"{self.indent}{self.indent}return args")
+
+        return [l for l in lines if l is not None]
+
+    def _generate_method_signature(
+            self,
+            cmd_name: str,
+            cmd_data: ClickDataCommand,
+            method: str,
+            returns: str,
+            *extra_params: str,
+            prefix: str = "def"
+    ) -> List[str]:
+        """Generate 'def' line of a method taking options dataclass and stdin input."""
+        class_name = self._get_dataclass_name(cmd_name)
+        opts = f"opts: Optional[{class_name}] = None" if not cmd_data.has_mandatory else f"opts: {class_name}"
+        params = ", ".join(["self", opts, "stdin_input: Optional[str] = None", *extra_params])
+        return [f"{self.indent}{prefix} {method}({params}) -> {returns}:"]
+
+    def _generate_method_doc(
+            self,
+            cmd_name: str,
+            cmd_data: ClickDataCommand,
+            returns: str,
+            extra_args: Optional[List[str]] = None
+    ) -> List[str]:
+        """Generate docstring of a method taking options dataclass and stdin input."""
+        class_name = self._get_dataclass_name(cmd_name)
+        return [
             f'{self.indent}{self.indent}"""',
             *cmd_data.to_help_string_lines(
                 indent=self.indent + self.indent,
-                no_help_msg=f'Execute {cmd_name} command', 
+                no_help_msg=f'Execute {cmd_name} command',
                 use_borders=False
             ),
             f"{self.indent}{self.indent}",
@@ -184,24 +542,234 @@ class ClickWrapper:
                 f"{self.indent}{self.indent}    opts: {class_name} dataclass"
             ),
             f"{self.indent}{self.indent}    stdin_input: Optional stdin input",
+            *[f"{self.indent}{self.indent}    {arg}" for arg in extra_args or []],
             f"{self.indent}{self.indent}",
             f"{self.indent}{self.indent}Returns:",
-            f"{self.indent}{self.indent}    Command output",
+            f"{self.indent}{self.indent}    {returns}",
             f'{self.indent}{self.indent}"""',
-            f"{self.indent}{self.indent}if opts is None:" if not cmd_data.has_mandatory else None,
-            f"{self.indent}{self.indent}{self.indent}opts = {class_name}()" if not cmd_data.has_mandatory else None,
-            f"{self.indent}{self.indent}",
-            f"{self.indent}{self.indent}args = {cmd_path}",
-            f"{self.indent}{self.indent}",
         ]
 
-        # Generate argument building logic
-        arg_building = self._generate_arg_building(cmd_data)
-        lines.extend(arg_building)
+    ##############
+    # internal package (split output)
+    ##############
+    def _package_modules(self) -> Dict[str, List[str]]:
+        """Leaf command names by module of their top-level group."""
+        modules: Dict[str, List[str]] = {}
+        for name, metadata in self.parser.commands_map.items():
+            if metadata.is_leaf:
+                parts = name.split()
+                module = self._get_method_name(parts[0]) if len(parts) > 1 else "_root"
+                modules.setdefault(module, []).append(name)
+        return modules
+
+    def _generate_package_imports(self) -> str:
+        """Imports of split package modules, base classes come from '_base'."""
+        return "\n".join([
+            self._generate_imports(),
+            "from typing import Any, Iterable, List, Optional, Union",
+            f"from ._base import (",
+            *[
+                f"{self.indent}{name},"
+                for name in (
+                    self._get_class_base_name(),
+                    f"{self._get_class_base_name()}Error",
+                    self._get_class_stream_name(),
+                    self._get_class_output_name(),
+                    self._get_class_result_name(),
+                )
+            ],
+            ")",
+        ])
 
-        lines.append(f"{self.indent}{self.indent}return self.run_command(args, input=stdin_input)")
+    def _iter_package_init(self, modules: Dict[str, List[str]]) -> Iterator[Tuple[str, str]]:
+        i1, i2, i3 = self.indent, self.indent * 2, self.indent * 3
+        commands = {
+            self._get_method_name(name): module for module, names in modules.items() for name in names
+        }
+        dataclasses = {
+            self._get_dataclass_name(name): module for module, names in modules.items() for name in names
+        }
+        yield "", "\n".join([
+            self._generate_package_imports(),
+            "import importlib",
+            "",
+            "# command (method name) -> module with its methods and options dataclass",
+            "_COMMAND_MODULES = {",
+            *[f"{i1}{key!r}: {module!r}," for key, module in commands.items()],
+            "}",
+            "_DATACLASS_MODULES = {",
+            *[f"{i1}{key!r}: {module!r}," for key, module in dataclasses.items()],
+            "}",
+            "",
+            "def _command_module(name: str) -> Optional[str]:",
+            f"{i1}for prefix in ('cmd_', '_argv_', '_params_'):",
+            f"{i2}if name.startswith(prefix):",
+            f"{i3}key = name[len(prefix):]",
+            f"{i3}for suffix in {('', *(f'_{feature}' for feature in self.features))!r}:",
+            f"{i3}{i1}if key.endswith(suffix) and key[:len(key) - len(suffix)] in _COMMAND_MODULES:",
+            f"{i3}{i2}return _COMMAND_MODULES[key[:len(key) - len(suffix)]]",
+            f"{i1}return None",
+            "",
+            "def _bind_methods(cls: type, name: str, methods_class: str) -> Any:",
+            f'{i1}"""Copy methods of group module to \'cls\' on first access of any of them, returns method \'name\'."""',
+            f"{i1}module = _command_module(name)",
+            f"{i1}if module is not None:",
+            f"{i2}methods = getattr(importlib.import_module(f'{{__name__}}.{{module}}'), methods_class)",
+            f"{i2}for key, value in vars(methods).items():",
+            f"{i3}if not key.startswith('__'):",
+            f"{i3}{i1}setattr(cls, key, value)",
+            f"{i2}if name in vars(methods):",
+            f"{i3}return getattr(cls, name)",
+            f"{i1}raise AttributeError(f\"'{{cls.__name__}}' object has no attribute '{{name}}'\")",
+            "",
+            "def __getattr__(name: str) -> Any:",
+            f'{i1}"""Option dataclasses are imported from module of their group on first access."""',
+            f"{i1}module = _DATACLASS_MODULES.get(name)",
+            f"{i1}if module is None:",
+            f"{i2}raise AttributeError(f\"module '{{__name__}}' has no attribute '{{name}}'\")",
+            f"{i1}return getattr(importlib.import_module(f'{{__name__}}.{{module}}'), name)",
+            "",
+            "",
+        ])
+        yield "", "\n".join([
+            *self._generate_wrapper_class_header(),
+            "",
+            f"{i1}def __getattr__(self, name: str) -> Any:",
+            f"{i2}# command methods are bound from module of their group on first access",
+            f"{i2}return _bind_methods(type(self), name, 'Commands').__get__(self)",
+            "",
+        ])
+        if self.async_mode:
+            yield "", "\n\n" + "\n".join([
+                *self._generate_async_wrapper_class_header(),
+                "",
+                f"{i1}def __getattr__(self, name: str) -> Any:",
+                f"{i2}# command coroutines are bound from module of their group on first access",
+                f"{i2}return _bind_methods(type(self), name, 'AsyncCommands').__get__(self)",
+                "",
+            ])
+
+    def _iter_package_module(self, names: List[str]) -> Iterator[Tuple[str, str]]:
+        commands_map = self.parser.commands_map
+        yield "", self._generate_package_imports() + "\n\n"
+        for name in names:
+            yield name, self._generate_dataclass(name, commands_map[name].cmd_data) + "\n\n"
+        yield "", "\n".join([
+            "class Commands:",
+            f'{self.indent}"""Methods of {self._get_class_wrapper_name()}, bound to it on first use."""',
+        ])
+        for name in names:
+            yield name, "\n" + "\n".join(["", *self._generate_wrapper_method(name, commands_map[name].cmd_data)])
+        if self.async_mode:
+            yield "", "\n\n\n" + "\n".join([
+                "class AsyncCommands:",
+                f'{self.indent}"""Coroutines of {self._get_class_async_wrapper_name()}, bound to it on first use."""',
+            ])
+            for name in names:
+                yield name, "\n" + "\n".join(["", *self._generate_async_method(name, commands_map[name].cmd_data)])
+        yield "", "\n"
 
-        return [l for l in lines if l is not None]
+    ##############
+    # internal class (async wrapper with commands)
+    ##############
+    def _iter_async_wrapper_class(self) -> Iterator[Tuple[str, str]]:
+        yield "", "\n".join(self._generate_async_wrapper_class_header())
+
+        for name, metadata in self.parser.commands_map.items():
+            if metadata.is_leaf:
+                method_lines = self._generate_async_method(name, metadata.cmd_data)
+                yield name, "\n" + "\n".join(["", *method_lines])
+
+    def _generate_async_wrapper_class_header(self) -> List[str]:
+        """Generate async wrapper class statement, constructor, helpers and version coroutine."""
+        i1, i2, i3 = self.indent, self.indent * 2, self.indent * 3
+        sync_name = self._get_class_wrapper_name()
+        lines = [
+            f"class {self._get_class_async_wrapper_name()}:",
+            f'{i1}"""',
+            f"{i1}Asyncio interface to the '{self.parser.script_string_package}' command-line tool.",
+            f"{i1}",
+            f"{i1}Every cmd_* method is a coroutine running the blocking {sync_name} method in an executor,",
+            f"{i1}so the event loop is never blocked. Number of commands running at the same time is bounded",
+            f"{i1}by per-instance semaphore.",
+            f'{i1}"""',
+            "",
+            f"{i1}def __init__(self, executor: Optional[Executor] = None, concurrency: int = 1, **wrapper_options):",
+            f'{i2}"""',
+            f"{i2}Initialize the async wrapper.",
+            f"{i2}",
+            f"{i2}Args:",
+            f"{i2}    executor: Executor running the commands (event loop default executor if None)",
+            f"{i2}    concurrency: Maximum number of commands running at the same time (more than 1 needs",
+            f"{i2}        'threads' or 'pool' engine)",
+            f"{i2}    wrapper_options: {sync_name} options (engine, lazy, engine options)",
+            f"{i2}",
+            f"{i2}Raises:",
+            f"{i2}    ImportError: If the module cannot be imported (here when not lazy, else on first command)",
+            f"{i2}    AttributeError: If the specified attribute doesn't exist in the module",
+            f'{i2}"""',
+            f"{i2}self.wrapper = {sync_name}(**wrapper_options)",
+            f"{i2}self.executor = executor",
+            f"{i2}self.semaphore = asyncio.Semaphore(concurrency)",
+            "",
+            f"{i1}async def _run(self, fnc: Callable[..., Any], *args: Any) -> Any:",
+            f"{i2}async with self.semaphore:",
+            f"{i3}loop = asyncio.get_running_loop()",
+            f"{i3}return await loop.run_in_executor(self.executor, functools.partial(fnc, *args))",
+            "",
+            f"{i1}async def preload(self) -> '{self._get_class_async_wrapper_name()}':",
+            f'{i2}"""Import target in the executor now instead of on first command, returns self."""',
+            f"{i2}await self._run(self.wrapper.preload)",
+            f"{i2}return self",
+            "",
+            f"{i1}async def gather(self, *calls: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:",
+            f'{i2}"""',
+            f"{i2}Await several cmd_* coroutines, results are in the order of calls.",
+            f"{i2}",
+            f"{i2}Examples:",
+            f"{i2}    >>> await wrapper.gather(wrapper.cmd_a(), wrapper.cmd_b(opts))",
+            f'{i2}"""',
+            f"{i2}return list(await asyncio.gather(*calls, return_exceptions=return_exceptions))",
+            "",
+            f"{i1}async def map(",
+            f"{i3}self,",
+            f"{i3}method: Callable[..., Awaitable[Any]],",
+            f"{i3}opts_list: Iterable[Any],",
+            f"{i3}return_exceptions: bool = False",
+            f"{i1}) -> List[Any]:",
+            f'{i2}"""',
+            f"{i2}Run one cmd_* coroutine for each options dataclass, results are in the order of opts_list.",
+            f"{i2}",
+            f"{i2}Examples:",
+            f"{i2}    >>> await wrapper.map(wrapper.cmd_a, [AOptions(x=1), AOptions(x=2)])",
+            f'{i2}"""',
+            f"{i2}return await self.gather(*(method(opts) for opts in opts_list), return_exceptions=return_exceptions)",
+        ]
+
+        root = self.parser.index.get([])
+        if root is not None and ('version' in root.cmd_data.fnc_dbg_params):
+            lines.extend([
+                "",
+                f"{i1}# {'=' * 10} VERSION COMMAND {'=' * 10}",
+                f"{i1}async def cmd_version(self) -> str:",
+                f'{i2}"""',
+                f"{i2}Get version string",
+                f'{i2}"""',
+                f"{i2}return await self._run(self.wrapper.cmd_version)",
+            ])
+        return lines
+
+    def _generate_async_method(self, cmd_name: str, cmd_data: ClickDataCommand) -> List[str]:
+        """Generate a coroutine for a specific command, delegating to the blocking method."""
+        method_name = self._get_method_name(cmd_name)
+
+        return [
+            f"{self.indent}# {'=' * 10} {cmd_name.upper()} COMMAND {'=' * 10}",
+            "",
+            *self._generate_method_signature(cmd_name, cmd_data, f"cmd_{method_name}", "str", prefix="async def"),
+            *self._generate_method_doc(cmd_name, cmd_data, "Command output"),
+            f"{self.indent}{self.indent}return await self._run(self.wrapper.cmd_{method_name}, opts, stdin_input)",
+        ]
 
     def _generate_arg_building(self, cmd_data) -> List[str]:
         """Generate code to build command arguments from opts."""
@@ -269,6 +837,22 @@ class ClickWrapper:
         prefix = self.parser.script_string_package.capitalize()
         return f'{prefix}ClickWrapper'
 
+    def _get_class_stream_name(self):
+        prefix = self.parser.script_string_package.capitalize()
+        return f'{prefix}{ClickImporter.__name__}Stream'
+
+    def _get_class_output_name(self):
+        prefix = self.parser.script_string_package.capitalize()
+        return f'{prefix}{ClickImporter.__name__}Output'
+
+    def _get_class_result_name(self):
+        prefix = self.parser.script_string_package.capitalize()
+        return f'{prefix}{ClickImporter.__name__}Result'
+
+    def _get_class_async_wrapper_name(self):
+        prefix = self.parser.script_string_package.capitalize()
+        return f'{prefix}AsyncClickWrapper'
+
     ##############
     # internal helpers
     ##############
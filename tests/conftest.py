@@ -1,6 +1,12 @@
 import pytest
 from pathlib import Path
 import sys
+import types
+import textwrap
+
+import click
+
+from click_wrapper import ClickBenchmark
 
 @pytest.fixture(scope="session")
 def output_dir():
@@ -17,4 +23,45 @@ def output_dir():
     if str(output_path) not in sys.path:
         sys.path.insert(0, str(output_path))
 
-    return output_path
\ No newline at end of file
+    return output_path
+
+# synthetic CLI builder is shared with 'click-wrapper bench'
+build_synthetic_cli = ClickBenchmark.synthetic_cli
+
+
+@pytest.fixture
+def synthetic_module():
+    """Register synthetic Click CLI as importable module, returns module name."""
+    registered = []
+
+    def factory(cli: click.Command, name: str = None) -> str:
+        name = name or f"synthetic_cli_{len(registered)}"
+        module = types.ModuleType(name)
+        module.cli = cli
+        sys.modules[name] = module
+        registered.append(name)
+        return name
+
+    yield factory
+
+    for name in registered:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def cli_package(tmp_path, monkeypatch):
+    """Write Click CLI package sources to disk and make it importable, returns package name."""
+
+    def factory(name: str, files: dict) -> str:
+        package_dir = tmp_path / name
+        package_dir.mkdir()
+        for file_name, source in files.items():
+            (package_dir / file_name).write_text(textwrap.dedent(source))
+        return name
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("CLICK_WRAPPER_CACHE_DIR", str(tmp_path / "cache"))
+    before = set(sys.modules)
+    yield factory
+    for name in set(sys.modules) - before:
+        sys.modules.pop(name, None)
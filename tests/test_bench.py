@@ -0,0 +1,43 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from click_wrapper import ClickBenchmark, ClickBenchmarkReport
+from click_wrapper.cli import cli
+
+
+def test_bench_report_roundtrip():
+    report = ClickBenchmark.run(commands=20, repeat=2, calls=5)
+    assert [result.name for result in report.results] == ClickBenchmark.benchmarks
+    assert all(0 < result.min <= result.median for result in report.results)
+
+    loaded = ClickBenchmarkReport.from_dict(json.loads(report.to_json()))
+    assert loaded == report and loaded.compare(report) == []
+
+    slower = ClickBenchmarkReport.from_dict(report.to_dict())
+    slower.results[0].median = report.results[0].median * 2
+    [regression] = slower.compare(report, max_regression=0.5)
+    assert regression.startswith(f"{report.results[0].name}:") and "+100%" in regression
+
+    with pytest.raises(ValueError, match="Unknown benchmark"):
+        ClickBenchmark.run(benchmarks=["nope"])
+
+
+def test_bench_command(tmp_path):
+    output = tmp_path / "bench.json"
+    args = ["bench", "--commands", "20", "--repeat", "1", "--calls", "2", "-b", "parser_factory"]
+    result = CliRunner().invoke(cli, args + ["--output", str(output)])
+    assert result.exit_code == 0, result.output
+    assert [r["name"] for r in json.loads(output.read_text())["results"]] == ["parser_factory"]
+
+    result = CliRunner().invoke(cli, args + ["--compare", str(output), "--max-regression", "1000"])
+    assert result.exit_code == 0, result.output
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize("commands", [200, 2000])
+def test_bench(commands, tmp_path):
+    report = ClickBenchmark.run(commands=commands, depth=4, params=4)
+    (tmp_path / f"bench_{commands}.json").write_text(report.to_json())
+    print(f"\n{report.format_text()}")
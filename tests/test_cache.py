@@ -0,0 +1,129 @@
+import os
+import sys
+
+from click_wrapper import ClickImporter, ClickParser, ClickMetadataCache, ClickUtils
+
+CLI_SOURCE = '''
+import click
+
+@click.group()
+@click.version_option("1.0")
+def cli():
+    """Cached CLI"""
+
+@cli.command()
+@click.argument("name")
+@click.option("--count", type=click.IntRange(1, 5), default=1, help="Repeat")
+@click.option("--mode", type=click.Choice(["a", "b"]))
+@click.option("--pair", type=(str, int))
+def hello(name, count, mode, pair):
+    """Say hello"""
+
+@cli.group()
+def sub():
+    """Nested"""
+
+@sub.command(name="run")
+def sub_run():
+    pass
+'''
+
+
+def _parse(package: str, cache: ClickMetadataCache) -> ClickParser:
+    importer = ClickImporter(py_import_path=f"{package}.cli", py_import_path_attribute="cli", lazy=True)
+    return ClickParser.factory(importer, cache)
+
+
+def test_cache_warm_load_skips_import(cli_package):
+    package = cli_package("cached_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    cache = ClickMetadataCache()
+
+    cold = _parse(package, cache)
+    assert len(list(cache.cache_dir.glob("*.json"))) == 1
+
+    sys.modules.pop(f"{package}.cli")
+    warm = _parse(package, cache)
+    assert f"{package}.cli" not in sys.modules
+
+    assert warm.names_short_joined == cold.names_short_joined == ["", "hello", "sub", "sub run"]
+    for c, w in zip(cold.metadata, warm.metadata):
+        assert [p.name for p in c.cmd_data.fnc_params] == [p.name for p in w.cmd_data.fnc_params]
+        assert [p.as_string_python_type() for p in c.cmd_data.fnc_params] == \
+               [p.as_string_python_type() for p in w.cmd_data.fnc_params]
+        assert [p.default for p in c.cmd_data.fnc_params] == [p.default for p in w.cmd_data.fnc_params]
+
+    # subtree of restored root is shared with metadata nodes
+    assert warm.metadata[0].cmd_data.fnc_subcommands["sub"] is warm.metadata[2].cmd_data
+    assert warm.metadata[2].cmd_data.fnc_subcommands["run"] is warm.metadata[3].cmd_data
+
+
+def test_cache_invalidated_by_source_change(cli_package, tmp_path):
+    package = cli_package("stale_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    cache = ClickMetadataCache()
+    _parse(package, cache)
+    key = ClickMetadataCache.source_key(ClickImporter(f"{package}.cli", "cli", lazy=True))
+
+    source = tmp_path / package / "cli.py"
+    source.write_text(CLI_SOURCE + '''
+@cli.command()
+def added():
+    pass
+''')
+    os.utime(source, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns + 10**9))
+    sys.modules.pop(f"{package}.cli")
+
+    assert ClickMetadataCache.source_key(ClickImporter(f"{package}.cli", "cli", lazy=True)) != key
+    assert "added" in _parse(package, cache).names_short_joined
+    # stale entry replaced
+    assert len(list(cache.cache_dir.glob("*.json"))) == 1
+
+
+def test_cache_keeps_static_entries_apart(cli_package):
+    package = cli_package("static_cached_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    cache = ClickMetadataCache()
+    importer = ClickImporter(f"{package}.cli", "cli", lazy=True)
+    static = ClickParser.factory(importer, cache, static=True)
+    assert f"{package}.cli" not in sys.modules
+
+    # statically loaded tree is not served to live parse
+    live = _parse(package, cache)
+    assert f"{package}.cli" in sys.modules
+    assert len(list(cache.cache_dir.glob("*.json"))) == 2
+    assert live.names_short_joined == static.names_short_joined
+
+    sys.modules.pop(f"{package}.cli")
+    assert ClickParser.factory(importer, cache, static=True).names_short_joined == static.names_short_joined
+    assert _parse(package, cache).names_short_joined == live.names_short_joined
+    assert f"{package}.cli" not in sys.modules
+
+
+def test_cache_generates_same_wrapper(cli_package):
+    package = cli_package("wrapped_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    live = ClickUtils.dump_wrapper(f"{package}.cli", "cli")
+    ClickUtils.dump_wrapper(f"{package}.cli", "cli", use_cache=True)
+    warm = ClickUtils.dump_wrapper(f"{package}.cli", "cli", use_cache=True)
+    assert warm == live
+
+    assert ClickUtils.cache_clear() == 1
+
+
+def test_cache_invalidated_by_plugin(cli_package, tmp_path):
+    package = cli_package("plugged_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    key = ClickMetadataCache.source_key(ClickImporter(f"{package}.cli", "cli", lazy=True))
+
+    # plugin distribution registering commands through entry points of target
+    dist_info = tmp_path / "plugged_cli_extra-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: plugged-cli-extra\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[plugged_cli_other]\nextra = plugged_cli_extra\n[plugged_clix]\nextra = plugged_cli_extra\n"
+    )
+    # groups of other packages sharing name prefix are ignored
+    assert ClickMetadataCache.source_key(ClickImporter(f"{package}.cli", "cli", lazy=True)) == key
+
+    (dist_info / "entry_points.txt").write_text("[plugged_cli]\nextra = plugged_cli_extra\n[plugged-cli.commands]\nx = y\n")
+    plugged = ClickMetadataCache.source_key(ClickImporter(f"{package}.cli", "cli", lazy=True))
+    assert plugged != key
+
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: plugged-cli-extra\nVersion: 1.1\n")
+    assert ClickMetadataCache.source_key(ClickImporter(f"{package}.cli", "cli", lazy=True)) not in (key, plugged)
@@ -0,0 +1,98 @@
+import json
+
+from click.testing import CliRunner
+
+from click_wrapper import ClickDiscovery, ClickImporter, ClickParser
+from click_wrapper.cli import cli
+
+CLI_SOURCE = '''
+import click
+
+print("printed at import")
+
+@click.group()
+def cli():
+    """Discovered CLI"""
+
+@cli.command()
+@click.option("--count", type=int, default=1)
+def hello(count):
+    """Say hello"""
+
+def main():
+    cli()
+'''
+
+
+def _distribution(tmp_path, name: str, entry_points: dict, requires: list):
+    """Installed distribution metadata (dist-info) on sys.path."""
+    dist_info = tmp_path / f"{name}-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "\n".join(["Metadata-Version: 2.1", f"Name: {name}", "Version: 1.0", *(f"Requires-Dist: {r}" for r in requires)])
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[console_scripts]\n" + "".join(f"{script} = {value}\n" for script, value in entry_points.items())
+    )
+
+
+def _environment(cli_package, tmp_path):
+    cli_package("disco_cli", {
+        "__init__.py": "",
+        "cli.py": CLI_SOURCE,
+        "hang.py": "import time\ntime.sleep(60)\n",
+        "hog.py": "data = b'x' * (2 ** 31)\n",
+    })
+    _distribution(tmp_path, "disco-cli", {
+        "disco": "disco_cli.cli:cli",
+        "disco-main": "disco_cli.cli:main",
+        "disco-hang": "disco_cli.hang:run",
+        "disco-hog": "disco_cli.hog:run",
+        "disco-missing": "disco_cli.missing:cli",
+    }, ["click>=8"])
+    # depends on click through disco-cli
+    _distribution(tmp_path, "disco-plugin", {"disco-plugin": "disco_cli.cli:cli"}, ["disco_cli ; extra == 'all'"])
+    _distribution(tmp_path, "unrelated", {"unrelated": "disco_cli.cli:cli"}, ["requests"])
+
+
+def test_entry_points(cli_package, tmp_path):
+    _environment(cli_package, tmp_path)
+    dependents = ClickDiscovery.click_dependents()
+    assert {"disco-cli", "disco-plugin"} <= dependents and "unrelated" not in dependents
+
+    names = [ep.name for ep in ClickDiscovery.entry_points(distributions=["disco_cli", "disco-plugin", "unrelated"])]
+    assert names == ["disco", "disco-hang", "disco-hog", "disco-main", "disco-missing", "disco-plugin"]
+    assert [ep.name for ep in ClickDiscovery.entry_points(distributions=["unrelated"], click_only=False)] == ["unrelated"]
+
+
+def test_discover(cli_package, tmp_path):
+    _environment(cli_package, tmp_path)
+    entry_points = ClickDiscovery.entry_points(distributions=["disco-cli"])
+    results = {
+        result.entry_point.name: result
+        for result in ClickDiscovery.discover(entry_points, workers=5, timeout=5, max_memory_mb=1024)
+    }
+    assert {name: result.status for name, result in results.items()} == {
+        "disco": "ok",
+        "disco-main": "not_click",
+        "disco-hang": "timeout",
+        "disco-hog": "memory",
+        "disco-missing": "error",
+    }
+    assert "No module named 'disco_cli.missing'" in results["disco-missing"].error
+
+    # metadata equal in-process parse, output printed at import does not interfere
+    parsed = ClickParser.factory(ClickImporter(py_import_path="disco_cli.cli", py_import_path_attribute="cli")).metadata
+    assert [m.to_dict() for m in results["disco"].metadata] == [m.to_dict() for m in parsed]
+    snapshot = json.loads(results["disco"].to_json())
+    assert (snapshot["distribution"], snapshot["status"], len(snapshot["commands"])) == ("disco-cli", "ok", 2)
+
+
+def test_cli(cli_package, tmp_path):
+    _environment(cli_package, tmp_path)
+    output_dir = tmp_path / "metadata"
+    result = CliRunner().invoke(cli, ["discover", "-d", "disco-plugin", "--output-dir", str(output_dir)])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["name"] == "disco-plugin"
+    assert "Discovered 1 entry point(s): 1 ok" in result.stderr
+    assert len((output_dir / "disco-plugin.ndjson").read_text().splitlines()) == 2
@@ -0,0 +1,59 @@
+import time
+
+import click
+import pytest
+
+from click_wrapper import ClickImporter, ClickGenerator, ClickHelpRenderer
+from conftest import build_synthetic_cli
+
+
+def test_help_renderer_matches_runner_llm():
+    importer = ClickImporter("llm")
+    expected = ClickGenerator.app_help_dump(importer, runner=True)
+
+    assert ClickGenerator.app_help_dump(importer) == expected
+    assert ClickGenerator.app_help_dump(importer, workers=2) == expected
+
+
+def test_help_renderer_context_settings(synthetic_module):
+    cli = click.Group(name="cli", context_settings={"help_option_names": ["-h", "--help"], "max_content_width": 60})
+    sub = click.Group(name="sub", help=click.style("Styled help", fg="red"))
+    sub.add_command(click.Command("leaf", params=[click.Argument(["name"]), click.Option(["--flag/--no-flag"])]))
+    cli.add_command(sub)
+    cli.params.append(click.Option(["--root-opt"]))
+
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli")
+    renderer = ClickHelpRenderer(importer)
+    for path in ([], ["sub"], ["sub", "leaf"]):
+        assert renderer.render(path) == importer.run_command(path + ["--help"])
+
+    with pytest.raises(ValueError):
+        renderer.render(["sub", "missing"])
+
+
+def test_help_renderer_width_per_context(synthetic_module, monkeypatch):
+    cli = click.Group(name="cli", help="word " * 40)
+    cli.add_command(click.Command("leaf", help="word " * 40, context_settings={"terminal_width": 120}))
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli")
+    expected = [importer.run_command(path + ["--help"]) for path in ([], ["leaf"])]
+
+    # width is set on contexts, process-wide forced width is neither used nor changed
+    monkeypatch.setattr(click.formatting, "FORCED_WIDTH", 40)
+    assert ClickHelpRenderer(importer).render_many([[], ["leaf"]]) == expected
+    assert click.formatting.FORCED_WIDTH == 40
+
+
+def test_help_renderer_benchmark(synthetic_module):
+    cli = build_synthetic_cli(commands=1000, depth=4)
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli")
+
+    start = time.perf_counter()
+    expected = ClickGenerator.app_help_dump(importer, runner=True)
+    runner_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rendered = ClickGenerator.app_help_dump(importer)
+    context_time = time.perf_counter() - start
+
+    assert rendered == expected
+    assert context_time < runner_time, f"{runner_time=:.3f}s {context_time=:.3f}s"
@@ -0,0 +1,529 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import click
+import pytest
+
+from click_wrapper import ClickImporter, ClickImporterError
+from click_wrapper.importer import _ThreadIsolation
+
+
+def _build_cli() -> click.Group:
+    @click.group(name="cli")
+    def cli():
+        """Engine test CLI"""
+
+    @cli.command()
+    @click.argument("name")
+    @click.option("--count", type=int, default=3)
+    def echo(name, count):
+        """Echo name, interleaving stdout and stderr"""
+        for i in range(count):
+            click.echo(f"{name} out {i}")
+            time.sleep(0.0005)
+            click.echo(f"{name} err {i}", err=True)
+            print(f"{name} print {i}")
+
+    @cli.command()
+    @click.option("--lines", type=int, default=3)
+    @click.option("--size", type=int, default=10)
+    def produce(lines, size):
+        """Write many lines, report whether consumer stopped reading"""
+        try:
+            for i in range(lines):
+                click.echo(f"{i:08d}" + "x" * size)
+                if cli.gate is not None:
+                    cli.gate.wait()
+                    cli.gate = None
+        finally:
+            cli.stopped.set()
+
+    cli.gate = None
+    cli.stopped = threading.Event()
+
+    @cli.command()
+    def read():
+        """Echo stdin"""
+        data = sys.stdin.read()
+        click.echo(f"stdin: {data} tty: {sys.stdin.isatty()}")
+
+    @cli.command()
+    def ask():
+        """Prompt for values"""
+        name = click.prompt("Name")
+        secret = click.prompt("Secret", hide_input=True)
+        confirmed = click.confirm("Sure?")
+        click.echo(f"{name} {secret} {confirmed}")
+
+    @cli.command()
+    @click.option("--code", default=0)
+    def fail(code):
+        """Exit with code, styled output"""
+        click.secho("styled", fg="red")
+        if code == 99:
+            raise RuntimeError("boom")
+        if code == 98:
+            sys.exit("string exit")
+        if code == 97:
+            raise click.Abort()
+        if code:
+            raise click.ClickException("failed")
+
+    return cli
+
+
+def _comparable(result):
+    """Exit code, output and unexpected exception (instances are never equal)."""
+    exit_code, output, exception = result
+    return exit_code, output, repr(exception)
+
+
+@pytest.fixture
+def importers(synthetic_module):
+    module = synthetic_module(_build_cli())
+    return (
+        ClickImporter(py_import_path=module, py_import_path_attribute="cli", engine="threads"),
+        ClickImporter(py_import_path=module, py_import_path_attribute="cli", engine="runner"),
+    )
+
+
+@pytest.mark.parametrize("args, input", [
+    (["--help"], None),
+    (["echo", "--help"], None),
+    (["echo", "a", "--count", "2"], None),
+    (["echo"], None),
+    (["missing"], None),
+    (["read"], "some input"),
+    (["read"], None),
+    (["ask"], "joe\nsecret\ny\n"),
+    (["ask"], "joe\n"),
+    (["fail"], None),
+    (["fail", "--code", "1"], None),
+    (["fail", "--code", "97"], None),
+    (["fail", "--code", "98"], None),
+    (["fail", "--code", "99"], None),
+])
+def test_threads_engine_matches_runner(importers, args, input):
+    threads, runner = importers
+    assert _comparable(threads._execute(args, input)) == _comparable(runner._execute(args, input))
+
+
+@pytest.mark.parametrize("engine", ["threads", "runner"])
+def test_unexpected_exception_is_reported(importers, engine):
+    importer = importers[0] if engine == "threads" else importers[1]
+    with pytest.raises(ClickImporterError, match="RuntimeError: boom") as error:
+        importer.run_command(["fail", "--code", "99"])
+    assert isinstance(error.value.__cause__, RuntimeError)
+    with pytest.raises(ClickImporterError, match="RuntimeError: boom"):
+        list(importer.run_command_stream(["fail", "--code", "99"]))
+    with pytest.raises(ClickImporterError, match="RuntimeError: boom"):
+        importer.run_command_output(["fail", "--code", "99"])
+
+    failed, = importer.run_many([["fail", "--code", "99"]])
+    assert (failed.exit_code, repr(failed.exception)) == (1, "RuntimeError('boom')")
+    # expected failures are no exceptions
+    assert importer.run_many([["fail", "--code", "1"]])[0].exception is None
+
+
+def test_isolation_is_removed_after_last_command():
+    streams = sys.stdin, sys.stdout, sys.stderr
+    prompt = click.termui.visible_prompt_func
+    command = click.Command("noop", callback=lambda: None)
+    seen = []
+
+    def main(extra):
+        seen.append((sys.stdout is streams[1], click.termui.visible_prompt_func is prompt))
+        # nested command finishing keeps isolation of the running one
+        _ThreadIsolation.run(command, [])
+        seen.append((sys.stdout is streams[1], click.termui.visible_prompt_func is prompt))
+
+    assert _ThreadIsolation.run(command, [], main=main) == (0, "", None)
+    assert seen == [(False, False), (False, False)]
+    assert (sys.stdin, sys.stdout, sys.stderr) == streams and click.termui.visible_prompt_func is prompt
+
+
+@pytest.mark.parametrize("engine", ["threads", "runner"])
+def test_stream_matches_run_command(synthetic_module, engine):
+    importer = ClickImporter(py_import_path=synthetic_module(_build_cli()), py_import_path_attribute="cli", engine=engine)
+
+    expected = importer.run_command(["echo", "a", "--count", "50"])
+    stream = importer.run_command_stream(["echo", "a", "--count", "50"])
+    assert stream.exit_code is None
+    assert "".join(stream) == expected
+    assert stream.exit_code == 0
+
+    lines = list(importer.run_command_stream(["echo", "a", "--count", "50"], lines=True))
+    assert lines == expected.splitlines(keepends=True)
+
+    stream = importer.run_command_stream(["fail", "--code", "1"])
+    with pytest.raises(ClickImporterError, match="Error: failed"):
+        list(stream)
+    assert stream.exit_code == 1
+
+
+def test_stream_yields_while_running(synthetic_module):
+    cli = _build_cli()
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli", engine="threads")
+
+    # command blocks after first line until consumer has seen it
+    cli.gate = threading.Event()
+    stream = iter(importer.run_command_stream(["produce"], lines=True))
+    assert next(stream) == "00000000xxxxxxxxxx\n"
+    cli.gate.set()
+    assert len(list(stream)) == 2
+
+    # consumer stopping early stops the command
+    cli.stopped.clear()
+    with importer.run_command_stream(["produce", "--lines", "1000000"]) as stream:
+        next(iter(stream))
+    assert cli.stopped.wait(5)
+
+
+def test_stream_memory_is_bounded(synthetic_module):
+    importer = ClickImporter(py_import_path=synthetic_module(_build_cli()), py_import_path_attribute="cli", engine="threads")
+
+    tracemalloc.start()
+    try:
+        total = sum(len(chunk) for chunk in importer.run_command_stream(["produce", "--lines", "20000", "--size", "1000"]))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert total == 20000 * 1009
+    assert peak < total / 10, f"{peak=} {total=}"
+
+
+@pytest.mark.parametrize("engine", ["threads", "runner"])
+def test_output_spools_to_disk(synthetic_module, engine):
+    importer = ClickImporter(py_import_path=synthetic_module(_build_cli()), py_import_path_attribute="cli", engine=engine)
+    args = ["echo", "\u00e9", "--count", "100"]
+    expected = importer.run_command(args)
+
+    with importer.run_command_output(args) as output:
+        assert not output.spooled
+        assert output.text == expected
+
+    with importer.run_command_output(args, spool_threshold=100) as output:
+        assert output.spooled
+        assert output.size == len(expected.encode())
+        with output.view() as view:
+            assert view.readonly and view[:2] == "\u00e9".encode()
+        assert output.to_bytes().decode() == expected
+        # chunk boundaries split multi-byte characters
+        assert "".join(output.iter_text(chunk_size=7)) == expected
+        assert output.text == expected
+
+    with pytest.raises(ClickImporterError, match="Error: failed"):
+        importer.run_command_output(["fail", "--code", "1"], spool_threshold=0)
+
+
+def test_output_memory_is_bounded(synthetic_module):
+    importer = ClickImporter(py_import_path=synthetic_module(_build_cli()), py_import_path_attribute="cli", engine="threads")
+
+    tracemalloc.start()
+    try:
+        with importer.run_command_output(["produce", "--lines", "20000", "--size", "1000"],
+                                         spool_threshold=1024 * 1024) as output:
+            peak = tracemalloc.get_traced_memory()[1]
+            assert output.spooled
+            assert sum(len(text) for text in output.iter_text()) == output.size
+            decode_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert output.size == 20000 * 1009
+    assert peak < 3 * 1024 * 1024, f"{peak=}"
+    assert decode_peak < 8 * 1024 * 1024, f"{decode_peak=}"
+
+
+@pytest.mark.parametrize("engine, max_workers", [("threads", None), ("threads", 8), ("runner", 8)])
+def test_run_many(importers, engine, max_workers):
+    threads, runner = importers
+    importer = threads if engine == "threads" else runner
+    invocations = [["echo", f"n{i}", "--count", "2"] for i in range(40)] + [(["read"], "data"), ["fail", "--code", "1"]]
+
+    results = importer.run_many(invocations, max_workers=max_workers)
+    assert [r.args for r in results] == [list(i[0]) if isinstance(i, tuple) else i for i in invocations]
+    assert [r.output for r in results[:40]] == [runner.run_command(i) for i in invocations[:40]]
+    assert results[40].output == runner.run_command(["read"], input="data")
+    assert [r.ok for r in results] == [True] * 41 + [False]
+    assert results[41].exit_code == 1 and "Error: failed" in results[41].output
+    assert all(r.duration > 0 for r in results)
+
+
+def test_run_many_stop_on_error(importers):
+    threads, _ = importers
+    invocations = [["echo", "a"], ["fail", "--code", "2"], ["echo", "b"], ["echo", "c"]]
+
+    results = threads.run_many(invocations, stop_on_error=True)
+    assert [r.exit_code for r in results] == [0, 1]
+
+    # nothing is started after failure is known, order is kept
+    results = threads.run_many([["fail", "--code", "1"]] + [["echo", "x"]] * 200, max_workers=2, stop_on_error=True)
+    assert results[0].exit_code == 1 and len(results) < 201
+
+
+@pytest.mark.parametrize("path, params, input, args", [
+    (["echo"], {"name": "a", "count": 2}, None, ["echo", "a", "--count", "2"]),
+    (["echo"], {}, None, ["echo"]),
+    (["read"], {}, "some input", ["read"]),
+    (["ask"], {}, "joe\nsecret\ny\n", ["ask"]),
+    (["ask"], {}, "joe\n", ["ask"]),
+    (["fail"], {}, None, ["fail"]),
+    (["fail"], {"code": 1}, None, ["fail", "--code", "1"]),
+    (["fail"], {"code": 97}, None, ["fail", "--code", "97"]),
+    (["fail"], {"code": 98}, None, ["fail", "--code", "98"]),
+    (["fail"], {"code": 99}, None, ["fail", "--code", "99"]),
+])
+def test_direct_matches_runner(importers, path, params, input, args):
+    threads, runner = importers
+    assert _comparable(threads._execute_direct(path, params, input)) == _comparable(runner._execute(args, input))
+
+
+def test_direct_passes_typed_values(synthetic_module, monkeypatch):
+    conversions = []
+
+    class Point(click.ParamType):
+        name = "point"
+
+        def convert(self, value, param, ctx):
+            conversions.append(value)
+            return value if isinstance(value, tuple) else tuple(int(v) for v in value.split(","))
+
+    @click.group(name="cli")
+    @click.option("--user", envvar="DIRECT_USER", default="anonymous")
+    @click.pass_context
+    def cli(ctx, user):
+        ctx.obj = {"user": user}
+
+    @cli.group()
+    def shapes():
+        pass
+
+    @shapes.command()
+    @click.option("--at", type=Point(), default="0,0")
+    @click.option("--tag", multiple=True)
+    @click.option("--size", type=int, default=1)
+    @click.pass_obj
+    def draw(obj, at, tag, size):
+        click.echo(f"{obj['user']} {at!r} {tag!r} {size!r}")
+
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli")
+    monkeypatch.setenv("DIRECT_USER", "joe")
+
+    # caller values are passed as they are, defaults still come from Click
+    assert importer.run_command_direct(["shapes", "draw"], {"at": (1, 2), "tag": ("a",)}) == "joe (1, 2) ('a',) 1\n"
+    assert conversions == []
+    assert importer.run_command_direct(["shapes", "draw"]) == "joe (0, 0) () 1\n"
+    assert conversions == ["0,0"]
+    assert importer._direct_commands.keys() == {("shapes", "draw")}
+
+    with pytest.raises(ValueError, match="no parameter"):
+        importer.run_command_direct(["shapes", "draw"], {"color": "red"})
+    with pytest.raises(ValueError, match="not found"):
+        importer.run_command_direct(["shapes", "erase"])
+    with ClickImporter(py_import_path="llm", engine="pool", workers=1) as pool:
+        with pytest.raises(ValueError, match="pool"):
+            pool.run_command_direct(["models", "list"])
+
+
+def test_threads_engine_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        ClickImporter("llm", engine="subprocess")
+
+
+def test_runner_engine_is_default():
+    # in-process thread isolation is opt-in
+    assert ClickImporter("llm").engine == "runner"
+
+
+def test_lazy_import_runs_once(cli_package, monkeypatch):
+    package = cli_package("lazy_cli", {"__init__.py": "", "cli.py": POOL_CLI})
+    imports = []
+    import_from_string = ClickImporter._import_from_string
+
+    def slow_import(self):
+        imports.append(threading.get_ident())
+        time.sleep(0.1)
+        return import_from_string(self)
+
+    monkeypatch.setattr(ClickImporter, "_import_from_string", slow_import)
+    importer = ClickImporter(f"{package}.cli", "cli", lazy=True, engine="threads")
+    pool = ClickImporter(f"{package}.cli", "cli", lazy=True, engine="pool")
+    assert f"{package}.cli" not in sys.modules and imports == [] and pool._pool is None
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(importer.run_command(["--help"]))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(imports) == 1 and len(set(results)) == 1 and len(results) == 8
+    assert importer.preload() is importer and len(imports) == 1
+
+
+def test_threads_engine_concurrent_outputs(importers, capsys):
+    threads, runner = importers
+    names = [f"t{i}" for i in range(16)]
+    expected = {name: runner.run_command(["echo", name, "--count", "20"]) for name in names}
+    expected_stdin = runner.run_command(["read"], input="data")
+
+    results, errors = {}, []
+    barrier = threading.Barrier(len(names))
+
+    def worker(name):
+        try:
+            barrier.wait()
+            for i in range(10):
+                results.setdefault(name, []).append(threads.run_command(["echo", name, "--count", "20"]))
+                assert threads.run_command(["read"], input="data") == expected_stdin
+                with pytest.raises(ClickImporterError):
+                    threads.run_command(["fail", "--code", "1"])
+        except BaseException as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(name,)) for name in names]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert errors == []
+    for name in names:
+        assert results[name] == [expected[name]] * 10
+
+    # threads not running a command keep writing to original streams
+    print("still visible")
+    click.echo("also visible", err=True)
+    assert capsys.readouterr() == ("still visible\n", "also visible\n")
+
+
+POOL_CLI = '''
+import os
+import time
+
+import click
+
+BALLAST = []
+
+@click.group()
+def cli():
+    """Pool test CLI"""
+
+@cli.command()
+@click.option("--sleep", type=float, default=0)
+def pid(sleep):
+    time.sleep(sleep)
+    click.echo(os.getpid())
+
+@cli.command()
+def grow():
+    BALLAST.append(bytearray(64 * 1024 * 1024))
+    click.echo(os.getpid())
+
+@cli.command()
+def memory():
+    from click_wrapper.importer import _memory_mb
+    click.echo(_memory_mb())
+
+@cli.command()
+def slow():
+    click.echo("first")
+    time.sleep(1.5)
+    click.echo("second")
+
+@cli.command()
+def crash():
+    os._exit(3)
+
+@cli.command()
+def fail():
+    raise click.ClickException("failed")
+
+@cli.command()
+def boom():
+    raise RuntimeError("boom")
+'''
+
+
+@pytest.fixture
+def pool_package(cli_package):
+    return cli_package("pool_cli", {"__init__.py": "", "cli.py": POOL_CLI})
+
+
+def test_pool_engine_runs_on_workers(pool_package):
+    with ClickImporter(f"{pool_package}.cli", "cli", lazy=True, engine="pool", workers=3) as importer:
+        threads = ClickImporter(f"{pool_package}.cli", "cli", engine="threads")
+        assert importer.run_command(["--help"]) == threads.run_command(["--help"])
+        assert importer._execute(["fail"]) == threads._execute(["fail"])
+        with pytest.raises(ClickImporterError, match="RuntimeError: boom"):
+            importer.run_command(["boom"])
+
+        pids = set()
+        workers = [
+            threading.Thread(target=lambda: pids.add(importer.run_command(["pid", "--sleep", "0.2"])))
+            for _ in range(6)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        assert len(pids) == 3
+        assert str(os.getpid()) + "\n" not in pids
+
+    with pytest.raises(RuntimeError):
+        importer.run_command(["pid"])
+
+
+def test_pool_engine_preload_skips_parent_import(pool_package):
+    sys.modules.pop(f"{pool_package}.cli", None)
+    with ClickImporter(f"{pool_package}.cli", "cli", engine="pool", workers=1) as importer:
+        assert importer._pool is not None and importer._pool._context.get_start_method() == "spawn"
+        assert int(importer.run_command(["pid"])) != os.getpid()
+        assert f"{pool_package}.cli" not in sys.modules
+
+
+def test_pool_engine_recycles_workers(pool_package):
+    with ClickImporter(f"{pool_package}.cli", "cli", lazy=True, engine="pool", workers=1,
+                       max_calls_per_worker=2) as importer:
+        pids = [importer.run_command(["pid"]) for _ in range(4)]
+        assert pids[0] == pids[1] != pids[2] == pids[3]
+
+    with ClickImporter(f"{pool_package}.cli", "cli", lazy=True, engine="pool", workers=1) as probe:
+        # worker memory plus half of the ballast allocated by 'grow'
+        limit = float(probe.run_command(["memory"])) + 32
+
+    with ClickImporter(f"{pool_package}.cli", "cli", lazy=True, engine="pool", workers=1,
+                       max_memory_mb=limit) as importer:
+        assert importer.run_command(["pid"]) == importer.run_command(["pid"])
+        grown = importer.run_command(["grow"])
+        assert importer.run_command(["pid"]) != grown
+
+
+def test_pool_engine_streams(pool_package):
+    with ClickImporter(f"{pool_package}.cli", "cli", lazy=True, engine="pool", workers=1) as importer:
+        start = time.perf_counter()
+        stream = iter(importer.run_command_stream(["slow"], lines=True))
+        assert next(stream) == "first\n"
+        assert time.perf_counter() - start < 1
+        assert list(stream) == ["second\n"]
+
+        # worker stopped mid-stream is replaced
+        with importer.run_command_stream(["slow"]) as stream:
+            next(iter(stream))
+        pid = importer.run_command(["pid"])
+        with importer.run_command_output(["pid"], spool_threshold=0) as output:
+            assert output.spooled and output.text == pid
+
+        with pytest.raises(ClickImporterError, match="crashed"):
+            list(importer.run_command_stream(["crash"]))
+
+
+def test_pool_engine_recovers_from_crash(pool_package):
+    with ClickImporter(f"{pool_package}.cli", "cli", lazy=True, engine="pool", workers=1) as importer:
+        before = importer.run_command(["pid"])
+        with pytest.raises(ClickImporterError, match="crashed"):
+            importer.run_command(["crash"])
+        assert importer.run_command(["pid"]) != before
+
@@ -0,0 +1,147 @@
+import importlib
+import os
+import sys
+import time
+
+from click_wrapper import ClickExportManifest, ClickUtils
+
+CLI_SOURCE = '''
+import click
+
+@click.group()
+def cli():
+    """Exported CLI"""
+
+@cli.command()
+@click.option("--count", type=int, default=1, help="Repeat")
+def hello(count):
+    """Say hello"""
+
+@cli.command()
+def bye():
+    """Say bye"""
+'''
+
+
+def _touch_later(path):
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+
+
+def test_incremental_wrapper_rewrites_only_changes(cli_package, tmp_path):
+    package = cli_package("exported_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    output = tmp_path / "out" / "wrapper.py"
+    output.parent.mkdir()
+
+    report = ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert (report.changed, report.unchanged, report.written) == (["hello", "bye"], [], [output])
+    assert output.read_text() == ClickUtils.dump_wrapper(f"{package}.cli", "cli")
+    assert ClickExportManifest(output).path.exists()
+    mtime = output.stat().st_mtime_ns
+
+    # no-op: target is not imported, nothing is generated nor written
+    sys.modules.pop(f"{package}.cli")
+    start = time.perf_counter()
+    report = ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert time.perf_counter() - start < 0.5
+    assert f"{package}.cli" not in sys.modules
+    assert (report.changed, report.unchanged, report.written) == ([], ["hello", "bye"], [])
+    assert output.stat().st_mtime_ns == mtime
+
+    # other options regenerate
+    report = ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output), compiled=True)
+    assert report.changed == ["hello", "bye"] and report.written == [output]
+
+    # source change touching one command
+    ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output))
+    source = tmp_path / package / "cli.py"
+    source.write_text(CLI_SOURCE.replace('"""Say bye"""', '"""Say goodbye"""'))
+    _touch_later(source)
+    sys.modules.pop(f"{package}.cli")
+    report = ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert (report.changed, report.unchanged, report.written) == (["bye"], ["hello"], [output])
+    assert "Say goodbye" in output.read_text()
+
+    # source touched without effect on output, file is kept
+    _touch_later(source)
+    mtime = output.stat().st_mtime_ns
+    report = ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert (report.changed, report.written) == ([], [])
+    assert output.stat().st_mtime_ns == mtime
+
+    # edited output is restored
+    output.write_text("edited")
+    report = ClickUtils.dump_wrapper_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert report.written == [output] and report.changed == []
+
+
+def test_incremental_help(cli_package, tmp_path):
+    package = cli_package("help_cli", {"__init__.py": "", "cli.py": CLI_SOURCE})
+    output = tmp_path / "help.md"
+
+    report = ClickUtils.dump_help_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert report.changed == ["help_cli", "hello", "bye"]
+    assert output.read_text() == ClickUtils.dump_help(f"{package}.cli", "cli")
+
+    report = ClickUtils.dump_help_incremental(f"{package}.cli", "cli", output_file=str(output))
+    assert report.summary == "0 changed, 3 unchanged command(s), 0 file(s) written"
+
+
+GROUPS_SOURCE = '''
+import click
+
+@click.group()
+def cli():
+    """Grouped CLI"""
+
+@cli.command()
+@click.argument("name")
+def hello(name):
+    click.echo(f"hello {name}")
+
+@cli.group()
+def keys():
+    """Keys"""
+
+@keys.command(name="list")
+@click.option("--count", type=int, default=1)
+def keys_list(count):
+    click.echo(f"keys {count}")
+
+@cli.group(name="embed-models")
+def embed_models():
+    """Embedding models"""
+
+@embed_models.command(name="list")
+def embed_models_list():
+    click.echo("embed models")
+'''
+
+
+def test_package_loads_groups_lazily(cli_package, tmp_path):
+    package = cli_package("grouped_cli", {"__init__.py": "", "cli.py": GROUPS_SOURCE})
+    output_dir = tmp_path / "grouped_wrapper"
+
+    report = ClickUtils.dump_wrapper_package(f"{package}.cli", "cli", output_dir=str(output_dir), async_mode=True)
+    assert sorted(path.name for path in report.written) == [
+        "__init__.py", "_base.py", "_root.py", "embed_models.py", "keys.py"
+    ]
+
+    wrapper_module = importlib.import_module("grouped_wrapper")
+    loaded = lambda: sorted(name for name in sys.modules if name.startswith("grouped_wrapper."))
+    assert loaded() == ["grouped_wrapper._base"]
+
+    wrapper = wrapper_module.Grouped_cliClickWrapper()
+    assert wrapper.cmd_keys_list(wrapper_module.KeysListOptions(count=2)) == "keys 2\n"
+    assert loaded() == ["grouped_wrapper._base", "grouped_wrapper.keys"]
+    assert wrapper.cmd_hello(wrapper_module.HelloOptions(name="x")) == "hello x\n"
+    assert "grouped_wrapper.embed_models" not in sys.modules
+
+    # unchanged export keeps modules, module of removed group is deleted
+    report = ClickUtils.dump_wrapper_package(f"{package}.cli", "cli", output_dir=str(output_dir), async_mode=True)
+    assert report.written == [] and report.changed == []
+    source = tmp_path / package / "cli.py"
+    source.write_text(GROUPS_SOURCE.split("@cli.group(name=")[0])
+    sys.modules.pop(f"{package}.cli")
+    report = ClickUtils.dump_wrapper_package(f"{package}.cli", "cli", output_dir=str(output_dir), async_mode=True)
+    assert report.removed == ["embed-models list"] and report.written == [output_dir / "__init__.py"]
+    assert not (output_dir / "embed_models.py").exists() and (output_dir / "keys.py").exists()
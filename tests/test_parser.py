@@ -0,0 +1,264 @@
+import gc
+import pathlib
+import sys
+import time
+import tracemalloc
+
+import click
+import pytest
+
+from click_wrapper import ClickDataPool, ClickImporter, ClickParser
+from conftest import build_synthetic_cli
+
+
+def _parse(synthetic_module, cli: click.Command) -> ClickParser:
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli")
+    return ClickParser.factory(importer)
+
+
+def test_parser_visits_each_command_once(synthetic_module, monkeypatch):
+    calls = []
+    parse_command_obj = ClickParser._click_parse_command_obj
+
+    def counting(click_command_obj, *args):
+        calls.append(click_command_obj.name)
+        return parse_command_obj(click_command_obj, *args)
+
+    monkeypatch.setattr(ClickParser, "_click_parse_command_obj", staticmethod(counting))
+
+    parser = _parse(synthetic_module, build_synthetic_cli(commands=500, depth=6))
+    assert len(calls) == 501  # root + subcommands
+    assert len(parser.metadata) == 501
+
+
+def test_parser_shares_command_nodes(synthetic_module):
+    parser = _parse(synthetic_module, build_synthetic_cli(commands=50, depth=4))
+
+    by_path = {tuple(m.cmd_path): m for m in parser.metadata}
+    for path, m in by_path.items():
+        if len(path) > 1:
+            parent = by_path[path[:-1]]
+            assert parent.cmd_data.fnc_subcommands[path[-1]] is m.cmd_data
+
+    # pre-order, subcommands in definition order
+    assert parser.names_short[:3] == [[], ["cmd0"], ["cmd0", "cmd1"]]
+
+
+def test_parser_deep_tree_without_recursion(synthetic_module):
+    depth = sys.getrecursionlimit() + 100
+    cli = click.Group(name="cli")
+    group = cli
+    for i in range(depth):
+        sub = click.Group(name=f"g{i}")
+        group.add_command(sub)
+        group = sub
+
+    parser = _parse(synthetic_module, cli)
+    assert len(parser.metadata) == depth + 1
+    assert parser.metadata[-1].cmd_path[-1] == f"g{depth - 1}"
+
+
+# wall-clock ratio, run by 'pytest -m bench'
+@pytest.mark.bench
+def test_parser_scales_linearly(synthetic_module):
+    def timed(commands: int) -> float:
+        cli = build_synthetic_cli(commands=commands, depth=6)
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            _parse(synthetic_module, cli)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    small, large = timed(500), timed(4000)
+    # 8x more commands, linear traversal stays far below quadratic growth (64x)
+    assert large / small < 20, f"{small=:.4f}s {large=:.4f}s"
+
+
+def test_parser_command_path_parses_only_subtree(synthetic_module, monkeypatch):
+    cli = build_synthetic_cli(commands=2000, depth=4)
+    importer = ClickImporter(py_import_path=synthetic_module(cli), py_import_path_attribute="cli")
+    full = ClickParser.factory(importer)
+    expected = [m.name_short for m in full.metadata if m.name_short[:2] == ["cmd0", "cmd1"]]
+
+    calls = []
+    parse_command_obj = ClickParser._click_parse_command_obj
+
+    def counting(click_command_obj, *args):
+        calls.append(click_command_obj.name)
+        return parse_command_obj(click_command_obj, *args)
+
+    monkeypatch.setattr(ClickParser, "_click_parse_command_obj", staticmethod(counting))
+
+    parser = ClickParser.factory(importer, command_path=["cmd0", "cmd1"])
+    assert parser.names_short == expected
+    assert len(calls) == len(expected)
+    assert parser.metadata[0].cmd_path == ["cli", "cmd0", "cmd1"]
+
+    # memoized, already parsed subtree of full tree is not parsed again
+    assert parser.subtree(["cmd0", "cmd1"]) is parser.metadata
+    assert [m.name_short for m in full.subtree(["cmd0", "cmd1"])] == expected
+    assert len(calls) == len(expected)
+
+    with pytest.raises(ValueError):
+        ClickParser.factory(importer, command_path=["cmd0", "missing"])
+
+
+def test_parser_index_lookups(synthetic_module):
+    cli = click.Group(name="cli")
+    models = click.Group(name="models")
+    models.add_command(click.Command("list", params=[
+        click.Option(["-m", "--model"], envvar="APP_MODEL"),
+        click.Option(["--limit"], type=click.IntRange(1, 5)),
+    ]))
+    models.add_command(click.Command("default", params=[click.Option(["--model"], type=click.Choice(["a"]))]))
+    cli.add_command(models)
+    cli.add_command(click.Command("embed", params=[click.Option(["--debug/--no-debug"], envvar=["A", "B"])]))
+
+    parser = _parse(synthetic_module, cli)
+    index = parser.index
+
+    assert index.get("models list") is parser.metadata[2]
+    assert index.get([]) is parser.metadata[0]
+    assert index.get("missing") is None
+    assert [m.name_short_joined for m in index.under("models")] == ["models", "models list", "models default"]
+    assert index.under("missing") == []
+
+    assert [m.name_short_joined for m in index.by_option("--model")] == ["models list", "models default"]
+    assert [m.name_short_joined for m in index.by_option("--no-debug")] == ["embed"]
+    assert [m.name_short_joined for m in index.by_envvar("APP_MODEL")] == ["models list"]
+    assert [m.name_short_joined for m in index.by_envvar("B")] == ["embed"]
+    assert [m.name_short_joined for m in index.by_type("choice")] == ["models default"]
+    assert [m.name_short_joined for m in index.by_type(click.IntRange)] == ["models list"]
+
+    # properties are cached views, rebuilt only after metadata change
+    assert parser.commands_map is parser.commands_map
+    assert parser.names_short_joined is parser.names_short_joined
+    parser.metadata = parser.subtree(["models"])
+    assert parser.names_short_joined == ["models", "models list", "models default"]
+
+
+def _traced(build):
+    """Result and size of its blocks allocated by parser (not by threads left over by other tests)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, sys.modules[ClickParser.__module__].__file__)])
+        return result, sum(stat.size for stat in snapshot.statistics("filename"))
+    finally:
+        tracemalloc.stop()
+
+
+def test_metadata_is_compact():
+    cli = build_synthetic_cli(commands=10000, depth=4, params=4)
+    metadata = ClickParser._traverse("cli", cli)
+
+    # baseline: every command parsed on its own, no parameters shared across commands
+    commands = [cli]
+    for command in commands:
+        commands.extend(getattr(command, "commands", {}).values())
+    unshared, unshared_size = _traced(lambda: [ClickParser._click_parse_command_obj(c) for c in commands])
+    pool = ClickDataPool()
+    shared, size = _traced(lambda: [ClickParser._click_parse_command_obj(c, pool) for c in commands])
+    assert len(unshared) == len(shared) == len(metadata) == 10001
+    assert size < unshared_size / 2
+
+    # identical parameters are one object, slotted model has no instance dict
+    params = [p for m in metadata for p in m.cmd_data.fnc_params]
+    assert len({id(p) for p in params}) == 4 and len(params) == 4 * 10000
+    assert not hasattr(metadata[0], "__dict__") and not hasattr(params[0], "__dict__")
+    group = metadata[1].cmd_data
+    assert group.fnc_dbg_params == ["opt0", "opt1", "opt2", "opt3"]
+    assert group.fnc_dbg_subcommands == list(group.fnc_subcommands) != []
+
+
+class ColorType(click.ParamType):
+    name = "color"
+
+
+class LowerChoice(click.Choice):
+    pass
+
+
+def _typed_cli() -> click.Group:
+    @click.group(name="cli")
+    def root():
+        """Root"""
+
+    for name in ("paint", "fill"):
+        @root.command(name=name)
+        @click.option("--color", type=ColorType())
+        @click.option("--mode", type=LowerChoice(["a", "b"]))
+        def command(color, mode):
+            """Typed"""
+    return root
+
+
+def test_type_resolver(synthetic_module, monkeypatch, capsys, tmp_path):
+    from click_wrapper import ClickMetadataSerializer, ClickTypeResolver
+    from click_wrapper.parser import ClickDataUtils
+
+    resolver = ClickTypeResolver(ClickDataUtils.type_mapping, entry_points=False)
+    monkeypatch.setattr(ClickDataUtils, "type_resolver", resolver)
+    metadata = _parse(synthetic_module, _typed_cli()).metadata
+    restored = ClickMetadataSerializer.loads(ClickMetadataSerializer.dumps(metadata))
+
+    with resolver.collect() as unknown:
+        for m in (metadata[1], restored[1], metadata[1]):
+            # subclass of 'Choice' resolves along MRO, unknown type falls back to 'str'
+            assert [p.as_string_python_type() for p in m.cmd_data.fnc_params] == ["Optional[str]", "Optional[str]"]
+    assert capsys.readouterr().out == ""
+    # each parameter counted once, however often annotated
+    [diagnostic] = resolver.report(unknown)
+    assert (diagnostic.type_path, diagnostic.name, diagnostic.occurrences) == (f"{__name__}.ColorType", "color", 2)
+    assert "ColorType ('color'): 2 parameter(s), annotated as str" in ClickTypeResolver.format_text(unknown)
+    # nothing is collected outside of 'collect', every block starts empty
+    metadata[1].cmd_data.fnc_params[1].as_string_python_type()
+    with resolver.collect() as unknown:
+        pass
+    assert unknown == {} and ClickTypeResolver.format_text(unknown) == ""
+
+    # registered mapping applies to live and restored types, memo is invalidated
+    resolver.register(ColorType, tuple)
+    resolver.register(f"{__name__}.LowerChoice", pathlib.Path)
+    for m in (metadata[1], restored[1]):
+        assert [p.as_string_python_type() for p in m.cmd_data.fnc_params] == [
+            "Optional[tuple]", "Optional['pathlib.Path']"
+        ]
+
+    # mappings of installed packages are loaded on first unknown type
+    (tmp_path / "color_types.py").write_text(f"MAPPING = {{'{__name__}.ColorType': int}}\n")
+    dist_info = tmp_path / "color_types-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: color-types\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text("[click_wrapper.types]\ncolors = color_types:MAPPING\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    resolver = ClickTypeResolver(ClickDataUtils.type_mapping)
+    with resolver.collect() as unknown:
+        assert resolver.resolve(ColorType(), str) is int
+    assert unknown == {}
+    sys.modules.pop("color_types", None)
+
+
+def test_pool_keeps_settings_of_custom_types(synthetic_module):
+    import dataclasses
+
+    @click.group(name="cli")
+    def root():
+        """Root"""
+
+    for name, choices in (("export", ["json", "csv"]), ("convert", ["xml", "yaml"]), ("dump", ["json", "csv"])):
+        @root.command(name=name)
+        @click.option("--format", type=LowerChoice(choices), help="Format")
+        @click.option("--plain", type=click.Choice(["a"]), help="Plain")
+        def command(format, plain):
+            """Typed"""
+
+    export, convert, dump = (m.cmd_data.fnc_params for m in _parse(synthetic_module, root).metadata[1:])
+    # custom type spec holds no settings, such types are never merged
+    assert convert[0].param_type_click.choices == ("xml", "yaml")
+    assert export[0] is not convert[0] and export[0] is not dump[0]
+    assert export[1] is convert[1] is dump[1]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        export[1].help = "changed"
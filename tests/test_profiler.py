@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from click_wrapper import ClickImportProfiler, ClickUtils
+
+CLI_SOURCE = '''
+import click
+
+from . import heavy
+from .plugin import extra
+
+@click.group()
+def cli():
+    """Profiled CLI"""
+
+@cli.command()
+def hello():
+    """Say hello"""
+
+cli.add_command(extra)
+'''
+
+HEAVY_SOURCE = '''
+import time
+time.sleep(0.05)
+'''
+
+PLUGIN_SOURCE = '''
+import click
+
+from . import plugin_dependency
+
+@click.command()
+def extra():
+    """Plugin command"""
+'''
+
+
+def test_parse_builds_tree():
+    lines = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:        10 |         10 |     c",
+        "import time:        20 |         30 |   b",
+        "import time:         5 |          5 |   d",
+        "import time:         1 |         36 | a",
+        "import time:         2 |          2 | e",
+    ]
+    roots = ClickImportProfiler.parse(lines)
+    assert [(root.name, [child.name for child in root.children]) for root in roots] == [("a", ["b", "d"]), ("e", [])]
+    assert roots[0].children[0].children[0].cumulative_us == 10
+
+
+def test_profile_import(cli_package):
+    package = cli_package("profiled_cli", {
+        "__init__.py": "",
+        "cli.py": CLI_SOURCE,
+        "heavy.py": HEAVY_SOURCE,
+        "plugin.py": PLUGIN_SOURCE,
+        "plugin_dependency.py": "",
+    })
+    profile = ClickUtils.profile_import(f"{package}.cli", "cli", timeout=60)
+
+    [root] = profile.modules
+    assert root.name == f"{package}.cli" and root.commands == ["hello"]
+    assert root.children[0].name == f"{package}.heavy" and root.children[0].cumulative_us >= 50000
+    assert profile.command_modules == {"": f"{package}.cli", "hello": f"{package}.cli", "extra": f"{package}.plugin"}
+
+    [specific] = profile.specific()
+    assert specific.name == f"{package}.plugin" and specific.commands == ["extra"]
+    assert [child.name for child in specific.children] == [f"{package}.plugin_dependency"]
+
+    text = profile.format_text(min_ms=0)
+    assert f"{package}.plugin (extra)" in text
+    assert f"{package}.cli;{package}.plugin;{package}.plugin_dependency " in profile.format_collapsed()
+    assert json.loads(profile.format_json())["specific"][0]["commands"] == ["extra"]
+
+
+def test_profile_import_failure(cli_package):
+    package = cli_package("broken_cli", {"__init__.py": "", "cli.py": "raise RuntimeError('boom')"})
+    with pytest.raises(ImportError, match="boom"):
+        ClickUtils.profile_import(f"{package}.cli", "cli", timeout=60)
@@ -0,0 +1,146 @@
+import os
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from click_wrapper import ClickImporter, ClickParser, ClickRegistry, ClickMetadataCache
+from click_wrapper.cli import cli
+
+DB_SOURCE = '''
+import click
+
+@click.group()
+def cli():
+    """Database tools"""
+
+@cli.command()
+@click.option("--database", "-d", type=click.Path(), envvar="DB_PATH", help="SQLite database file")
+@click.option("--limit", type=int, default=10, help="Maximum rows")
+def dump(database, limit):
+    """Dump all tables of the database"""
+
+@cli.group()
+def users():
+    """Manage users"""
+
+@users.command(name="add")
+@click.argument("name")
+@click.option("--role", type=click.Choice(["admin", "user"]), help="Role of new user")
+def users_add(name, role):
+    """Create user account"""
+'''
+
+MAIL_SOURCE = '''
+import click
+
+@click.group()
+def cli():
+    """Mail tools"""
+
+@cli.command()
+@click.option("--database", type=click.Path(), help="Mailbox index")
+@click.option("--token", envvar="MAIL_TOKEN")
+def send(database, token):
+    """Send queued messages"""
+'''
+
+
+def _hits(hits):
+    return [(hit.target, hit.command, hit.param) for hit in hits]
+
+
+def _registry(cli_package, tmp_path):
+    db = cli_package("db_cli", {"__init__.py": "", "cli.py": DB_SOURCE})
+    mail = cli_package("mail_cli", {"__init__.py": "", "cli.py": MAIL_SOURCE})
+    registry = ClickRegistry(tmp_path / "registry.sqlite")
+    assert registry.add(ClickImporter(py_import_path=f"{db}.cli", py_import_path_attribute="cli", lazy=True)) == 4
+    assert registry.add(ClickImporter(py_import_path=f"{mail}.cli", py_import_path_attribute="cli", lazy=True)) == 2
+    return registry
+
+
+def test_query(cli_package, tmp_path):
+    with _registry(cli_package, tmp_path) as registry:
+        assert [(t.name, t.commands) for t in registry.targets()] == [("db_cli.cli:cli", 4), ("mail_cli.cli:cli", 2)]
+        assert _hits(registry.query(option="--database")) == [
+            ("db_cli.cli:cli", "db_cli dump", "database"), ("mail_cli.cli:cli", "mail_cli send", "database")
+        ]
+        assert _hits(registry.query(option="-d")) == [("db_cli.cli:cli", "db_cli dump", "database")]
+        assert registry.query(option="-d")[0].opts == ["--database", "-d"]
+        assert _hits(registry.query(envvar="MAIL_TOKEN")) == [("mail_cli.cli:cli", "mail_cli send", "token")]
+        assert _hits(registry.query(type_name="choice")) == _hits(registry.query(type_name="Choice")) == [
+            ("db_cli.cli:cli", "db_cli users add", "role")
+        ]
+        # help of command and of its parameters, phrase, case-insensitive
+        assert _hits(registry.query(text="rows")) == [("db_cli.cli:cli", "db_cli dump", None)]
+        assert _hits(registry.query(text="USER ACCOUNT")) == [("db_cli.cli:cli", "db_cli users add", None)]
+        assert _hits(registry.query(command="users")) == [
+            ("db_cli.cli:cli", "db_cli users", None), ("db_cli.cli:cli", "db_cli users add", None)
+        ]
+        assert _hits(registry.query(option="--database", target="mail_cli.cli:cli", limit=5)) == [
+            ("mail_cli.cli:cli", "mail_cli send", "database")
+        ]
+
+        # stored metadata equal parsed ones
+        parsed = ClickParser.factory(ClickImporter(py_import_path="db_cli.cli", py_import_path_attribute="cli")).metadata
+        assert [m.to_dict() for m in registry.metadata("db_cli.cli:cli")] == [m.to_dict() for m in parsed]
+
+        assert registry.remove("mail_cli.cli:cli") and not registry.remove("mail_cli.cli:cli")
+        assert registry.query(option="--token") == [] and registry.query(text="queued") == []
+
+
+def test_custom_type_from_warm_cache(cli_package, tmp_path):
+    source = DB_SOURCE.replace("import click\n", "import click\n\nclass Color(click.ParamType):\n    name = 'color'\n")
+    package = cli_package("color_cli", {"__init__.py": "", "cli.py": source.replace("type=int", "type=Color()")})
+    cache = ClickMetadataCache(tmp_path / "cache")
+    ClickParser.factory(ClickImporter(py_import_path=f"{package}.cli", py_import_path_attribute="cli", lazy=True), cache)
+    sys.modules.pop(f"{package}.cli")
+
+    with ClickRegistry(tmp_path / "registry.sqlite") as registry:
+        importer = ClickImporter(py_import_path=f"{package}.cli", py_import_path_attribute="cli", lazy=True)
+        assert registry.add(importer, cache) == 4
+        assert f"{package}.cli" not in sys.modules
+        # restored type is indexed by its class, not by the placeholder of unknown types
+        expected = [("color_cli.cli:cli", "color_cli dump", "limit")]
+        assert _hits(registry.query(type_name="color_cli.cli.Color")) == _hits(registry.query(type_name="Color")) == \
+               _hits(registry.query(type_name="color")) == expected
+        assert registry.query(type_name="ClickDataUnknownType") == []
+
+
+def test_refresh(cli_package, tmp_path):
+    with _registry(cli_package, tmp_path) as registry:
+        sys.modules.pop("db_cli.cli")
+        assert registry.refresh() == {"db_cli.cli:cli": "unchanged", "mail_cli.cli:cli": "unchanged"}
+        assert "db_cli.cli" not in sys.modules
+
+        source = tmp_path / "db_cli" / "cli.py"
+        source.write_text(DB_SOURCE.replace("envvar=\"DB_PATH\"", "envvar=\"DATABASE_URL\""))
+        os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10**9))
+        assert registry.refresh() == {"db_cli.cli:cli": "updated", "mail_cli.cli:cli": "unchanged"}
+        assert registry.query(envvar="DB_PATH") == []
+        assert _hits(registry.query(envvar="DATABASE_URL")) == [("db_cli.cli:cli", "db_cli dump", "database")]
+        # rows of replaced target are not duplicated
+        assert len(registry.query(text="rows")) == 1
+
+        with pytest.raises(KeyError):
+            registry.refresh(["unknown:cli"])
+
+
+def test_like_fallback(cli_package, tmp_path, monkeypatch):
+    monkeypatch.setattr(ClickRegistry, "_fts_module", "no_such_fts")
+    with _registry(cli_package, tmp_path) as registry:
+        assert not registry.fts
+        assert _hits(registry.query(text="user account")) == [("db_cli.cli:cli", "db_cli users add", None)]
+
+
+def test_cli(cli_package, tmp_path):
+    package = cli_package("db_cli", {"__init__.py": "", "cli.py": DB_SOURCE})
+    database = str(tmp_path / "registry.sqlite")
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["registry", "--database", database, "add", f"{package}.cli", "cli"])
+    assert result.exit_code == 0 and "Registered db_cli.cli:cli: 4 command(s)" in result.output
+    result = runner.invoke(cli, ["registry", "--database", database, "query", "--option=--database"])
+    assert result.output == "db_cli.cli:cli  db_cli dump  --database, -d\n"
+    result = runner.invoke(cli, ["registry", "--database", database, "refresh"])
+    assert result.output == "db_cli.cli:cli: unchanged\n"
@@ -0,0 +1,91 @@
+import io
+import json
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from click_wrapper import ClickImporter, ClickMetadataSerializer, ClickParser
+from click_wrapper.cli import cli
+from conftest import build_synthetic_cli
+
+
+def _metadata(synthetic_module, cli_obj: click.Command):
+    importer = ClickImporter(py_import_path=synthetic_module(cli_obj), py_import_path_attribute="cli")
+    return ClickParser.factory(importer).metadata
+
+
+def _custom_cli() -> click.Group:
+    @click.group(name="cli")
+    def root():
+        """Root"""
+
+    @root.command(name="run")
+    @click.argument("src", type=click.Path(exists=False))
+    @click.option("--mode", type=click.Choice(["a", "b"]), default="a", envvar=["MODE", "RUN_MODE"])
+    @click.option("--pair", type=(str, int), multiple=True)
+    @click.option("--flag/--no-flag", default=True)
+    def run(src, mode, pair, flag):
+        """Run it"""
+
+    # registered under other name than its own
+    root.add_command(click.Group(name="internal", help="Tools"), name="tools")
+    return root
+
+
+@pytest.mark.parametrize("format", ["json", "ndjson"])
+def test_roundtrip(synthetic_module, format):
+    for metadata in (_metadata(synthetic_module, _custom_cli()), _metadata(synthetic_module, build_synthetic_cli(300))):
+        text = ClickMetadataSerializer.dumps(metadata, format)
+        restored = ClickMetadataSerializer.load(io.StringIO(text))
+        assert [m.to_dict() for m in restored] == [m.to_dict() for m in metadata]
+        assert [m.to_dict() for m in ClickMetadataSerializer.loads(text)] == [m.to_dict() for m in restored]
+        # subtree is rebuilt, registered names are kept
+        root = restored[0].cmd_data
+        assert list(root.fnc_subcommands) == list(metadata[0].cmd_data.fnc_subcommands)
+        by_path = {tuple(m.cmd_path): m.cmd_data for m in restored}
+        for m in restored[1:]:
+            assert any(c is m.cmd_data for c in by_path[tuple(m.cmd_path[:-1])].fnc_subcommands.values())
+
+
+def test_records_are_plain_json(synthetic_module):
+    metadata = _metadata(synthetic_module, _custom_cli())
+    lines = ClickMetadataSerializer.dumps(metadata, "ndjson").splitlines()
+    assert len(lines) == len(metadata) == 3
+
+    run = json.loads(lines[1])
+    assert run["cmd_path"] == ["cli", "run"] and run["cmd_data"]["fnc_subcommands"] == []
+    mode = run["cmd_data"]["fnc_params"][1]
+    assert mode["param_type_click"]["param_type"] == "Choice" and mode["envvar"] == ["MODE", "RUN_MODE"]
+    assert json.loads(lines[0])["cmd_data"]["fnc_subcommands"] == ["run", "tools"]
+
+    with pytest.raises(ValueError):
+        ClickMetadataSerializer.loads('{"version": 0, "commands": []}')
+    with pytest.raises(ValueError):
+        ClickMetadataSerializer.loads('{"cmd_base": "cli", "cmd_path": ["cli"]}')
+
+
+def test_metadata_command_formats(cli_package, tmp_path):
+    package = cli_package("metadata_cli", {"__init__.py": "", "cli.py": '''
+        import click
+
+        @click.group()
+        def cli():
+            """Metadata CLI"""
+
+        @cli.command()
+        @click.option("--count", type=int, default=1)
+        def hello(count):
+            """Say hello"""
+    '''})
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["metadata", f"{package}.cli", "cli", "--format", "json", "--no-cache"])
+    assert result.exit_code == 0, result.output
+    assert [c["cmd_path"] for c in json.loads(result.output)["commands"]] == [["cli"], ["cli", "hello"]]
+
+    output = tmp_path / "metadata.ndjson"
+    result = runner.invoke(cli, ["metadata", f"{package}.cli", "cli", "-f", "ndjson", "-o", str(output), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    restored = ClickMetadataSerializer.load(output.open())
+    assert restored[1].cmd_data.fnc_params[0].opts == ("--count",)
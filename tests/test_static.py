@@ -0,0 +1,174 @@
+import sys
+
+from click_wrapper import ClickImporter, ClickParser, ClickStaticLoader
+
+HEAVY_DEP = '''
+import sys
+sys.modules[__name__].imported = True
+
+def validate(ctx, param, value):
+    return value
+'''
+
+CLI_SOURCE = '''
+import click
+from click_default_group import DefaultGroup
+import heavy_dep
+
+from .commands import export
+from . import constants
+
+DEFAULT_COUNT = 3
+
+class Attachment(click.ParamType):
+    name = "attachment"
+
+    def convert(self, value, param, ctx):
+        return heavy_dep.load(value)
+
+@click.group(cls=DefaultGroup, default="hello", context_settings={"help_option_names": ["-h", "--help"]})
+@click.version_option()
+def cli():
+    """
+    Static CLI.
+
+    Second paragraph.
+    """
+
+@cli.command()
+@click.argument("name", required=False)
+@click.option("-c", "--count", type=int, default=DEFAULT_COUNT, help=f"Repeat {DEFAULT_COUNT} times")
+@click.option("--mode", type=click.Choice(constants.MODES), envvar="STATIC_MODE")
+@click.option("--pair", type=(str, click.INT), multiple=True)
+@click.option("--file", type=click.Path(exists=False, dir_okay=False), callback=heavy_dep.validate)
+@click.option("--attach", type=Attachment(), multiple=True)
+@click.option("--verbose/--quiet", default=False)
+@click.pass_context
+def hello(ctx, name, count, mode, pair, file, attach, verbose):
+    "Say hello"
+    heavy_dep.run()
+
+@cli.group(name="models")
+def models_group():
+    """Manage models"""
+
+@models_group.command(name="list")
+@click.option("--limit", type=click.IntRange(1, 10), default=5, show_default=True)
+def models_list(limit):
+    """List models"""
+
+cli.add_command(export, name="export")
+
+if __name__ == "__main__":
+    cli()
+'''
+
+COMMANDS_SOURCE = '''
+import click
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path())
+@click.option("--format", "fmt", type=click.Choice(["json", "csv"]), default="json")
+def export(paths, fmt):
+    """Export data"""
+'''
+
+DYNAMIC_SOURCE = CLI_SOURCE.replace('''cli.add_command(export, name="export")''', '''cli.add_command(export, name="export")
+
+def with_extra(f):
+    return click.option("--extra")(f)
+
+@cli.group()
+def plugins():
+    """Plugins"""
+
+@plugins.command(name="run")
+@with_extra
+def plugins_run(extra):
+    """Run plugin"""
+''')
+
+
+def _describe(parser: ClickParser) -> list:
+    return [
+        (
+            m.cmd_path, m.cmd_data.fnc_name, m.cmd_data.fnc_help, m.cmd_data.fnc_help_short,
+            m.cmd_data.default_cmd_name, m.cmd_data.default_if_no_args, sorted(m.cmd_data.fnc_subcommands),
+            [
+                (
+                    p.name, type(p.param_type_click).__name__, p.as_string_python_type(), p.param_type_name,
+                    p.opts, p.secondary_opts, p.required, p.default, p.nargs, p.multiple, p.help, p.envvar,
+                    p.is_flag,
+                )
+                for p in m.cmd_data.fnc_params
+            ]
+        )
+        for m in parser.metadata
+    ]
+
+
+def _write_package(cli_package, name: str, cli_source: str) -> str:
+    package = cli_package(name, {
+        "__init__.py": "",
+        "__main__.py": "from .cli import cli\n\nif __name__ == '__main__':\n    cli()\n",
+        "cli.py": cli_source,
+        "commands.py": COMMANDS_SOURCE,
+        "constants.py": "MODES = ['fast', 'slow']\n",
+    })
+    sys.modules.pop("heavy_dep", None)
+    return package
+
+
+def test_static_matches_live_without_import(cli_package, tmp_path):
+    (tmp_path / "heavy_dep.py").write_text(HEAVY_DEP)
+    package = _write_package(cli_package, "static_cli", CLI_SOURCE)
+
+    importer = ClickImporter(package, lazy=True)
+    loader = ClickStaticLoader(importer)
+    static_tree = loader.load()
+    assert loader.fallbacks == []
+    assert "heavy_dep" not in sys.modules
+    assert f"{package}.cli" not in sys.modules
+
+    static = ClickParser.factory(importer, static=True)
+    assert "heavy_dep" not in sys.modules
+
+    live = ClickParser.factory(ClickImporter(package))
+    assert sys.modules["heavy_dep"].imported
+    assert _describe(static) == _describe(live)
+    assert static.names_short_joined == ["", "hello", "models", "models list", "export"]
+    assert static_tree.commands["hello"].params[0].name == "name"
+
+
+def test_static_falls_back_to_live_subtree(cli_package, tmp_path):
+    (tmp_path / "heavy_dep.py").write_text(HEAVY_DEP)
+    package = _write_package(cli_package, "dynamic_cli", DYNAMIC_SOURCE)
+
+    importer = ClickImporter(package, lazy=True)
+    loader = ClickStaticLoader(importer)
+    root = loader.load()
+    assert loader.fallbacks == ["plugins"]
+    # only dynamic subtree is live, the rest is still static
+    assert root.commands["plugins"] is importer.click_obj_cli_main.commands["plugins"]
+    assert root.commands["hello"] is not importer.click_obj_cli_main.commands["hello"]
+
+    static = ClickParser.factory(ClickImporter(package, lazy=True), static=True)
+    live = ClickParser.factory(ClickImporter(package))
+    assert _describe(static) == _describe(live)
+
+
+def test_static_falls_back_when_root_is_dynamic(cli_package, tmp_path):
+    (tmp_path / "heavy_dep.py").write_text(HEAVY_DEP)
+    package = _write_package(cli_package, "plugin_cli", CLI_SOURCE + "\nheavy_dep.register_commands(cli=cli)\n")
+    (tmp_path / "heavy_dep.py").write_text(HEAVY_DEP + '''
+import click
+
+def register_commands(cli):
+    cli.add_command(click.Command("from-plugin"))
+''')
+
+    importer = ClickImporter(package, lazy=True)
+    loader = ClickStaticLoader(importer)
+    assert loader.load() is importer.click_obj_cli_main
+    assert loader.fallbacks == ["cli"]
+    assert "from-plugin" in ClickParser.factory(importer, static=True).names_short_joined
@@ -1,9 +1,15 @@
+import asyncio
+import importlib
+import sys
+
 import pytest
 
 from click_wrapper import (
     ClickUtils,
     ClickImporterError,
     ClickImporter,
+    ClickParser,
+    ClickWrapper,
 )
 
 known_llm_commands = [
@@ -69,6 +75,26 @@ def test_api_metadata_commands_names():
         full_path=True)
     assert sorted(known_llm_commands_full) == sorted(commands_names)
 
+def test_api_metadata_commands_names_static():
+    # llm registers plugin commands at import time, static analysis falls back to import
+    commands_names = ClickUtils.commands_names("llm", full_path=False, static=True)
+    assert sorted(known_llm_commands) == sorted(commands_names)
+
+def test_api_metadata_command_path():
+    metadata = ClickUtils.commands_metadata("llm", command_path=["models", "options"])
+    assert sorted(metadata) == sorted(c for c in known_llm_commands if c.startswith("models options"))
+
+    help_string = ClickUtils.dump_help("llm", command_path=["logs"])
+    assert help_string.startswith("\n(help-logs)=\n### llm logs --help")
+
+def test_api_metadata_index():
+    importer = ClickImporter(py_import_path="llm")
+    index = ClickParser.factory(importer).index
+    assert [m.name_short_joined for m in index.under("embed-models")] == \
+           ["embed-models", "embed-models list", "embed-models default"]
+    assert {"prompt", "chat"} <= {m.name_short_joined for m in index.by_option("--model")}
+    assert "prompt" in [m.name_short_joined for m in index.by_envvar("LLM_MODEL")]
+
 def test_api_dump_help():
     help_string = ClickUtils.dump_help(
         py_import_path="llm.cli",
@@ -83,7 +109,8 @@ def test_api_dump_wrapper(output_dir):
     help_string = ClickUtils.dump_wrapper(
         py_import_path="llm.cli",
         py_import_path_attribute="cli",
-        output_file=str(output_file)
+        output_file=str(output_file),
+        features=ClickWrapper.features_all
     )
 
     from generated.llm_wrapper import LlmClickWrapper
@@ -91,7 +118,42 @@ def test_api_dump_wrapper(output_dir):
     version_str_exp = 'cli, version 0.27.1\n'
     version_str     = llm_cli_wrapper.cmd_version()
     assert version_str == version_str_exp, f"LLM version does not match"
-    llm_cli_wrapper.cmd_models_list()
+    models = llm_cli_wrapper.cmd_models_list()
+    assert "".join(llm_cli_wrapper.cmd_models_list_stream()) == models
+    with llm_cli_wrapper.cmd_models_list_output(spool_threshold=0) as output:
+        assert output.spooled and output.text == models
+    results = llm_cli_wrapper.cmd_models_list_many([None, None, None], max_workers=3)
+    assert [(r.exit_code, r.output) for r in results] == [(0, models)] * 3
+    assert llm_cli_wrapper.cmd_models_list_direct() == models
+
+def test_api_dump_wrapper_async(tmp_path, monkeypatch):
+    output_file = tmp_path / "llm_wrapper_async.py"
+
+    ClickUtils.dump_wrapper(
+        py_import_path="llm.cli",
+        py_import_path_attribute="cli",
+        output_file=str(output_file),
+        async_mode=True
+    )
+    assert "class LlmAsyncClickWrapper" in output_file.read_text()
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    wrapper_module = importlib.import_module("llm_wrapper_async")
+    # module is unregistered after the test
+    monkeypatch.setitem(sys.modules, "llm_wrapper_async", wrapper_module)
+    LlmAsyncClickWrapper, ModelsListOptions = wrapper_module.LlmAsyncClickWrapper, wrapper_module.ModelsListOptions
+
+    async def main():
+        llm_cli_wrapper = LlmAsyncClickWrapper(concurrency=2, engine="threads")
+        versions = await llm_cli_wrapper.gather(*(llm_cli_wrapper.cmd_version() for _ in range(5)))
+        models = await llm_cli_wrapper.map(
+            llm_cli_wrapper.cmd_models_list, [ModelsListOptions(), ModelsListOptions()]
+        )
+        return versions, models
+
+    versions, models = asyncio.run(main())
+    assert versions == ['cli, version 0.27.1\n'] * 5
+    assert len(models) == 2 and models[0] == models[1]
 
 def test_api_parse_cli_metadata():
     metadata = ClickUtils.commands_metadata(